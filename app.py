@@ -1,9 +1,12 @@
 """Streamlit web app for FitNotes to Hevy conversion."""
 
+import hashlib
+import json
 import sys
 from datetime import datetime
-from io import StringIO
+from io import BytesIO
 from pathlib import Path
+from zoneinfo import available_timezones
 
 import pandas as pd
 import streamlit as st
@@ -12,7 +15,22 @@ import streamlit_analytics2 as streamlit_analytics
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fitnotes2hevy import convert_fitnotes_to_hevy, load_exercise_mappings
+from fitnotes2hevy import (
+    ConversionSummary,
+    StageProfiler,
+    SuggestionIndex,
+    convert_fitnotes_to_hevy,
+    load_exercise_mappings,
+)
+from fitnotes2hevy.backup import is_fitnotes_backup, read_fitnotes_backup_bytes
+from fitnotes2hevy.converter import (
+    hevy_csv_bytes,
+    read_fitnotes_csv,
+    unmapped_exercises,
+    validate_fitnotes_dataframe,
+)
+from fitnotes2hevy.profiling import stage_hook
+from fitnotes2hevy.rules import load_conversion_rules
 
 st.set_page_config(page_title="FitNotes to Hevy Converter", page_icon="💪")
 
@@ -155,7 +173,7 @@ st.markdown(
 
 st.title("FitNotes to Hevy")
 st.markdown(
-    '<p style="text-align: center; font-size: 1.2rem;">Seamlessly migrate your workout history from <a href="https://www.fitnotesapp.com/">FitNotes</a> to <a href="https://www.hevyapp.com/">Hevy</a>.<br>Upload your FitNotes CSV to get started.</p>',
+    '<p style="text-align: center; font-size: 1.2rem;">Seamlessly migrate your workout history from <a href="https://www.fitnotesapp.com/">FitNotes</a> to <a href="https://www.hevyapp.com/">Hevy</a>.<br>Upload your FitNotes CSV or backup to get started.</p>',
     unsafe_allow_html=True,
 )
 st.markdown(
@@ -185,11 +203,136 @@ def get_all_mappings():
 
 all_mappings = get_all_mappings()
 
+
+# Compile the conversion rules once per server process
+@st.cache_resource
+def get_conversion_rules():
+    return load_conversion_rules()
+
+
+@st.cache_data
+def get_timezone_names():
+    return sorted(available_timezones())
+
+
+# Build the Hevy name suggestion index once per server process
+@st.cache_resource
+def get_suggestion_index():
+    return SuggestionIndex.from_file()
+
+
+# Bounds for the per-upload caches shared by all sessions on this server
+UPLOAD_CACHE_ENTRIES = 32
+UPLOAD_CACHE_TTL = 3600
+
+
+def hash_mappings(mappings):
+    """Return a stable digest of a mappings dict for use as a cache key."""
+    payload = json.dumps(mappings, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Parse and validate each upload once per file content
+@st.cache_data(
+    max_entries=UPLOAD_CACHE_ENTRIES, ttl=UPLOAD_CACHE_TTL, show_spinner=False
+)
+def load_upload(file_hash, _file_bytes):
+    if is_fitnotes_backup(_file_bytes):
+        df = read_fitnotes_backup_bytes(_file_bytes)
+    else:
+        df = read_fitnotes_csv(BytesIO(_file_bytes))
+    validate_fitnotes_dataframe(df)
+    return df
+
+
+# Download formats offered after conversion, and their compression
+DOWNLOAD_FORMATS = {"CSV": None, "ZIP (compressed CSV)": "zip"}
+
+
+def convert_to_csv(df, mappings, settings, output=(None, None, None), profiler=None):
+    # The summary is collected during the conversion and cached with the CSV,
+    # so the statistics shown below never rescan the data
+    summary = ConversionSummary()
+    output_df = convert_fitnotes_to_hevy(
+        df,
+        mappings,
+        *settings,
+        rules=get_conversion_rules(),
+        typed=True,
+        profiler=profiler,
+        summary=summary,
+    )
+    # Written in chunks into a single buffer, so the session never holds
+    # the whole file as text as well as bytes. Split output is zipped
+    compression, max_workouts, max_bytes = output
+    with stage_hook(profiler)("write_csv", len(output_df)):
+        csv_data = hevy_csv_bytes(
+            output_df,
+            compression=compression,
+            name="fitnotes2hevy.csv",
+            max_workouts=max_workouts,
+            max_bytes=max_bytes,
+        )
+    return csv_data, summary.to_dict()
+
+
+# Memoize the converted CSV on the upload, mappings and settings, so reruns
+# and repeated downloads skip the conversion entirely
+@st.cache_data(
+    max_entries=UPLOAD_CACHE_ENTRIES, ttl=UPLOAD_CACHE_TTL, show_spinner=False
+)
+def convert_upload(file_hash, mappings_hash, settings, output, _df, _mappings):
+    return convert_to_csv(_df, _mappings, settings, output)
+
+
+def show_summary(summary):
+    """Show the statistics of a conversion from its summary dict."""
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Workouts", f"{summary['workouts']:,}")
+    col2.metric("Exercises", f"{summary['exercises']:,}")
+    col3.metric("Sets", f"{summary['sets']:,}")
+    if summary["first_date"] is not None:
+        st.caption(
+            f"Workouts from {summary['first_date']} to {summary['last_date']}, "
+            f"{summary['volume_kg']:,.1f} kg total volume"
+        )
+
+    with st.expander("Conversion summary"):
+        st.dataframe(
+            pd.DataFrame(summary["per_exercise"]).rename(
+                columns={
+                    "exercise": "Exercise",
+                    "sets": "Sets",
+                    "volume_kg": "Volume (kg)",
+                }
+            ),
+            width="stretch",
+            hide_index=True,
+        )
+        converted = [
+            f"{count} {name.replace('_', ' ')}"
+            for name, count in summary["rule_conversions"].items()
+            if count
+        ]
+        if converted:
+            st.caption(f"Sets changed by conversion rules: {', '.join(converted)}")
+        if summary["unmapped"]:
+            st.caption(
+                "Unmapped exercises: "
+                + ", ".join(
+                    f"{item['exercise']} ({item['sets']} sets)"
+                    for item in summary["unmapped"]
+                )
+            )
+
+
 # Initialize session state
 if "custom_mappings" not in st.session_state:
     st.session_state.custom_mappings = {}
 if "timezone_offset" not in st.session_state:
     st.session_state.timezone_offset = 10
+if "timezone_name" not in st.session_state:
+    st.session_state.timezone_name = None
 if "workout_time" not in st.session_state:
     st.session_state.workout_time = "07:00"
 if "workout_duration" not in st.session_state:
@@ -198,19 +341,28 @@ if "workout_name" not in st.session_state:
     st.session_state.workout_name = "Workout"
 if "workout_notes" not in st.session_state:
     st.session_state.workout_notes = "Imported from FitNotes"
+if "show_profile" not in st.session_state:
+    st.session_state.show_profile = False
+if "download_format" not in st.session_state:
+    st.session_state.download_format = "CSV"
+if "max_workouts_per_file" not in st.session_state:
+    st.session_state.max_workouts_per_file = 0
+if "max_mb_per_file" not in st.session_state:
+    st.session_state.max_mb_per_file = 0
 
 # File upload
 uploaded_file = st.file_uploader(
-    "Upload CSV", type="csv", accept_multiple_files=False, label_visibility="collapsed"
+    "Upload CSV or backup",
+    type=["csv", "fitnotes"],
+    accept_multiple_files=False,
+    label_visibility="collapsed",
 )
 
 if uploaded_file:
     try:
-        df = pd.read_csv(uploaded_file)
-        # Validate immediately after loading
-        from fitnotes2hevy.converter import validate_fitnotes_dataframe
-
-        validate_fitnotes_dataframe(df)
+        file_bytes = uploaded_file.getvalue()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        df = load_upload(file_hash, file_bytes)
     except ValueError as e:
         st.error(str(e))
         df = None
@@ -240,32 +392,67 @@ if uploaded_file and df is not None:
                     if st.session_state.workout_time.count(":") == 1
                     else st.session_state.workout_time
                 )
-                output_df = convert_fitnotes_to_hevy(
-                    df,
-                    mappings,
+                settings = (
                     st.session_state.timezone_offset,
                     workout_time_str,
                     st.session_state.workout_name,
                     st.session_state.workout_duration,
                     st.session_state.workout_notes,
+                    st.session_state.timezone_name,
                 )
-
-                # Convert to CSV
-                output = StringIO()
-                output_df.to_csv(output, index=False, sep=";", quoting=1)
-                csv_data = output.getvalue()
+                # 0 means no limit; any limit splits the output into a zip
+                max_workouts = st.session_state.max_workouts_per_file or None
+                max_bytes = int(st.session_state.max_mb_per_file * 1024 * 1024) or None
+                split = max_workouts is not None or max_bytes is not None
+                compression = (
+                    "zip"
+                    if split
+                    else DOWNLOAD_FORMATS[st.session_state.download_format]
+                )
+                output = (compression, max_workouts, max_bytes)
+                if st.session_state.show_profile:
+                    # Profiling needs a real run, so bypass the cache
+                    profiler = StageProfiler()
+                    csv_data, summary = convert_to_csv(
+                        df, mappings, settings, output, profiler
+                    )
+                else:
+                    profiler = None
+                    csv_data, summary = convert_upload(
+                        file_hash,
+                        hash_mappings(mappings),
+                        settings,
+                        output,
+                        df,
+                        mappings,
+                    )
 
                 # Download button (centered)
                 timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+                extension, mime = (
+                    ("zip", "application/zip")
+                    if compression == "zip"
+                    else ("csv", "text/csv")
+                )
                 col1, col2, col3 = st.columns([1, 2, 1])
                 with col2:
                     st.download_button(
                         label="Download Hevy CSV Format",
                         data=csv_data,
-                        file_name=f"fitnotes2hevy_{timestamp}.csv",
-                        mime="text/csv",
+                        file_name=f"fitnotes2hevy_{timestamp}.{extension}",
+                        mime=mime,
                         width="stretch",
                     )
+                show_summary(summary)
+
+                if profiler is not None:
+                    profiler.close()
+                    with st.expander("Conversion profile"):
+                        st.dataframe(
+                            pd.DataFrame(profiler.records()),
+                            width="stretch",
+                            hide_index=True,
+                        )
 
                 # Ko-fi donation prompt
                 st.markdown(
@@ -338,6 +525,23 @@ with tab1:
     )
     st.session_state.timezone_offset = timezone_options[timezone_selection]
 
+    # IANA timezones apply daylight saving per workout date
+    fixed_offset_label = "None (use the fixed offset above)"
+    timezone_names = [fixed_offset_label] + get_timezone_names()
+    timezone_name_selection = st.selectbox(
+        "Daylight Saving Timezone (optional)",
+        options=timezone_names,
+        index=timezone_names.index(
+            st.session_state.timezone_name or fixed_offset_label
+        ),
+        help="Pick your region (e.g. Australia/Sydney) to adjust each workout for daylight saving. Overrides the fixed timezone offset.",
+    )
+    st.session_state.timezone_name = (
+        None
+        if timezone_name_selection == fixed_offset_label
+        else timezone_name_selection
+    )
+
     st.session_state.workout_time = st.text_input(
         "Workout Start Time (24hr)",
         value=st.session_state.workout_time,
@@ -362,6 +566,35 @@ with tab1:
         help="Notes added to all imported workouts.",
     )
 
+    st.session_state.download_format = st.selectbox(
+        "Download Format",
+        options=list(DOWNLOAD_FORMATS),
+        index=list(DOWNLOAD_FORMATS).index(st.session_state.download_format),
+        help="ZIP downloads are much smaller for large histories. Unzip the file before importing it into Hevy.",
+    )
+
+    st.session_state.max_workouts_per_file = st.number_input(
+        "Max Workouts per File",
+        min_value=0,
+        value=st.session_state.max_workouts_per_file,
+        step=100,
+        help="Split long histories into several CSV files, downloaded together as a ZIP. Workouts are never split across files. 0 keeps a single file.",
+    )
+
+    st.session_state.max_mb_per_file = st.number_input(
+        "Max File Size (MB)",
+        min_value=0.0,
+        value=float(st.session_state.max_mb_per_file),
+        step=1.0,
+        help="Split the CSV into files of at most this size, downloaded together as a ZIP. 0 keeps a single file.",
+    )
+
+    st.session_state.show_profile = st.checkbox(
+        "Show conversion profile",
+        value=st.session_state.show_profile,
+        help="Show how long each conversion stage took.",
+    )
+
 with tab2:
     st.info(
         "FitNotes and Hevy use different exercise names. Use mappings to ensure your exercises are recognized correctly in Hevy instead of appearing as custom exercises."
@@ -386,8 +619,6 @@ with tab2:
         )
 
         # Import
-        import json
-
         json_data = json.dumps(st.session_state.custom_mappings, indent=2)
 
         uploaded_mappings = st.file_uploader(
@@ -462,13 +693,25 @@ with tab2:
         if uploaded_file and df is not None:
             # Merge all mappings for preview
             mappings = {**all_mappings, **st.session_state.custom_mappings}
-            unique_exercises = df["Exercise"].unique()
+            # Work on the distinct exercises rather than every set
+            unique_exercises = list(df["Exercise"].dropna().unique())
+            unmapped = unmapped_exercises(df["Exercise"], mappings)
+            unmapped_set = set(unmapped)
+            suggestion_index = get_suggestion_index()
             mapping_preview = pd.DataFrame(
                 {
                     "FitNotes Exercise": unique_exercises,
                     "Hevy Exercise": [mappings.get(ex, ex) for ex in unique_exercises],
                     "Status": [
-                        "✅ Mapped" if ex in mappings else "⚠️ Unmapped"
+                        "⚠️ Unmapped" if ex in unmapped_set else "✅ Mapped"
+                        for ex in unique_exercises
+                    ],
+                    "Suggested Hevy Exercise": [
+                        (
+                            ", ".join(name for name, _ in suggestion_index.suggest(ex))
+                            if ex in unmapped_set
+                            else ""
+                        )
                         for ex in unique_exercises
                     ],
                 }
@@ -476,14 +719,16 @@ with tab2:
             st.dataframe(mapping_preview, width="stretch")
 
             # Show unmapped exercises
-            unmapped = df[~df["Exercise"].isin(mappings.keys())]["Exercise"].unique()
             if len(unmapped) > 0:
                 st.warning(
                     f"Warning: {len(unmapped)} exercise(s) will keep their original names and be created as custom exercises in Hevy."
                 )
+                st.caption(
+                    "Suggested Hevy exercises are the closest matching names. Add the right one in the Custom Mappings tab."
+                )
         else:
             st.warning(
-                "Please upload a FitNotes CSV file (.csv) to preview exercise mappings."
+                "Please upload a FitNotes CSV file (.csv) or backup (.fitnotes) to preview exercise mappings."
             )
 
 with tab3:
@@ -502,6 +747,9 @@ with tab3:
         st.write(
             "View FitNotes's [export tutorial](https://www.fitnotesapp.com/settings/#spreadsheet-export)."
         )
+        st.write(
+            "You can also upload a FitNotes backup (.fitnotes) directly: Open FitNotes → Settings → Backup → Create Backup."
+        )
 
     with st.expander("How do I import the converted file to Hevy?"):
         st.write(
@@ -0,0 +1 @@
+"""Benchmarks for FitNotes to Hevy conversion."""
@@ -0,0 +1,130 @@
+"""Synthetic FitNotes export generator for benchmarks."""
+
+import csv
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from fitnotes2hevy.rules import load_conversion_rules
+
+ROOT = Path(__file__).parent.parent
+
+COLUMNS = [
+    "Date",
+    "Exercise",
+    "Category",
+    "Weight",
+    "Weight Unit",
+    "Reps",
+    "Distance",
+    "Distance Unit",
+    "Time",
+    "Comment",
+]
+CARDIO_EXERCISES = ["Running", "Cycling", "Rowing Machine", "Walking"]
+COMMENTS = ["Felt strong", "Left shoulder tight", "New PR!", "Slow tempo"]
+
+
+def load_exercise_names(data_dir=ROOT / "data" / "exercises"):
+    """Load FitNotes exercise names from the default and extra lists.
+
+    Args:
+        data_dir: Directory containing the exercise list text files
+
+    Returns:
+        list: Exercise names in file order
+    """
+    names = []
+    for filename in ["fitnotes_default.txt", "fitnotes_extra.txt"]:
+        with open(Path(data_dir) / filename, "r", encoding="utf-8") as f:
+            names.extend(line.strip() for line in f if line.strip())
+    return names
+
+
+def _format_time(seconds):
+    """Format seconds the way FitNotes writes the Time column."""
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def _sets(rng, kind):
+    """Generate the set values (Weight to Comment) for one exercise."""
+    for _ in range(rng.randint(1, 5)):
+        weight = reps = distance = distance_unit = time = ""
+        if kind == "distance":
+            distance = f"{rng.choice([400, 1000, 2500, 5000]):.1f}"
+            distance_unit = "m"
+            time = _format_time(rng.randint(90, 1800))
+        elif kind == "time":
+            time = _format_time(rng.randint(20, 180))
+        elif kind == "reps":
+            reps = str(rng.randint(5, 20))
+        else:
+            weight = f"{rng.randint(4, 80) * 2.5:.1f}"
+            reps = str(rng.randint(3, 12))
+        comment = rng.choice(COMMENTS) if rng.random() < 0.05 else ""
+        weight_unit = "kgs" if weight else ""
+        yield [weight, weight_unit, reps, distance, distance_unit, time, comment]
+
+
+def generate_rows(rows, seed=0, data_dir=ROOT / "data" / "exercises"):
+    """Yield synthetic FitNotes export rows in date order.
+
+    Workouts mix weight/reps sets with distance, time and reps-only sets,
+    including the exercises targeted by the conversion rules, as loaded by
+    load_conversion_rules from data/mappings/rules.json.
+
+    Args:
+        rows: Number of rows to generate
+        seed: Random seed, so the same arguments give the same export
+        data_dir: Directory containing the exercise list text files
+
+    Yields:
+        list: Row values in FitNotes column order
+    """
+    rng = random.Random(seed)
+    weighted = load_exercise_names(data_dir)
+    rules = load_conversion_rules(ROOT / "data" / "mappings")
+    special = [
+        *[(name, "time") for name in rules.hevy_names("seconds_to_reps")],
+        *[(name, "time") for name in rules.hevy_names("seconds_to_distance")],
+        *[(name, "reps") for name in rules.hevy_names("reps_to_seconds")],
+        *[(name, "distance") for name in CARDIO_EXERCISES],
+    ]
+
+    day = date(2015, 1, 1)
+    produced = 0
+    while produced < rows:
+        day += timedelta(days=rng.randint(1, 3))
+        exercises = [(name, "weight") for name in rng.sample(weighted, 5)]
+        if rng.random() < 0.4:
+            exercises.append(rng.choice(special))
+        for exercise, kind in exercises:
+            for values in _sets(rng, kind):
+                if produced == rows:
+                    return
+                yield [day.isoformat(), exercise, "Synthetic", *values]
+                produced += 1
+
+
+def generate_export(path, rows, seed=0, data_dir=ROOT / "data" / "exercises"):
+    """Write a synthetic FitNotes CSV export.
+
+    Rows are streamed to disk, so exports far larger than memory can be
+    generated.
+
+    Args:
+        path: Output CSV filepath
+        rows: Number of rows to generate
+        seed: Random seed
+        data_dir: Directory containing the exercise list text files
+
+    Returns:
+        Path: The written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(rows, seed, data_dir))
+    return path
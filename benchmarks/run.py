@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Benchmark FitNotes to Hevy conversion on synthetic exports.
+
+Usage:
+    python -m benchmarks.run --sizes 1000 --sizes 100000 --output results.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import typer
+from typing_extensions import Annotated
+
+import fitnotes2hevy
+from fitnotes2hevy import (
+    StageProfiler,
+    convert_fitnotes_to_hevy,
+    load_exercise_mappings,
+)
+from fitnotes2hevy.converter import read_fitnotes_csv
+
+from .generate import generate_export
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+app = typer.Typer()
+
+
+def _timed(func, *args, **kwargs):
+    """Call func and return its result with the elapsed wall time."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _best_of(repeat, func, setup=None):
+    """Return the fastest wall time of repeated calls.
+
+    Args:
+        repeat: Number of calls
+        func: Callable to time
+        setup: Optional untimed callable whose result is passed to func
+
+    Returns:
+        float: Fastest call in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        timings.append(_timed(func, *args)[1])
+    return min(timings)
+
+
+def _peak_memory_mb(func, *args, **kwargs):
+    """Return the peak traced memory of a call in megabytes."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _run_measured(command):
+    """Run a command and return its wall time and peak resident memory.
+
+    Peak memory is read from the child's own resource usage, which is only
+    available on Unix; elsewhere it is reported as None.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    if not hasattr(os, "wait4"):
+        _, stderr = process.communicate()
+        max_rss_mb = None
+        returncode = process.returncode
+    else:
+        stderr = process.stderr.read() if process.stderr else b""
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = returncode = os.waitstatus_to_exitcode(status)
+        # Linux reports kilobytes, macOS bytes
+        max_rss_mb = usage.ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+    seconds = time.perf_counter() - start
+    if returncode != 0:
+        raise RuntimeError(f"{command[1]} failed: {stderr.decode(errors='replace')}")
+    return seconds, max_rss_mb
+
+
+def bench_stages(input_file, output_file, mappings, repeat):
+    """Time each conversion stage in-process.
+
+    Args:
+        input_file: FitNotes CSV filepath
+        output_file: Scratch filepath for the Hevy CSV
+        mappings: Exercise name mappings dict
+        repeat: Number of repetitions; the fastest is reported
+
+    Returns:
+        dict: Seconds per stage, the fastest internal breakdown of the
+            conversion, and the traced peak memory of a full run
+    """
+
+    df = read_fitnotes_csv(input_file)
+
+    def convert(df):
+        return convert_fitnotes_to_hevy(df, mappings)
+
+    def write(output_df):
+        output_df.to_csv(output_file, index=False, sep=";", quoting=1)
+
+    def pipeline():
+        write(convert(read_fitnotes_csv(input_file)))
+
+    output_df = convert(df)
+    convert_stages = {}
+    for _ in range(repeat):
+        profiler = StageProfiler()
+        convert_fitnotes_to_hevy(df, mappings, profiler=profiler)
+        for stats in profiler.stages.values():
+            best = convert_stages.get(stats.name, stats.seconds)
+            convert_stages[stats.name] = min(best, stats.seconds)
+
+    return {
+        "load_mappings_sec": _best_of(repeat, load_exercise_mappings),
+        "read_csv_sec": _best_of(repeat, lambda: read_fitnotes_csv(input_file)),
+        "convert_sec": _best_of(repeat, lambda: convert(df)),
+        "convert_stages_sec": convert_stages,
+        "write_csv_sec": _best_of(repeat, lambda: write(output_df)),
+        "peak_memory_mb": _peak_memory_mb(pipeline),
+    }
+
+
+def bench_cli(input_file, output_file):
+    """Time an end-to-end run of scripts/convert.py in a subprocess.
+
+    Args:
+        input_file: FitNotes CSV filepath
+        output_file: Scratch filepath for the Hevy CSV
+
+    Returns:
+        dict: Wall time and the child's peak resident memory
+    """
+    command = [
+        sys.executable,
+        str(ROOT / "scripts" / "convert.py"),
+        "-i",
+        str(input_file),
+        "-o",
+        str(output_file),
+    ]
+    seconds, max_rss_mb = _run_measured(command)
+    return {"wall_sec": seconds, "max_rss_mb": max_rss_mb}
+
+
+@app.command()
+def main(
+    sizes: Annotated[
+        Optional[List[int]],
+        typer.Option("--sizes", "-n", help="Export sizes in rows (repeatable)"),
+    ] = None,
+    output: Annotated[
+        Optional[Path],
+        typer.Option("--output", "-o", help="Write JSON results to this file"),
+    ] = None,
+    data_dir: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--data-dir", help="Keep generated exports here to reuse across runs"
+        ),
+    ] = None,
+    repeat: Annotated[
+        int, typer.Option("--repeat", "-r", min=1, help="Repetitions per stage")
+    ] = 3,
+    cli: Annotated[
+        bool, typer.Option("--cli/--no-cli", help="Include end-to-end CLI timings")
+    ] = True,
+    seed: Annotated[int, typer.Option("--seed", help="Generator seed")] = 0,
+):
+    """Benchmark conversion stages, CLI runtime and peak memory."""
+    mappings = load_exercise_mappings(ROOT / "data" / "mappings")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        work_dir = data_dir or Path(scratch)
+        output_file = Path(scratch) / "hevy.csv"
+        results = []
+        for rows in sizes or DEFAULT_SIZES:
+            input_file = work_dir / f"fitnotes_{rows}_{seed}.csv"
+            if not input_file.exists():
+                print(f"Generating {rows} rows...", file=sys.stderr)
+                generate_export(input_file, rows, seed, ROOT / "data" / "exercises")
+
+            print(f"Benchmarking {rows} rows...", file=sys.stderr)
+            result = {
+                "rows": rows,
+                "stages": bench_stages(input_file, output_file, mappings, repeat),
+            }
+            if cli:
+                result["cli"] = bench_cli(input_file, output_file)
+            results.append(result)
+
+    report = {
+        "version": fitnotes2hevy.__version__,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        output.write_text(text + "\n", encoding="utf-8")
+        print(f"Results saved to: {output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    app()
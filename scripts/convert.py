@@ -1,30 +1,53 @@
 #!/usr/bin/env python3
 """Command-line interface for FitNotes to Hevy conversion."""
 
+import json
 import pathlib
 import sys
+import time
+from contextlib import ExitStack, closing, contextmanager
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
-import pandas as pd
 import typer
 from typing_extensions import Annotated
 
 # Add src to path for imports
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 
-from fitnotes2hevy import convert_fitnotes_to_hevy, load_exercise_mappings
+# The pandas engine and the modules built on it are imported where they are
+# used, so the stream engine runs without importing pandas at all
+from fitnotes2hevy import ConversionSummary, StageProfiler, load_exercise_mappings
 from fitnotes2hevy.config import (
+    ARROW_SUFFIXES,
+    COMPRESSION_SUFFIXES,
     DEFAULT_TRAINING_TIME,
     INPUT_FILE_PATH,
+    PARQUET_SUFFIXES,
+    SERVER_MAX_UPLOAD_MB,
+    SERVER_QUEUE_SIZE,
     TIMEZONE_OFFSET_HOURS,
 )
+from fitnotes2hevy.profiling import stage_hook
+from fitnotes2hevy.rules import load_conversion_rules
+from fitnotes2hevy.stream import convert_fitnotes_csv_stream, resolve_timezone
+from fitnotes2hevy.suggestions import SuggestionIndex, draft_custom_mappings
+
+DEFAULT_STATE_FILE = "data/output/.fitnotes2hevy_state.json"
+
+
+class Engine(str, Enum):
+    pandas = "pandas"
+    stream = "stream"
+
 
 app = typer.Typer()
 
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     input_file: Annotated[
         pathlib.Path,
         typer.Option(
@@ -32,9 +55,36 @@ def main(
             "-i",
             file_okay=True,
             dir_okay=False,
-            help="Input FitNotes CSV filepath",
+            help="Input FitNotes CSV, Parquet (.parquet) or Arrow IPC "
+            "(.arrow, .feather) filepath",
         ),
     ] = pathlib.Path(INPUT_FILE_PATH),
+    input_db: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--input-db",
+            file_okay=True,
+            dir_okay=False,
+            help="Read workouts from a FitNotes backup (.fitnotes) instead of "
+            "a CSV export",
+        ),
+    ] = None,
+    since: Annotated[
+        Optional[datetime],
+        typer.Option(
+            "--since",
+            formats=["%Y-%m-%d"],
+            help="Only convert workouts on or after this date (with --input-db)",
+        ),
+    ] = None,
+    until: Annotated[
+        Optional[datetime],
+        typer.Option(
+            "--until",
+            formats=["%Y-%m-%d"],
+            help="Only convert workouts on or before this date (with --input-db)",
+        ),
+    ] = None,
     output_file: Annotated[
         Optional[pathlib.Path],
         typer.Option(
@@ -42,50 +92,805 @@ def main(
             "-o",
             file_okay=True,
             dir_okay=False,
-            help="Output Hevy CSV filepath",
+            help="Output Hevy CSV filepath; a .gz or .zip extension compresses it",
+        ),
+    ] = None,
+    table_output: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--table-output",
+            file_okay=True,
+            dir_okay=False,
+            help="Also write the Hevy table as Parquet (.parquet) or Arrow IPC "
+            "(.arrow, .feather), keeping typed columns",
         ),
     ] = None,
     timezone_offset: Annotated[
         int,
         typer.Option("--timezone", "-tz", help="Timezone offset from UTC in hours"),
     ] = TIMEZONE_OFFSET_HOURS,
+    timezone: Annotated[
+        Optional[str],
+        typer.Option(
+            "--tz",
+            help="IANA timezone name, e.g. Australia/Sydney, applying daylight "
+            "saving per workout date (overrides --timezone)",
+        ),
+    ] = None,
     workout_time: Annotated[
         str,
         typer.Option("--time", "-t", help="Default workout time (HH:MM:SS)"),
     ] = DEFAULT_TRAINING_TIME,
+    engine: Annotated[
+        Engine,
+        typer.Option(
+            "--engine",
+            help="Conversion engine: pandas, or stream for a fast-starting "
+            "engine that does not need pandas",
+        ),
+    ] = Engine.pandas,
+    chunk_size: Annotated[
+        Optional[int],
+        typer.Option(
+            "--chunk-size",
+            min=1,
+            help="Stream the input in chunks of this many rows to bound memory",
+        ),
+    ] = None,
+    max_workouts: Annotated[
+        Optional[int],
+        typer.Option(
+            "--max-workouts-per-file",
+            min=1,
+            help="Split the output into numbered files of at most this many "
+            "workouts",
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        Optional[int],
+        typer.Option(
+            "--max-bytes-per-file",
+            min=1,
+            help="Split the output into numbered files of at most this many "
+            "bytes, between workouts",
+        ),
+    ] = None,
+    mapping_cache: Annotated[
+        bool,
+        typer.Option(
+            "--mapping-cache/--no-mapping-cache",
+            help="Reuse the compiled exercise mapping cache",
+        ),
+    ] = True,
+    refresh_mapping_cache: Annotated[
+        bool,
+        typer.Option(
+            "--refresh-mapping-cache",
+            help="Rebuild the compiled exercise mapping cache",
+        ),
+    ] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            help="Only convert workouts that are new or changed since the last "
+            "incremental run",
+        ),
+    ] = False,
+    state_file: Annotated[
+        pathlib.Path,
+        typer.Option(
+            "--state-file",
+            file_okay=True,
+            dir_okay=False,
+            help="State file used by --incremental",
+        ),
+    ] = pathlib.Path(DEFAULT_STATE_FILE),
+    suggest_mappings: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--suggest-mappings",
+            file_okay=True,
+            dir_okay=False,
+            help="Write a draft custom.json suggesting Hevy names for unmapped "
+            "exercises",
+        ),
+    ] = None,
+    report: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--report",
+            file_okay=True,
+            dir_okay=False,
+            help="Write workout, set and per-exercise statistics as JSON",
+        ),
+    ] = None,
+    profile: Annotated[
+        bool,
+        typer.Option("--profile", help="Print per-stage timing"),
+    ] = False,
+    profile_memory: Annotated[
+        bool,
+        typer.Option(
+            "--profile-memory",
+            help="Also measure per-stage memory usage with tracemalloc, which "
+            "slows down the stages it measures (implies --profile without "
+            "--profile-json)",
+        ),
+    ] = False,
+    profile_json: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--profile-json",
+            file_okay=True,
+            dir_okay=False,
+            help="Write per-stage timing, and memory usage with --profile-memory, "
+            "as JSON",
+        ),
+    ] = None,
 ):
     """Convert FitNotes CSV export to Hevy-compatible format."""
+    if ctx.invoked_subcommand is not None:
+        return
 
     if output_file is None:
         timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
         output_file = pathlib.Path(f"data/output/fitnotes2hevy_{timestamp}.csv")
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    print(f"Reading input file: {input_file}")
+    if timezone is not None:
+        try:
+            resolve_timezone(timezone)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--tz")
+
+    compression = COMPRESSION_SUFFIXES.get(output_file.suffix.lower())
+    if compression is not None and engine is Engine.stream:
+        raise typer.BadParameter(
+            "Compressed output requires the pandas engine", param_hint="--engine"
+        )
+    if engine is Engine.stream and (max_workouts is not None or max_bytes is not None):
+        raise typer.BadParameter(
+            "Splitting the output requires the pandas engine", param_hint="--engine"
+        )
+    limits = (max_workouts, max_bytes)
+    if report is not None and engine is Engine.stream:
+        raise typer.BadParameter(
+            "--report requires the pandas engine", param_hint="--engine"
+        )
+
+    if input_db is None and (since is not None or until is not None):
+        raise typer.BadParameter(
+            "--since and --until require --input-db", param_hint="--since/--until"
+        )
+    if input_db is not None and engine is Engine.stream:
+        raise typer.BadParameter(
+            "--input-db requires the pandas engine", param_hint="--engine"
+        )
+    backup = None
+    if input_db is not None:
+        backup = (
+            input_db,
+            since and since.strftime("%Y-%m-%d"),
+            until and until.strftime("%Y-%m-%d"),
+        )
+
+    print(f"Reading input file: {input_db or input_file}")
+
+    if profile_memory and not profile_json:
+        profile = True
+    profiler = (
+        StageProfiler(trace_memory=profile_memory) if profile or profile_json else None
+    )
+    stage = stage_hook(profiler)
+    summary = ConversionSummary()
 
     # Load mappings
+    with stage("load_mappings") as run:
+        mappings = load_exercise_mappings(
+            use_cache=mapping_cache, refresh=refresh_mapping_cache
+        )
+        run.rows = len(mappings)
+        rules = load_conversion_rules()
+    print(f"Loaded {len(mappings)} exercise mappings")
+
+    if chunk_size is not None and incremental:
+        raise typer.BadParameter("--incremental cannot be combined with --chunk-size")
+    if engine is Engine.stream and (chunk_size is not None or incremental):
+        raise typer.BadParameter(
+            "--chunk-size and --incremental require the pandas engine",
+            param_hint="--engine",
+        )
+    table_input = (
+        input_db is None
+        and input_file.suffix.lower() in PARQUET_SUFFIXES + ARROW_SUFFIXES
+    )
+    if table_input or table_output is not None:
+        param_hint = "--input-file" if table_input else "--table-output"
+        if engine is Engine.stream or chunk_size is not None:
+            raise typer.BadParameter(
+                "Parquet and Arrow files require the pandas engine without "
+                "--chunk-size",
+                param_hint=param_hint,
+            )
+        from fitnotes2hevy.tables import require_pyarrow
+
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            raise typer.BadParameter(str(e), param_hint=param_hint)
+
+    if engine is Engine.stream:
+        unmapped = convert_with_stream(
+            input_file,
+            output_file,
+            mappings,
+            timezone_offset,
+            workout_time,
+            timezone=timezone,
+            rules=rules,
+            profiler=profiler,
+        )
+    elif chunk_size is not None:
+        try:
+            unmapped = convert_in_chunks(
+                input_file,
+                output_file,
+                mappings,
+                chunk_size,
+                timezone_offset,
+                workout_time,
+                timezone=timezone,
+                rules=rules,
+                profiler=profiler,
+                summary=summary,
+                backup=backup,
+                compression=compression,
+                limits=limits,
+            )
+        except ValueError as e:
+            # Exports chunked conversion cannot reproduce exactly
+            raise typer.BadParameter(str(e), param_hint="--chunk-size")
+    else:
+        unmapped = convert_in_memory(
+            input_file,
+            output_file,
+            mappings,
+            timezone_offset,
+            workout_time,
+            timezone=timezone,
+            rules=rules,
+            profiler=profiler,
+            summary=summary,
+            state_file=state_file if incremental else None,
+            table_output=table_output,
+            backup=backup,
+            compression=compression,
+            limits=limits,
+        )
+
+    if suggest_mappings is not None:
+        write_mapping_suggestions(suggest_mappings, unmapped, rules)
+    if report is not None:
+        report.write_text(summary.to_json() + "\n", encoding="utf-8")
+        print(f"Report saved to: {report}")
+    report_profile(profiler, profile, profile_json)
+
+
+@app.command()
+def batch(
+    inputs: Annotated[
+        List[str],
+        typer.Argument(help="FitNotes CSV files, directories or glob patterns"),
+    ],
+    output_dir: Annotated[
+        pathlib.Path,
+        typer.Option(
+            "--output-dir",
+            "-o",
+            file_okay=False,
+            dir_okay=True,
+            help="Directory for the Hevy CSVs and manifest",
+        ),
+    ] = pathlib.Path("data/output/batch"),
+    workers: Annotated[
+        Optional[int],
+        typer.Option(
+            "--workers", "-w", min=1, help="Worker processes (default: CPU count)"
+        ),
+    ] = None,
+    timezone_offset: Annotated[
+        int,
+        typer.Option("--timezone", "-tz", help="Timezone offset from UTC in hours"),
+    ] = TIMEZONE_OFFSET_HOURS,
+    timezone: Annotated[
+        Optional[str],
+        typer.Option(
+            "--tz",
+            help="IANA timezone name, e.g. Australia/Sydney, applying daylight "
+            "saving per workout date (overrides --timezone)",
+        ),
+    ] = None,
+    workout_time: Annotated[
+        str,
+        typer.Option("--time", "-t", help="Default workout time (HH:MM:SS)"),
+    ] = DEFAULT_TRAINING_TIME,
+):
+    """Convert many FitNotes CSV exports in parallel."""
+    if timezone is not None:
+        try:
+            resolve_timezone(timezone)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--tz")
+
+    from fitnotes2hevy.batch import convert_batch, find_input_files, write_manifest
+
+    input_files = find_input_files(inputs)
+    if not input_files:
+        raise typer.BadParameter("No FitNotes CSV files found", param_hint="INPUTS")
+
+    mappings = load_exercise_mappings()
+    print(f"Loaded {len(mappings)} exercise mappings")
+    print(f"Converting {len(input_files)} files into: {output_dir}")
+
+    start = time.perf_counter()
+    entries = convert_batch(
+        input_files,
+        output_dir,
+        mappings,
+        workers,
+        timezone_offset=timezone_offset,
+        workout_time=workout_time,
+        timezone=timezone,
+    )
+    seconds = time.perf_counter() - start
+
+    for entry in entries:
+        if entry["status"] == "ok":
+            print(
+                f"  {entry['input']}: {entry['rows']} sets, "
+                f"{entry['workouts']} workouts, "
+                f"{entry['unmapped_exercises']} unmapped exercises"
+            )
+        else:
+            print(f"  {entry['input']}: FAILED ({entry['error']})")
+
+    manifest_path = output_dir / "manifest.json"
+    write_manifest(manifest_path, entries, seconds)
+    failed = sum(entry["status"] != "ok" for entry in entries)
+    print(
+        f"\nBatch complete in {seconds:.1f}s: "
+        f"{len(entries) - failed} converted, {failed} failed"
+    )
+    print(f"Manifest saved to: {manifest_path}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def merge(
+    inputs: Annotated[
+        List[str],
+        typer.Argument(
+            help="FitNotes CSV files, directories or glob patterns; sets in "
+            "several files are kept from the first"
+        ),
+    ],
+    output_file: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(
+            "--output-file",
+            "-o",
+            file_okay=True,
+            dir_okay=False,
+            help="Output Hevy CSV filepath; a .gz or .zip extension compresses it",
+        ),
+    ] = None,
+    timezone_offset: Annotated[
+        int,
+        typer.Option("--timezone", "-tz", help="Timezone offset from UTC in hours"),
+    ] = TIMEZONE_OFFSET_HOURS,
+    timezone: Annotated[
+        Optional[str],
+        typer.Option(
+            "--tz",
+            help="IANA timezone name, e.g. Australia/Sydney, applying daylight "
+            "saving per workout date (overrides --timezone)",
+        ),
+    ] = None,
+    workout_time: Annotated[
+        str,
+        typer.Option("--time", "-t", help="Default workout time (HH:MM:SS)"),
+    ] = DEFAULT_TRAINING_TIME,
+):
+    """Merge overlapping FitNotes CSV exports and convert them once."""
+    if timezone is not None:
+        try:
+            resolve_timezone(timezone)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--tz")
+
+    from fitnotes2hevy import convert_fitnotes_to_hevy
+    from fitnotes2hevy.batch import find_input_files
+    from fitnotes2hevy.merge import merge_fitnotes_exports
+
+    input_files = find_input_files(inputs)
+    if not input_files:
+        raise typer.BadParameter("No FitNotes CSV files found", param_hint="INPUTS")
+
+    if output_file is None:
+        timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        output_file = pathlib.Path(f"data/output/fitnotes2hevy_{timestamp}.csv")
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+    compression = COMPRESSION_SUFFIXES.get(output_file.suffix.lower())
+
+    mappings = load_exercise_mappings()
+    print(f"Loaded {len(mappings)} exercise mappings")
+    print(f"Merging {len(input_files)} files")
+
+    try:
+        df, entries = merge_fitnotes_exports(input_files)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e), param_hint="INPUTS")
+    for entry in entries:
+        print(
+            f"  {entry['input']}: {entry['sets']} sets, "
+            f"{entry['duplicates']} duplicates"
+        )
+    duplicates = sum(entry["duplicates"] for entry in entries)
+    print(f"Processing {len(df)} sets ({duplicates} duplicates skipped)")
+
+    summary = ConversionSummary()
+    output_df = convert_fitnotes_to_hevy(
+        df,
+        mappings,
+        timezone_offset,
+        workout_time,
+        timezone=timezone,
+        rules=load_conversion_rules(),
+        typed=True,
+        summary=summary,
+    )
+    warn_unmapped(summary.unmapped)
+
+    with open_output(output_file, compression) as writer:
+        writer.write(output_df)
+    print(f"\nConversion complete! Output saved to: {output_file}")
+    print(summary.report())
+
+
+@app.command()
+def serve(
+    host: Annotated[
+        str, typer.Option("--host", help="Address to listen on")
+    ] = "127.0.0.1",
+    port: Annotated[int, typer.Option("--port", "-p", help="Port to listen on")] = 8000,
+    workers: Annotated[
+        Optional[int],
+        typer.Option(
+            "--workers", "-w", min=1, help="Worker processes (default: CPU count)"
+        ),
+    ] = None,
+    queue_size: Annotated[
+        int,
+        typer.Option(
+            "--queue-size",
+            min=0,
+            help="Requests that may wait for a free worker before new ones are "
+            "rejected with 429",
+        ),
+    ] = SERVER_QUEUE_SIZE,
+    max_upload_mb: Annotated[
+        int,
+        typer.Option("--max-upload-mb", min=1, help="Largest accepted upload in MB"),
+    ] = SERVER_MAX_UPLOAD_MB,
+):
+    """Serve conversions over HTTP (POST /convert, POST /preview-mappings)."""
+    from fitnotes2hevy.server import ConversionServer
+
     mappings = load_exercise_mappings()
     print(f"Loaded {len(mappings)} exercise mappings")
 
+    server = ConversionServer(
+        (host, port),
+        mappings,
+        workers,
+        queue_size=queue_size,
+        max_upload_bytes=max_upload_mb * 1024 * 1024,
+    )
+    print(
+        f"Serving on http://{host}:{server.server_address[1]} "
+        f"with {server.workers} workers"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+def convert_in_memory(
+    input_file,
+    output_file,
+    mappings,
+    timezone_offset,
+    workout_time,
+    timezone=None,
+    rules=None,
+    profiler=None,
+    summary=None,
+    state_file=None,
+    table_output=None,
+    backup=None,
+    compression=None,
+    limits=(None, None),
+):
+    """Convert the whole export at once and return its unmapped exercises.
+
+    The statistics of the conversion are collected into summary, a
+    ConversionSummary, which is created here if not given. With a state
+    file, only workouts that are new or changed since the last incremental
+    run are converted. With a table output, the typed Hevy table is also
+    written as Parquet or Arrow IPC. A backup of (path, since, until) is read
+    instead of the input file, the output is compressed with compression
+    ("gzip" or "zip") if given, and split by the (max_workouts, max_bytes)
+    limits.
+    """
+    from fitnotes2hevy import convert_fitnotes_to_hevy
+    from fitnotes2hevy.backup import read_fitnotes_backup
+    from fitnotes2hevy.incremental import (
+        load_state,
+        save_state,
+        select_changed_workouts,
+        settings_fingerprint,
+    )
+    from fitnotes2hevy.tables import read_fitnotes_file, write_hevy_table
+
+    stage = stage_hook(profiler)
+    if summary is None:
+        summary = ConversionSummary()
+
     # Read and convert
-    df = pd.read_csv(input_file)
-    print(f"Processing {len(df)} sets from {df['Date'].nunique()} workouts")
+    with stage("read_csv") as run:
+        if backup is not None:
+            df = read_fitnotes_backup(*backup)
+        else:
+            df = read_fitnotes_file(input_file)
+        run.rows = len(df)
 
-    # Check for unmapped exercises
-    unmapped = df[~df["Exercise"].isin(mappings.keys())]["Exercise"].unique()
-    if len(unmapped) > 0:
-        print(f"Warning: {len(unmapped)} unmapped exercises will keep original names")
-        print("Add them to data/mappings/custom.json to map them.\n")
+    if state_file is not None:
+        fingerprint = settings_fingerprint(
+            mappings,
+            timezone_offset=timezone_offset,
+            workout_time=workout_time,
+            timezone=timezone,
+            rules=None if rules is None else rules.definitions,
+        )
+        with stage("incremental", len(df)):
+            total_workouts = df["Date"].nunique()
+            df, workout_hashes = select_changed_workouts(
+                df, load_state(state_file), fingerprint
+            )
+        print(
+            f"Skipping {total_workouts - df['Date'].nunique()} unchanged workouts "
+            f"(state: {state_file})"
+        )
+        if df.empty:
+            save_state(state_file, fingerprint, workout_hashes)
+            print("No new or changed workouts to convert.")
+            return []
+
+    print(f"Processing {len(df)} sets")
 
     # Convert
-    output_df = convert_fitnotes_to_hevy(df, mappings, timezone_offset, workout_time)
+    output_df = convert_fitnotes_to_hevy(
+        df,
+        mappings,
+        timezone_offset,
+        workout_time,
+        timezone=timezone,
+        rules=rules,
+        typed=True,
+        profiler=profiler,
+        summary=summary,
+    )
+    warn_unmapped(summary.unmapped)
 
     # Save
-    output_df.to_csv(output_file, index=False, sep=";", quoting=1)
+    with stage("write_csv", len(output_df)), open_output(
+        output_file, compression, *limits
+    ) as writer:
+        writer.write(output_df)
+    if table_output is not None:
+        with stage("write_table", len(output_df)):
+            write_hevy_table(output_df, table_output)
+        print(f"Hevy table saved to: {table_output}")
+    print(
+        "\nConversion complete! Output saved to: "
+        f"{describe_output(output_file, compression, limits, writer.shards)}"
+    )
+    print(summary.report())
+
+    if state_file is not None:
+        save_state(state_file, fingerprint, workout_hashes)
+    return list(summary.unmapped)
+
+
+def convert_with_stream(
+    input_file,
+    output_file,
+    mappings,
+    timezone_offset,
+    workout_time,
+    timezone=None,
+    rules=None,
+    profiler=None,
+):
+    """Convert with the pandas-free stream engine and return unmapped exercises."""
+    summary = convert_fitnotes_csv_stream(
+        input_file,
+        output_file,
+        mappings,
+        timezone_offset,
+        workout_time,
+        timezone=timezone,
+        rules=rules,
+        profiler=profiler,
+    )
+    unmapped = summary["unmapped"]
+    warn_unmapped(unmapped)
+
     print(f"\nConversion complete! Output saved to: {output_file}")
-    print(f"Total workouts: {output_df['Workout #'].nunique()}")
-    print(f"Total exercises: {output_df['Exercise Name'].nunique()}")
-    print(f"Total sets: {len(output_df)}")
+    print(f"Total workouts: {summary['workouts']}")
+    print(f"Total exercises: {summary['exercises']}")
+    print(f"Total sets: {summary['sets']}")
+    return unmapped
+
+
+@contextmanager
+def open_output(output_file, compression, max_workouts=None, max_bytes=None):
+    """Open a HevyShardWriter on the output file.
+
+    Without limits every row goes to output_file. With them the output is
+    split into numbered files next to it, or into numbered CSVs inside it
+    for a .zip output.
+    """
+    from fitnotes2hevy.converter import (
+        HevyShardWriter,
+        open_hevy_csv,
+        open_hevy_csv_shards,
+    )
+
+    with ExitStack() as stack:
+        if max_workouts is None and max_bytes is None:
+
+            def open_shard(number):
+                return open_hevy_csv(output_file, compression)
+
+        else:
+            open_shard = stack.enter_context(
+                open_hevy_csv_shards(output_file, compression)
+            )
+        yield stack.enter_context(HevyShardWriter(open_shard, max_workouts, max_bytes))
+
+
+def describe_output(output_file, compression, limits, shards):
+    """Describe where the output was written, naming the first and last split file."""
+    from fitnotes2hevy.converter import shard_name
+
+    if limits == (None, None):
+        return str(output_file)
+    if compression == "zip":
+        return f"{output_file} ({shards} CSV files)"
+    first = output_file.with_name(shard_name(output_file.name, 1))
+    if shards == 1:
+        return str(first)
+    last = output_file.with_name(shard_name(output_file.name, shards))
+    return f"{first} to {last.name} ({shards} files)"
+
+
+def warn_unmapped(unmapped):
+    """Warn that the unmapped exercises keep their FitNotes names."""
+    if unmapped:
+        print(f"Warning: {len(unmapped)} unmapped exercises will keep original names")
+        print("Add them to data/mappings/custom.json to map them.\n")
+
+
+def write_mapping_suggestions(path, unmapped, rules=None):
+    """Write a draft custom.json with suggested Hevy names for unmapped exercises."""
+    index = SuggestionIndex.from_file()
+    draft = draft_custom_mappings(index.suggest_many(sorted(unmapped)), rules)
+    path.write_text(
+        json.dumps(draft, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+    print(f"Draft mappings for {len(unmapped)} unmapped exercises saved to: {path}")
+
+
+def report_profile(profiler, profile, profile_json):
+    """Print and/or save the collected stage measurements."""
+    if profiler is None:
+        return
+    profiler.close()
+    if profile:
+        print(f"\n{profiler.report()}")
+    if profile_json:
+        profile_json.write_text(profiler.to_json() + "\n", encoding="utf-8")
+        print(f"Profile saved to: {profile_json}")
+
+
+def convert_in_chunks(
+    input_file,
+    output_file,
+    mappings,
+    chunk_size,
+    timezone_offset,
+    workout_time,
+    timezone=None,
+    rules=None,
+    profiler=None,
+    summary=None,
+    backup=None,
+    compression=None,
+    limits=(None, None),
+):
+    """Stream the conversion chunk by chunk and return unmapped exercises.
+
+    The statistics of all chunks are collected into summary, a
+    ConversionSummary, which is created here if not given. A backup of
+    (path, since, until) is read instead of the input file, the output is
+    compressed with compression ("gzip" or "zip") if given, and split by the
+    (max_workouts, max_bytes) limits.
+    """
+    from fitnotes2hevy.backup import read_fitnotes_backup
+    from fitnotes2hevy.converter import convert_fitnotes_chunks, read_fitnotes_csv
+
+    print(f"Streaming input in chunks of {chunk_size} rows")
+
+    if summary is None:
+        summary = ConversionSummary()
+    stage = stage_hook(profiler)
+
+    def read_chunks(reader):
+        while True:
+            with stage("read_csv") as run:
+                chunk = next(reader, None)
+                run.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
+    if backup is not None:
+        reader = read_fitnotes_backup(*backup, chunksize=chunk_size)
+    else:
+        reader = read_fitnotes_csv(input_file, chunksize=chunk_size)
+
+    with closing(reader) as chunks, open_output(
+        output_file, compression, *limits
+    ) as writer:
+        hevy_chunks = convert_fitnotes_chunks(
+            read_chunks(chunks),
+            mappings,
+            timezone_offset,
+            workout_time,
+            timezone=timezone,
+            rules=rules,
+            typed=True,
+            profiler=profiler,
+            summary=summary,
+        )
+        for output_df in hevy_chunks:
+            with stage("write_csv", len(output_df)):
+                writer.write(output_df)
+
+    warn_unmapped(summary.unmapped)
+
+    print(
+        "\nConversion complete! Output saved to: "
+        f"{describe_output(output_file, compression, limits, writer.shards)}"
+    )
+    print(summary.report())
+    return list(summary.unmapped)
 
 
 if __name__ == "__main__":
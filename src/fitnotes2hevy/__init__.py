@@ -3,10 +3,27 @@
 __version__ = "1.0.0"
 __author__ = "Alan Jones"
 
-from .converter import convert_fitnotes_to_hevy
 from .mappings import load_exercise_mappings
+from .profiling import StageProfiler
+from .stream import convert_fitnotes_csv_stream
+from .suggestions import SuggestionIndex
+from .summary import ConversionSummary
 
 __all__ = [
+    "ConversionSummary",
     "convert_fitnotes_to_hevy",
+    "convert_fitnotes_csv_stream",
     "load_exercise_mappings",
+    "StageProfiler",
+    "SuggestionIndex",
 ]
+
+
+def __getattr__(name):
+    # The pandas engine is imported on first use, so code that only needs
+    # the stream engine never pays for importing pandas
+    if name == "convert_fitnotes_to_hevy":
+        from .converter import convert_fitnotes_to_hevy
+
+        return convert_fitnotes_to_hevy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,145 @@
+"""Read workouts straight from a FitNotes SQLite backup."""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from .converter import apply_fitnotes_dtypes
+
+# First bytes of every SQLite database file, which FitNotes backups are
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Comment.owner_type_id of comments attached to a logged set
+SET_COMMENT_TYPE = 1
+
+# Joins the training log with its exercise, category and set comment and
+# returns the columns of a FitNotes CSV export, in export order. Weights are
+# stored in kilograms; values a set does not use are stored as 0 and returned
+# as NULL, like the blank cells of an export
+BACKUP_QUERY = """
+SELECT
+    tl.date AS "Date",
+    e.name AS "Exercise",
+    c.name AS "Category",
+    CASE WHEN tl.metric_weight = 0 AND tl.reps = 0 THEN NULL
+        ELSE tl.metric_weight END AS "Weight",
+    CASE WHEN tl.metric_weight = 0 AND tl.reps = 0 THEN NULL
+        ELSE 'kgs' END AS "Weight Unit",
+    NULLIF(tl.reps, 0) AS "Reps",
+    NULLIF(tl.distance, 0) AS "Distance",
+    CASE WHEN tl.distance > 0 THEN 'm' END AS "Distance Unit",
+    CASE WHEN tl.duration_seconds > 0 THEN printf(
+        '%d:%02d:%02d',
+        tl.duration_seconds / 3600,
+        tl.duration_seconds / 60 % 60,
+        tl.duration_seconds % 60
+    ) END AS "Time",
+    cm.comment AS "Comment"
+FROM training_log AS tl
+JOIN exercise AS e ON e._id = tl.exercise_id
+LEFT JOIN Category AS c ON c._id = e.category_id
+LEFT JOIN Comment AS cm
+    ON cm.owner_id = tl._id AND cm.owner_type_id = :comment_type
+WHERE (:since IS NULL OR tl.date >= :since)
+    AND (:until IS NULL OR tl.date <= :until)
+ORDER BY tl.date, tl._id
+"""
+
+
+def is_fitnotes_backup(head):
+    """Return whether the first bytes of a file are an SQLite database."""
+    return head[: len(SQLITE_HEADER)] == SQLITE_HEADER
+
+
+def _connect(path):
+    """Open a backup read-only, so a wrong path never creates a database."""
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def _query_chunks(connect, params, chunksize):
+    with closing(connect()) as conn:
+        for chunk in pd.read_sql_query(
+            BACKUP_QUERY, conn, params=params, chunksize=chunksize
+        ):
+            yield apply_fitnotes_dtypes(chunk)
+
+
+def _read_backup(connect, since, until, chunksize):
+    params = {"since": since, "until": until, "comment_type": SET_COMMENT_TYPE}
+    try:
+        with closing(connect()) as conn:
+            # Fails early on files that are not FitNotes backups
+            conn.execute("SELECT 1 FROM training_log, exercise LIMIT 0")
+            if chunksize is None:
+                return apply_fitnotes_dtypes(
+                    pd.read_sql_query(BACKUP_QUERY, conn, params=params)
+                )
+    except sqlite3.DatabaseError as e:
+        raise ValueError(
+            f"Invalid backup file. This doesn't appear to be a FitNotes backup "
+            f"({e}).\n\n"
+            f"Create one in FitNotes → Settings → Backup → Create Backup."
+        ) from None
+    return _query_chunks(connect, params, chunksize)
+
+
+def read_fitnotes_backup(path, since=None, until=None, chunksize=None):
+    """Read the sets of a FitNotes backup in the shape of a CSV export.
+
+    The date range is applied in the SQL query, so sets outside it are never
+    loaded.
+
+    Args:
+        path: FitNotes backup (.fitnotes) filepath
+        since: Optional first date to include, as YYYY-MM-DD
+        until: Optional last date to include, as YYYY-MM-DD
+        chunksize: Number of rows per chunk, or None to read all sets
+
+    Returns:
+        DataFrame with the columns and types read_fitnotes_csv produces, or
+        an iterator of such DataFrames when chunksize is set
+
+    Raises:
+        ValueError: If the file is not a FitNotes backup
+    """
+    return _read_backup(lambda: _connect(path), since, until, chunksize)
+
+
+def read_fitnotes_backup_bytes(data, since=None, until=None):
+    """Read the sets of an in-memory FitNotes backup, e.g. an upload.
+
+    The backup is opened in memory where SQLite supports it (Python 3.11+);
+    older versions write it to a temporary file that is removed once the sets
+    are read.
+
+    Args:
+        data: Bytes of the FitNotes backup
+        since: Optional first date to include, as YYYY-MM-DD
+        until: Optional last date to include, as YYYY-MM-DD
+
+    Returns:
+        DataFrame with the columns and types read_fitnotes_csv produces
+
+    Raises:
+        ValueError: If the data is not a FitNotes backup
+    """
+    if sys.version_info >= (3, 11):
+
+        def connect():
+            conn = sqlite3.connect(":memory:")
+            conn.deserialize(data)
+            return conn
+
+        return _read_backup(connect, since, until, None)
+    with tempfile.NamedTemporaryFile(suffix=".fitnotes", delete=False) as f:
+        f.write(data)
+    try:
+        return read_fitnotes_backup(f.name, since, until)
+    finally:
+        os.unlink(f.name)
@@ -0,0 +1,154 @@
+"""Parallel conversion of many FitNotes exports."""
+
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .converter import (
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    validate_fitnotes_dataframe,
+    write_hevy_csv,
+)
+from .rules import load_conversion_rules
+from .summary import ConversionSummary
+
+# Mappings and rules for the current worker process, set once by _init_worker
+_worker_mappings = {}
+_worker_rules = None
+
+
+def find_input_files(patterns):
+    """Expand directories and glob patterns into FitNotes CSV filepaths.
+
+    Args:
+        patterns: Files, directories (all *.csv inside) or glob patterns
+
+    Returns:
+        list: Unique Paths, in the order given
+    """
+    files = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.csv")))
+        elif glob.has_magic(str(pattern)):
+            files.extend(Path(match) for match in sorted(glob.glob(str(pattern))))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def _output_paths(input_files, output_dir):
+    """Name one output per input, disambiguating repeated file names."""
+    seen = {}
+    outputs = []
+    for input_file in input_files:
+        count = seen.get(input_file.stem, 0) + 1
+        seen[input_file.stem] = count
+        suffix = "" if count == 1 else f"_{count}"
+        outputs.append(Path(output_dir) / f"{input_file.stem}{suffix}_hevy.csv")
+    return outputs
+
+
+def _init_worker(mappings, rules):
+    """Store the mappings and rules once per worker instead of once per file."""
+    global _worker_mappings, _worker_rules
+    _worker_mappings = mappings
+    _worker_rules = rules
+
+
+def _convert_file(input_file, output_file, settings):
+    """Convert one export in a worker process and describe the result."""
+    start = time.perf_counter()
+    df = read_fitnotes_csv(input_file)
+    validate_fitnotes_dataframe(df)
+
+    summary = ConversionSummary()
+    output_df = convert_fitnotes_to_hevy(
+        df,
+        _worker_mappings,
+        rules=_worker_rules,
+        typed=True,
+        summary=summary,
+        **settings,
+    )
+    write_hevy_csv(output_df, output_file)
+    return {
+        "rows": len(output_df),
+        "workouts": summary.workouts,
+        "unmapped_exercises": len(summary.unmapped),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def convert_batch(
+    input_files, output_dir, mappings, workers=None, rules=None, **settings
+):
+    """Convert many FitNotes exports in parallel.
+
+    Files are fanned out over a process pool whose workers receive the
+    mappings and rules once at startup. A failure in one file is recorded in its
+    manifest entry and does not stop the others.
+
+    Args:
+        input_files: FitNotes CSV filepaths
+        output_dir: Directory for the Hevy CSVs
+        mappings: Exercise name mappings dict
+        workers: Number of worker processes (default: CPU count)
+        rules: ConversionRules to apply (default: load_conversion_rules())
+        **settings: Keyword arguments for convert_fitnotes_to_hevy
+
+    Returns:
+        list: One manifest entry dict per input file, in input order
+    """
+    if rules is None:
+        rules = load_conversion_rules()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    input_files = [Path(input_file) for input_file in input_files]
+    output_files = _output_paths(input_files, output_dir)
+    entries = [
+        {"input": str(input_file), "output": str(output_file)}
+        for input_file, output_file in zip(input_files, output_files)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(mappings, rules)
+    ) as pool:
+        futures = {
+            pool.submit(_convert_file, input_file, output_file, settings): entry
+            for input_file, output_file, entry in zip(
+                input_files, output_files, entries
+            )
+        }
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                entry.update(status="ok", **future.result())
+            except Exception as e:
+                entry.update(status="error", error=f"{type(e).__name__}: {e}")
+    return entries
+
+
+def write_manifest(path, entries, seconds):
+    """Write a batch manifest with per-file results and totals.
+
+    Args:
+        path: Manifest JSON filepath
+        entries: Entries from convert_batch
+        seconds: Wall time of the whole batch
+    """
+    succeeded = [entry for entry in entries if entry["status"] == "ok"]
+    manifest = {
+        "files": len(entries),
+        "succeeded": len(succeeded),
+        "failed": len(entries) - len(succeeded),
+        "rows": sum(entry["rows"] for entry in succeeded),
+        "workouts": sum(entry["workouts"] for entry in succeeded),
+        "seconds": seconds,
+        "results": entries,
+    }
+    Path(path).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
@@ -1,5 +1,7 @@
 """Configuration settings for FitNotes to Hevy conversion."""
 
+import warnings
+
 # Input file path (set this to your FitNotes export file)
 INPUT_FILE_PATH = "data/input/FitNotes_Export_2025_11_19_10_20_01.csv"
 
@@ -10,18 +12,41 @@ DEFAULT_WORKOUT_NAME = "Workout"
 DEFAULT_DURATION = "60m"
 DEFAULT_WORKOUT_NOTES = "Imported from FitNotes"
 
-# Exercise conversion rules
-TIME_TO_REPS_EXERCISES = [
-    "Bird Dog",
-    "Dead Bug",
-    "Deadbug",
-    "Flutter Kicks",
-    "Flutter Kick",
-]
-TIME_TO_DISTANCE_EXERCISES = [
-    "Farmers Walk",
-    "Farmer Walk",
-    "Farmer's Walk",
-    "Farmer's Carry",
-]
-REPS_TO_TIME_EXERCISES = ["Warm Up"]
+# Exercise conversion rules (time to reps, time to distance, reps to time and
+# note prefixes) are defined in data/mappings/rules.json. The exercise lists
+# that used to be defined here are still readable, read from the rules, but
+# deprecated; see __getattr__ below
+_DEPRECATED_RULE_LISTS = {
+    "TIME_TO_REPS_EXERCISES": "seconds_to_reps",
+    "TIME_TO_DISTANCE_EXERCISES": "seconds_to_distance",
+    "REPS_TO_TIME_EXERCISES": "reps_to_seconds",
+}
+
+# Columnar file formats, read and written with the optional pyarrow package
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+# Hevy CSV outputs with these extensions are written compressed
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zip": "zip"}
+
+# HTTP service limits: uploads larger than this are rejected, and requests
+# beyond the workers plus this many queued ones are turned away with 429
+SERVER_MAX_UPLOAD_MB = 50
+SERVER_QUEUE_SIZE = 8
+
+
+def __getattr__(name):
+    # The removed exercise lists, as the Hevy names of the matching rules
+    if name in _DEPRECATED_RULE_LISTS:
+        transform = _DEPRECATED_RULE_LISTS[name]
+        warnings.warn(
+            f"config.{name} is deprecated; conversion rules are defined in "
+            f"data/mappings/rules.json. Use "
+            f"load_conversion_rules().hevy_names({transform!r}) instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        from .rules import load_conversion_rules
+
+        return load_conversion_rules().hevy_names(transform)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
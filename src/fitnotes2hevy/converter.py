@@ -1,55 +1,162 @@
 """Core conversion logic for FitNotes to Hevy format."""
 
+import gzip
+import io
+import os
+import zipfile
+from contextlib import ExitStack, contextmanager
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 
 from .config import *
+from .profiling import stage_hook
+from .rules import NO_MATCH, load_conversion_rules
+from .stream import (
+    HEVY_COLUMNS,
+    NA_VALUES,
+    check_fitnotes_columns,
+    check_fitnotes_contents,
+    parse_duration,
+    resolve_timezone,
+)
 
+# Input columns the conversion reads from each set
+SET_COLUMNS = ["Exercise", "Weight", "Reps", "Distance", "Time", "Comment"]
 
-def validate_fitnotes_dataframe(df):
-    """Validate that DataFrame matches FitNotes export format.
+# Column types pinned when reading FitNotes CSVs, so every chunk of an export
+# is parsed the same way regardless of which values it happens to contain.
+# Columns with a handful of distinct values are stored as categories
+FITNOTES_DTYPES = {
+    "Date": str,
+    "Exercise": "category",
+    "Category": "category",
+    "Weight": "float64",
+    "Weight Unit": "category",
+    "Reps": "float64",
+    "Distance": "float64",
+    "Distance Unit": "category",
+    "Time": str,
+    "Comment": str,
+}
+
+# Numbering columns, written as floats when any of their values is missing
+COUNT_COLUMNS = ["Workout #", "Set Order"]
+
+# Rows formatted at a time when writing a Hevy CSV, so the formatted text
+# held in memory stays bounded regardless of the export size
+CSV_CHUNK_ROWS = 10_000
+
+# Compressions a Hevy CSV can be written with
+CSV_COMPRESSIONS = ("gzip", "zip")
+
+
+def apply_fitnotes_dtypes(df):
+    """Keep the FitNotes columns of a DataFrame and give them FITNOTES_DTYPES.
+
+    Text columns are left as they are, so missing values stay missing.
 
     Args:
-        df: DataFrame to validate
+        df: FitNotes data read by something other than read_fitnotes_csv
 
-    Raises:
-        ValueError: If validation fails with descriptive message
+    Returns:
+        DataFrame with the columns and types read_fitnotes_csv produces
     """
-    # Check required columns
-    required_columns = [
-        "Date",
-        "Exercise",
-        "Category",
-        "Weight",
-        "Weight Unit",
-        "Reps",
-        "Distance",
-        "Distance Unit",
-        "Time",
-    ]
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    df = df[[column for column in df.columns if column in FITNOTES_DTYPES]]
+    return df.astype(
+        {
+            column: dtype
+            for column, dtype in FITNOTES_DTYPES.items()
+            if column in df.columns and dtype != str
+        }
+    )
 
-    if missing_columns:
-        raise ValueError(
-            f"Invalid file format. This doesn't appear to be a FitNotes export. "
-            f"Missing columns: {', '.join(missing_columns)}.\n\n"
-            f"Please upload a CSV file exported from FitNotes. "
-            f"Go to FitNotes → Settings → Spreadsheet Export → Workout Data."
-        )
 
-    # Check if DataFrame is empty
-    if df.empty:
-        raise ValueError(
-            "The file is empty. Please upload a FitNotes export with workout data."
+def _read_fitnotes_csv_pyarrow(filepath_or_buffer):
+    """Parse a whole FitNotes CSV with pyarrow's multithreaded reader.
+
+    Returns None when pyarrow is not installed, the input is a text buffer
+    or pyarrow cannot parse the file the way pandas would, so the caller
+    falls back to the pandas parser.
+    """
+    if isinstance(filepath_or_buffer, io.TextIOBase):
+        # pyarrow only reads paths and binary files
+        return None
+    try:
+        from pyarrow import csv
+    except ImportError:
+        return None
+
+    if isinstance(filepath_or_buffer, os.PathLike):
+        filepath_or_buffer = os.fspath(filepath_or_buffer)
+    is_buffer = hasattr(filepath_or_buffer, "seek")
+    start = filepath_or_buffer.tell() if is_buffer else 0
+    try:
+        table = csv.read_csv(
+            filepath_or_buffer,
+            parse_options=csv.ParseOptions(newlines_in_values=True),
+            convert_options=csv.ConvertOptions(
+                column_types={
+                    column: "float64" if dtype == "float64" else "string"
+                    for column, dtype in FITNOTES_DTYPES.items()
+                },
+                null_values=sorted(NA_VALUES),
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=True,
+            ),
         )
+    except (ValueError, TypeError):
+        # Values pyarrow rejects but pandas may accept, e.g. padded numbers,
+        # and text file objects that are not io.TextIOBase
+        if is_buffer:
+            filepath_or_buffer.seek(start)
+        return None
+
+    df = table.to_pandas()
+    df.columns = [column.lstrip("\ufeff") for column in df.columns]
+    return apply_fitnotes_dtypes(df)
+
+
+def read_fitnotes_csv(filepath_or_buffer, chunksize=None):
+    """Read a FitNotes CSV export with consistent column types.
+
+    Only the FitNotes columns are read; anything else in the file is skipped.
+    Whole files are parsed with pyarrow's multithreaded CSV reader when
+    pyarrow is installed.
+
+    Args:
+        filepath_or_buffer: Path or file-like object of the FitNotes export
+        chunksize: Number of rows per chunk, or None to read the whole file
+
+    Returns:
+        DataFrame, or a reader yielding DataFrames when chunksize is set
+    """
+    if chunksize is None:
+        df = _read_fitnotes_csv_pyarrow(filepath_or_buffer)
+        if df is not None:
+            return df
+    return pd.read_csv(
+        filepath_or_buffer,
+        usecols=lambda column: column in FITNOTES_DTYPES,
+        dtype=FITNOTES_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def validate_fitnotes_dataframe(df):
+    """Validate that DataFrame matches FitNotes export format.
 
-    # Check if required fields have data
-    if df["Date"].isna().all():
-        raise ValueError("No valid dates found in the file.")
+    Args:
+        df: DataFrame to validate
 
-    if df["Exercise"].isna().all():
-        raise ValueError("No exercises found in the file.")
+    Raises:
+        ValueError: If validation fails with descriptive message
+    """
+    check_fitnotes_columns(df.columns)
+    check_fitnotes_contents(
+        len(df), df["Date"].notna().any(), df["Exercise"].notna().any()
+    )
 
 
 def parse_time_to_seconds(time_str):
@@ -68,6 +175,234 @@ def parse_time_to_seconds(time_str):
         return 0
 
 
+# HH:MM:SS or MM:SS, allowing the whitespace and signs int() accepts per part
+_CLOCK_PATTERN = r"^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::\s*([+-]?\d+)\s*)?$"
+
+
+def parse_time_series(times):
+    """Vectorized ``parse_time_to_seconds`` for a whole Time column.
+
+    Only the distinct time values are parsed, with a regex extract for
+    HH:MM:SS and MM:SS and a numeric conversion for plain or float seconds,
+    and the results are broadcast back by factorized code.
+
+    Args:
+        times: Series of FitNotes Time values
+
+    Returns:
+        int64 Series of seconds, 0 where the time is blank or unparseable
+    """
+    codes, uniques = pd.factorize(times)
+    text = pd.Series(uniques, dtype=object).astype("string")
+    # Missing values have code -1, which picks up the trailing zero slot
+    parsed = np.zeros(len(text) + 1, dtype="int64")
+    unique_seconds = parsed[:-1]
+
+    clock = text.str.extract(_CLOCK_PATTERN)
+    is_clock = clock[0].notna().to_numpy()
+    if is_clock.any():
+        has_hours = clock[2].notna().to_numpy()[is_clock]
+        parts = clock[is_clock].fillna("0").astype("int64").to_numpy()
+        unique_seconds[is_clock] = np.where(
+            has_hours,
+            parts[:, 0] * 3600 + parts[:, 1] * 60 + parts[:, 2],
+            parts[:, 0] * 60 + parts[:, 1],
+        )
+
+    plain = ~text.str.contains(":", regex=False, na=True).to_numpy()
+    if plain.any():
+        numbers = pd.to_numeric(text[plain], errors="coerce").to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        finite = np.isfinite(numbers)
+        unique_seconds[np.flatnonzero(plain)[finite]] = np.trunc(numbers[finite])
+
+    return pd.Series(parsed.take(codes), index=times.index, dtype="int64")
+
+
+def _blank_series(index):
+    """Create an object Series of empty strings for the given index."""
+    return pd.Series("", index=index, dtype=object)
+
+
+def _missing_series(index):
+    """Create an Int64 Series of missing values for the given index."""
+    return pd.Series(pd.NA, index=index, dtype="Int64")
+
+
+def _is_present(values):
+    """Return a mask of values that are neither missing nor empty strings."""
+    return values.notna() & (values != "")
+
+
+def _nullable(values):
+    """Move a numeric Series to the matching nullable dtype."""
+    if pd.api.types.is_float_dtype(values):
+        return values.astype("Float64")
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype("Int64")
+    return values
+
+
+def _with_missing(codes):
+    """Turn factorized codes into group keys, with missing values as NaN.
+
+    Grouping on these matches grouping on the original values, which drops
+    missing ones, at the cost of integer rather than string hashing.
+    """
+    if (codes < 0).any():
+        return np.where(codes < 0, np.nan, codes)
+    return codes
+
+
+def _broadcast(values, codes):
+    """Expand per-unique values back to rows by code, with NaN for code -1."""
+    if (codes < 0).any():
+        values = np.append(values, np.nan)
+    return values.take(codes)
+
+
+def _workout_timestamps(dates, workout_time, timezone_offset, timezone=None):
+    """Timestamp and shift each distinct workout date to UTC.
+
+    With an IANA timezone the UTC offset is resolved per date, so daylight
+    saving is applied. Ambiguous local times resolve to daylight time and
+    times skipped by a DST change move forward to the end of the gap.
+
+    Args:
+        dates: Distinct FitNotes date strings
+        workout_time: Workout time string (HH:MM:SS)
+        timezone_offset: Timezone offset in hours, used without a timezone
+        timezone: Optional IANA timezone name
+
+    Returns:
+        DatetimeIndex of naive UTC timestamps, aligned with ``dates``
+    """
+    stamps = dates + " " + workout_time
+    try:
+        parsed = pd.to_datetime(stamps, format="%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        # Not the usual FitNotes layout; let pandas infer it
+        parsed = pd.to_datetime(stamps)
+    if timezone is None:
+        return parsed - timedelta(hours=timezone_offset)
+    return (
+        parsed.tz_localize(
+            resolve_timezone(timezone),
+            ambiguous=True,
+            nonexistent="shift_forward",
+        )
+        .tz_convert("UTC")
+        .tz_localize(None)
+    )
+
+
+def _exercise_codes(exercise):
+    """Return integer codes and the distinct names of an Exercise column.
+
+    Categorical columns, as read by read_fitnotes_csv, already carry both,
+    so their strings are never hashed; other columns are factorized once.
+    """
+    if isinstance(exercise.dtype, pd.CategoricalDtype):
+        return exercise.cat.codes.to_numpy(), exercise.cat.categories
+    return pd.factorize(exercise)
+
+
+def _map_exercises(exercises, mappings):
+    """Map distinct FitNotes names to Hevy names, keeping unmapped names."""
+    hevy_names = []
+    for fitnotes_name in exercises:
+        mapped = mappings.get(fitnotes_name)
+        hevy_names.append(fitnotes_name if mapped is None else mapped)
+    return hevy_names
+
+
+def unmapped_exercises(exercise, mappings):
+    """Find the exercises of a FitNotes Exercise column that have no mapping.
+
+    Args:
+        exercise: FitNotes Exercise column
+        mappings: Exercise name mappings dict
+
+    Returns:
+        list: Unmapped FitNotes names, in order of first appearance
+    """
+    codes, exercises = _exercise_codes(exercise)
+    present = pd.unique(codes[codes >= 0])
+    return [exercises[code] for code in present if exercises[code] not in mappings]
+
+
+def _match_rules(codes, exercises, hevy_names, rules, index):
+    """Evaluate the conversion rules per distinct exercise, then per row.
+
+    Args:
+        codes: Exercise code per row, -1 where the exercise is missing
+        exercises: Distinct FitNotes names
+        hevy_names: Hevy name per distinct FitNotes name
+        rules: ConversionRules
+        index: Index of the rows
+
+    Returns:
+        DataFrame with a column per RuleMatch field
+    """
+    matches = [
+        rules.match(fitnotes_name, hevy_name)
+        for fitnotes_name, hevy_name in zip(exercises, hevy_names)
+    ]
+    # Code -1 (missing exercise) takes the trailing no-match row
+    table = pd.DataFrame(matches + [NO_MATCH], columns=NO_MATCH._fields)
+    return table.take(codes).set_axis(index)
+
+
+def order_sets(date_codes, date_ranks, exercise_codes, name_codes):
+    """Order sets for Hevy and number them within each exercise.
+
+    Workouts are ordered by date, the exercises of a workout by their first
+    set, and the sets of an exercise by their original order. Everything is
+    done on integer keys with a single stable argsort: each (date, exercise)
+    pair is factorized in order of first appearance, so within a date its
+    code already gives the exercise order. Sets with a missing date go last,
+    as do sets with a missing exercise within their date.
+
+    Args:
+        date_codes: Workout date code of each set, -1 where missing
+        date_ranks: Rank of each workout date's timestamp, indexed by date
+            code; dates with equal timestamps share a rank
+        exercise_codes: FitNotes exercise code of each set, -1 where missing
+        name_codes: Hevy exercise name code of each set, -1 where missing
+
+    Returns:
+        tuple: (positions of the sets in output order, Int64 Set Order of
+            each set in output order, NA where the date or name is missing)
+    """
+    sets = len(date_codes)
+    has_date = date_codes >= 0
+    # Missing dates rank after every workout
+    ranks = np.where(has_date, date_ranks.take(date_codes), len(date_ranks))
+
+    has_exercise = has_date & (exercise_codes >= 0)
+    exercise_keys = pd.factorize(
+        np.where(
+            has_exercise,
+            date_codes * (exercise_codes.max(initial=0) + 1) + exercise_codes,
+            -1,
+        )
+    )[0]
+    exercise_keys[~has_exercise] = sets
+    order = np.argsort(ranks * (sets + 1) + exercise_keys, kind="stable")
+
+    # Number sets per workout and Hevy name; names can repeat within a
+    # workout when several FitNotes exercises map to the same Hevy exercise
+    ranks = ranks[order]
+    name_codes = name_codes[order]
+    numbered = (ranks < len(date_ranks)) & (name_codes >= 0)
+    set_keys = np.where(
+        numbered, ranks * (name_codes.max(initial=0) + 1) + name_codes, -1
+    )
+    set_order = pd.Series(set_keys).groupby(set_keys, sort=False).cumcount() + 1
+    return order, pd.arrays.IntegerArray(set_order.to_numpy(), ~numbered)
+
+
 def convert_fitnotes_to_hevy(
     df,
     mappings,
@@ -76,6 +411,11 @@ def convert_fitnotes_to_hevy(
     workout_name=DEFAULT_WORKOUT_NAME,
     workout_duration=DEFAULT_DURATION,
     workout_notes=DEFAULT_WORKOUT_NOTES,
+    timezone=None,
+    rules=None,
+    typed=False,
+    profiler=None,
+    summary=None,
 ):
     """Convert FitNotes DataFrame to Hevy format.
 
@@ -87,6 +427,15 @@ def convert_fitnotes_to_hevy(
         workout_name: Workout name
         workout_duration: Workout duration
         workout_notes: Workout notes
+        timezone: Optional IANA timezone name; overrides timezone_offset with
+            the daylight-saving-aware offset of each workout date
+        rules: ConversionRules to apply (default: load_conversion_rules())
+        typed: Return typed columns (nullable integers and floats, UTC
+            timestamps) instead of the formatted CSV text; format them later
+            with format_hevy_dataframe or write_hevy_csv
+        profiler: Optional StageProfiler recording per-stage measurements
+        summary: Optional ConversionSummary to add this conversion's counts
+            and per-exercise statistics to
 
     Returns:
         DataFrame in Hevy format
@@ -94,134 +443,684 @@ def convert_fitnotes_to_hevy(
     Raises:
         ValueError: If input data is invalid
     """
+    stage = stage_hook(profiler)
+    rows = len(df)
+
     # Validate input
-    validate_fitnotes_dataframe(df)
+    with stage("validate", rows):
+        validate_fitnotes_dataframe(df)
 
     # Normalize workout time format (add :00 if only HH:MM)
     if workout_time.count(":") == 1:
         workout_time = workout_time + ":00"
 
-    # Prepare data
-    df["first_appearance"] = df.groupby(["Date", "Exercise"]).cumcount()
-    df["exercise_order"] = df.groupby(["Date", "Exercise"])[
-        "first_appearance"
-    ].transform("idxmin")
+    # Factorize the dates once; ordering, workout numbers and timestamps
+    # all work on the distinct dates through these codes
+    date_codes, dates = pd.factorize(df["Date"], sort=True)
+    # Likewise, mapping, rules and grouping work on distinct exercises
+    exercise_codes, exercises = _exercise_codes(df["Exercise"])
 
     # Convert fields
-    df["Workout #"] = df.groupby("Date").ngroup() + 1
-    df["Date"] = (
-        pd.to_datetime(df["Date"] + " " + workout_time)
-        - timedelta(hours=timezone_offset)
-    ).dt.strftime("%Y-%m-%d %H:%M:%S")
-    df["Workout Name"] = workout_name
-
-    duration_str = str(workout_duration).lower()
-    duration_sec = (
-        int(duration_str.replace("m", "")) * 60
-        if "m" in duration_str
-        else (
-            int(duration_str.replace("s", ""))
-            if "s" in duration_str
-            else int(duration_str)
+    with stage("dates", rows):
+        timestamps = _workout_timestamps(dates, workout_time, timezone_offset, timezone)
+        # Workouts are ordered by this rank; equal timestamps share it
+        date_ranks = pd.factorize(timestamps, sort=True)[0]
+
+    with stage("mapping", rows):
+        hevy_names = _map_exercises(exercises, mappings)
+        name_codes, names = pd.factorize(pd.Index(hevy_names, dtype=object))
+        # Missing exercises (code -1) keep code -1, i.e. a missing name
+        name_codes = np.append(name_codes, -1).take(exercise_codes)
+
+    # Order the sets, then take just the columns the conversion reads. Nothing
+    # is written to the caller's DataFrame, so it can be converted again
+    with stage("order", rows):
+        order, set_order = order_sets(
+            date_codes, date_ranks, exercise_codes, name_codes
         )
-    )
-    df["Duration (sec)"] = duration_sec
+        df = df[[column for column in SET_COLUMNS if column in df.columns]].take(order)
+        date_codes = date_codes[order]
+        exercise_codes = exercise_codes[order]
+        name_codes = name_codes[order]
 
-    df["Exercise Name"] = df["Exercise"].map(mappings).fillna(df["Exercise"])
+        df["Workout #"] = pd.array(_with_missing(date_codes) + 1, dtype="Int64")
+        df["Date"] = timestamps.take(date_codes, allow_fill=True, fill_value=pd.NaT)
+        df["Workout Name"] = workout_name
+        df["Duration (sec)"] = parse_duration(workout_duration)
+        df["Exercise Name"] = pd.Categorical.from_codes(name_codes, categories=names)
+        df["Set Order"] = set_order
 
-    df = df.sort_values(["Date", "exercise_order", "first_appearance"])
-    df["Set Order"] = df.groupby(["Date", "Exercise Name"]).cumcount() + 1
-    df["Weight (kg)"] = df["Weight"].apply(
-        lambda x: str(x) if pd.notna(x) and x != "" else ""
-    )
+    # Apply conversion rules
+    with stage("rules", rows):
+        # Classify rows by conversion rule
+        if rules is None:
+            rules = load_conversion_rules()
+        matched = _match_rules(exercise_codes, exercises, hevy_names, rules, df.index)
+        reps_divisor = matched["reps_divisor"]
+        time_to_reps = reps_divisor > 0
+        time_to_distance = matched["seconds_to_distance"]
+        reps_to_time = matched["reps_to_seconds"]
+        # Parse the Time column once; every rule below reuses it
+        seconds = parse_time_series(df["Time"])
+        has_time = seconds > 0
+
+        # Convert weight
+        df["Weight (kg)"] = _nullable(df["Weight"].where(_is_present(df["Weight"])))
+
+        # Convert reps
+        has_reps = _is_present(df["Reps"])
+        reps = _missing_series(df.index)
+        reps[has_reps] = df.loc[has_reps, "Reps"].astype("int64")
+        reps_from_time = time_to_reps & ~has_reps & has_time
+        reps[reps_from_time] = (
+            seconds[reps_from_time] // reps_divisor[reps_from_time]
+        ).clip(lower=1)
+        has_reps |= reps_from_time
 
-    # Convert reps
-    def convert_reps(row):
-        if pd.notna(row["Reps"]) and row["Reps"] != "":
-            return int(row["Reps"])
-        if row["Exercise Name"] in TIME_TO_REPS_EXERCISES:
-            secs = parse_time_to_seconds(row.get("Time", ""))
-            if secs > 0:
-                return max(1, secs // 10)
-        return ""
-
-    df["Reps"] = df.apply(convert_reps, axis=1).astype(object)
-
-    # Convert distance
-    def convert_distance(row):
-        if (
-            "Distance" in row
-            and pd.notna(row["Distance"])
-            and row["Distance"] != ""
-            and row["Distance"] != 0
-        ):
-            return str(int(row["Distance"]))
-        if row["Exercise Name"] in TIME_TO_DISTANCE_EXERCISES:
-            secs = parse_time_to_seconds(row.get("Time", ""))
-            if secs > 0:
-                return str(secs)
-        return ""
-
-    df["Distance (meters)"] = df.apply(convert_distance, axis=1)
-
-    # Convert seconds
-    def convert_seconds(row):
-        if row["Exercise Name"] in REPS_TO_TIME_EXERCISES:
-            if pd.notna(row["Reps"]) and row["Reps"] != "":
-                return str(float(row["Reps"]))
-
-        if (
-            row["Exercise Name"] in TIME_TO_REPS_EXERCISES
-            and pd.notna(row["Reps"])
-            and row["Reps"] != ""
-        ):
-            return ""
-        if (
-            row["Exercise Name"] in TIME_TO_DISTANCE_EXERCISES
-            and pd.notna(row["Distance (meters)"])
-            and row["Distance (meters)"] != ""
-        ):
-            return ""
-
-        secs = parse_time_to_seconds(row.get("Time", ""))
-        return str(float(secs)) if secs > 0 else ""
-
-    df["Seconds"] = df.apply(convert_seconds, axis=1)
-    # Convert Reps to empty string for time-based exercises
-    mask = df["Exercise Name"].isin(REPS_TO_TIME_EXERCISES)
-    df.loc[mask, "Reps"] = ""
-
-    df["Notes"] = df["Comment"].fillna("") if "Comment" in df.columns else ""
+        # Convert distance
+        has_distance = _is_present(df["Distance"]) & (df["Distance"] != 0)
+        distance = _missing_series(df.index)
+        distance[has_distance] = df.loc[has_distance, "Distance"].astype("int64")
+        distance_from_time = time_to_distance & ~has_distance & has_time
+        distance[distance_from_time] = seconds[distance_from_time]
+        has_distance |= distance_from_time
+
+        # Convert seconds, from the lowest to the highest priority rule
+        duration = seconds.astype("Int64").where(has_time)
+        duration[(time_to_reps & has_reps) | (time_to_distance & has_distance)] = pd.NA
+        seconds_from_reps = reps_to_time & has_reps
+        duration[seconds_from_reps] = reps[seconds_from_reps]
+        df["Seconds"] = duration
+        # Clear Reps for time-based exercises
+        reps[reps_to_time] = pd.NA
+        df["Reps"] = reps
+        df["Distance (meters)"] = distance
 
     # Add conversion notes
-    def add_conversion_note(row):
-        note = str(row["Notes"]) if row["Notes"] else ""
-        if row["Exercise"] != row["Exercise Name"]:
-            if (
-                "backward" in row["Exercise"].lower()
-                and "walk" in row["Exercise"].lower()
-            ) or row["Exercise Name"] in ["Warm Up", "Stretching"]:
-                return f"{row['Exercise']}; {note}" if note else row["Exercise"]
-        return note
-
-    df["Notes"] = df.apply(add_conversion_note, axis=1)
+    with stage("notes", rows):
+        notes = (
+            df["Comment"].fillna("").astype(object)
+            if "Comment" in df.columns
+            else _blank_series(df.index)
+        )
+        notes = notes.where(notes.astype(bool), "").astype(str)
+        prefixed = matched["prefix_note"]
+        if prefixed.any():
+            exercise = df.loc[prefixed, "Exercise"].astype(object)
+            comment = notes[prefixed]
+            notes = notes.astype(object)
+            notes[prefixed] = exercise.where(comment == "", exercise + "; " + comment)
+        df["Notes"] = notes
     df["Workout Notes"] = workout_notes
-    df["RPE"] = ""
-
-    # Return formatted columns
-    columns = [
-        "Workout #",
-        "Date",
-        "Workout Name",
-        "Duration (sec)",
-        "Exercise Name",
-        "Set Order",
-        "Weight (kg)",
-        "Reps",
-        "RPE",
-        "Distance (meters)",
-        "Seconds",
-        "Notes",
-        "Workout Notes",
-    ]
-    return df[columns]
+    df["RPE"] = pd.Series(pd.NA, index=df.index, dtype="Float64")
+
+    if summary is not None:
+        with stage("summary", rows):
+            summary.add(
+                sets=rows,
+                workouts=len(dates),
+                first_date=str(dates[timestamps.argmin()]) if len(dates) else None,
+                last_date=str(dates[timestamps.argmax()]) if len(dates) else None,
+                **_exercise_statistics(
+                    exercise_codes,
+                    exercises,
+                    name_codes,
+                    names,
+                    mappings,
+                    df["Weight (kg)"] * df["Reps"],
+                ),
+                rule_conversions={
+                    "time_to_reps": int(reps_from_time.sum()),
+                    "time_to_distance": int(distance_from_time.sum()),
+                    "reps_to_time": int(seconds_from_reps.sum()),
+                },
+            )
+
+    # Return typed or formatted columns
+    with stage("output", rows):
+        hevy_df = df[HEVY_COLUMNS]
+        return hevy_df if typed else format_hevy_dataframe(hevy_df)
+
+
+def _exercise_statistics(
+    exercise_codes, exercises, name_codes, names, mappings, volume
+):
+    """Count sets and sum volume per exercise with one bincount each.
+
+    Args:
+        exercise_codes: FitNotes exercise code per set, -1 where missing
+        exercises: Distinct FitNotes names
+        name_codes: Hevy name code per set, -1 where missing
+        names: Distinct Hevy names
+        mappings: Exercise name mappings dict
+        volume: Weight x reps per set, missing where either is
+
+    Returns:
+        dict: exercise_sets, exercise_volume and unmapped keyword arguments
+        for ConversionSummary.add
+    """
+    named = name_codes >= 0
+    sets = np.bincount(name_codes[named], minlength=len(names))
+    volume = np.bincount(
+        name_codes[named],
+        weights=volume.to_numpy(dtype="float64", na_value=0.0)[named],
+        minlength=len(names),
+    )
+    present = exercise_codes >= 0
+    exercise_sets = np.bincount(exercise_codes[present], minlength=len(exercises))
+    return {
+        "exercise_sets": {
+            name: int(count) for name, count in zip(names, sets) if count
+        },
+        "exercise_volume": {
+            name: float(total)
+            for name, total, count in zip(names, volume, sets)
+            if count
+        },
+        "unmapped": {
+            exercise: int(count)
+            for exercise, count in zip(exercises, exercise_sets)
+            if count and exercise not in mappings
+        },
+    }
+
+
+def _format_present(values, convert):
+    """Format each distinct value of a typed column once, blanks as ``""``."""
+    codes, uniques = pd.factorize(values)
+    text = convert(pd.Series(uniques)).to_numpy(dtype=object)
+    # Missing values have code -1, which picks up the trailing blank
+    return np.append(text, "").take(codes)
+
+
+def _format_count(values, as_float):
+    """Format a numbering column as integers, or floats if any are missing."""
+    if as_float:
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return values.to_numpy(dtype="int64")
+
+
+def _format_timestamps(values):
+    """Format each distinct timestamp once, leaving missing ones as NaN."""
+    codes, uniques = pd.factorize(values)
+    text = uniques.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    return _broadcast(text, codes)
+
+
+def _format_hevy_columns(df, float_counts):
+    columns = {column: df[column] for column in HEVY_COLUMNS}
+    for column in COUNT_COLUMNS:
+        columns[column] = _format_count(df[column], float_counts[column])
+    columns["Date"] = _format_timestamps(df["Date"])
+    columns["Weight (kg)"] = _format_present(
+        df["Weight (kg)"], lambda v: v.astype(object).astype(str)
+    )
+    columns["Reps"] = _format_present(df["Reps"], lambda v: v.astype(object))
+    columns["RPE"] = _format_present(df["RPE"], lambda v: v.astype(object))
+    columns["Distance (meters)"] = _format_present(
+        df["Distance (meters)"], lambda v: v.astype(object).astype(str)
+    )
+    columns["Seconds"] = _format_present(
+        df["Seconds"], lambda v: v.astype("float64").astype(str)
+    )
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _float_counts(df):
+    return {column: df[column].hasnans for column in COUNT_COLUMNS}
+
+
+def _write_rows(formatted, f, header):
+    formatted.to_csv(
+        f, index=False, header=header, sep=";", quoting=1, encoding="utf-8"
+    )
+
+
+def _row_bytes(formatted):
+    """Return the encoded size of each row of a formatted Hevy frame."""
+    # Every field is quoted, with quotes inside it doubled, and fields are
+    # separated by ";" on lines ending with os.linesep
+    columns = len(formatted.columns)
+    sizes = np.full(len(formatted), 3 * columns - 1 + len(os.linesep))
+    for column in formatted.columns:
+        # Size each distinct value once; missing values are written empty
+        codes, uniques = pd.factorize(formatted[column])
+        lengths = [
+            len(text.encode("utf-8")) + text.count('"') for text in map(str, uniques)
+        ]
+        sizes += np.append(np.array(lengths, dtype=int), 0).take(codes)
+    return sizes
+
+
+def format_hevy_dataframe(df):
+    """Format a typed Hevy DataFrame as the text written to the Hevy CSV.
+
+    Every column is formatted in one vectorized pass: timestamps become
+    ``YYYY-MM-DD HH:MM:SS``, Seconds are written as floats, and missing
+    weights, reps, distances and seconds become empty strings.
+
+    Args:
+        df: Hevy DataFrame from ``convert_fitnotes_to_hevy(..., typed=True)``
+
+    Returns:
+        DataFrame with the Hevy CSV values
+    """
+    return _format_hevy_columns(df, _float_counts(df))
+
+
+@contextmanager
+def open_hevy_csv(path_or_buf, compression=None, name=None):
+    """Open a binary handle to write a Hevy CSV to, optionally compressed.
+
+    Args:
+        path_or_buf: Output path or binary file object
+        compression: None, "gzip" or "zip"
+        name: Name of the CSV inside a zip archive (default: the output
+            filename with a .csv extension, or hevy.csv for file objects)
+
+    Yields:
+        Binary file object; closing the context finishes the compression
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    if compression is not None and compression not in CSV_COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression '{compression}'. "
+            f"Use {' or '.join(CSV_COMPRESSIONS)}."
+        )
+    with ExitStack() as stack:
+        if isinstance(path_or_buf, (str, os.PathLike)):
+            if name is None:
+                stem = os.path.splitext(os.path.basename(path_or_buf))[0]
+                name = stem if stem.lower().endswith(".csv") else f"{stem}.csv"
+            f = stack.enter_context(open(path_or_buf, "wb"))
+        else:
+            f = path_or_buf
+        if compression == "gzip":
+            f = stack.enter_context(
+                gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6)
+            )
+        elif compression == "zip":
+            archive = stack.enter_context(
+                zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED)
+            )
+            f = stack.enter_context(
+                archive.open(name or "hevy.csv", "w", force_zip64=True)
+            )
+        yield f
+
+
+def write_hevy_csv(
+    df, path_or_buf=None, header=True, compression=None, chunk_rows=CSV_CHUNK_ROWS
+):
+    """Format a typed Hevy DataFrame and write it as a Hevy CSV.
+
+    Rows are formatted and encoded chunk_rows at a time straight into the
+    output, so only one chunk of formatted text is held in memory rather than
+    the whole file.
+
+    Args:
+        df: Hevy DataFrame from ``convert_fitnotes_to_hevy(..., typed=True)``
+        path_or_buf: Output path or file object, or None to return the text
+        header: Whether to write the column names
+        compression: None, "gzip" or "zip"; requires a path or binary file
+        chunk_rows: Number of rows formatted at a time
+
+    Returns:
+        The CSV text if path_or_buf is None, otherwise None
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    if path_or_buf is None:
+        return hevy_csv_bytes(df, header=header, chunk_rows=chunk_rows).decode("utf-8")
+
+    # Numbering columns are written as floats when a value is missing
+    # anywhere in the frame, not just in the chunk containing it
+    float_counts = _float_counts(df)
+    with open_hevy_csv(path_or_buf, compression) as f:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start : start + chunk_rows]
+            _write_rows(
+                _format_hevy_columns(chunk, float_counts), f, header and start == 0
+            )
+
+
+def hevy_csv_bytes(
+    df,
+    header=True,
+    compression=None,
+    name=None,
+    max_workouts=None,
+    max_bytes=None,
+    chunk_rows=CSV_CHUNK_ROWS,
+):
+    """Write a typed Hevy DataFrame as Hevy CSV bytes, e.g. for a download.
+
+    The chunks are encoded into a single bytes buffer, so the result is the
+    only full copy of the file.
+
+    Args:
+        df: Hevy DataFrame from ``convert_fitnotes_to_hevy(..., typed=True)``
+        header: Whether to write the column names
+        compression: None, "gzip" or "zip"
+        name: Name of the CSV inside a zip archive (default: hevy.csv)
+        max_workouts: Split the output into CSVs of at most this many workouts
+        max_bytes: Split the output into CSVs of at most this many bytes
+        chunk_rows: Number of rows formatted at a time
+
+    Returns:
+        bytes: The UTF-8 encoded, optionally compressed, CSV, or a zip archive
+        of the split CSVs if max_workouts or max_bytes is set
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    buffer = io.BytesIO()
+    if max_workouts is not None or max_bytes is not None:
+        with open_hevy_csv_shards(buffer, "zip", name) as open_shard:
+            with HevyShardWriter(
+                open_shard, max_workouts, max_bytes, chunk_rows
+            ) as writer:
+                writer.write(df)
+        return buffer.getvalue()
+
+    with open_hevy_csv(buffer, compression, name) as f:
+        write_hevy_csv(df, f, header=header, chunk_rows=chunk_rows)
+    return buffer.getvalue()
+
+
+def shard_name(name, number):
+    """Number a CSV filename for one of several output files.
+
+    Args:
+        name: Filename, e.g. "hevy.csv" or "hevy.csv.gz"
+        number: 1-based shard number
+
+    Returns:
+        str: Numbered filename, e.g. "hevy_002.csv" or "hevy_002.csv.gz"
+    """
+    stem, extension = os.path.splitext(name)
+    if extension.lower() != ".csv":
+        stem, csv_extension = os.path.splitext(stem)
+        if csv_extension.lower() == ".csv":
+            extension = csv_extension + extension
+        else:
+            stem = f"{stem}{csv_extension}"
+    return f"{stem}_{number:03d}{extension}"
+
+
+@contextmanager
+def open_hevy_csv_shards(path_or_buf, compression=None, name=None):
+    """Open a destination for several Hevy CSVs, for HevyShardWriter.
+
+    With zip compression every shard is a member of one archive; otherwise
+    each shard is its own file next to path_or_buf, numbered with
+    shard_name.
+
+    Args:
+        path_or_buf: Output path, or binary file object for a zip archive
+        compression: None, "gzip" or "zip"
+        name: Shard name to number inside a zip archive (default: the
+            output filename with a .csv extension, or hevy.csv for file
+            objects)
+
+    Yields:
+        Callable taking a shard number and returning a context manager that
+        yields a binary file object for that shard
+
+    Raises:
+        ValueError: If the compression is not supported, or shards of a file
+            object are not zipped
+    """
+    if compression == "zip":
+        if name is None:
+            name = "hevy.csv"
+            if isinstance(path_or_buf, (str, os.PathLike)):
+                stem = os.path.splitext(os.path.basename(path_or_buf))[0]
+                name = stem if stem.lower().endswith(".csv") else f"{stem}.csv"
+        with ExitStack() as stack:
+            if isinstance(path_or_buf, (str, os.PathLike)):
+                path_or_buf = stack.enter_context(open(path_or_buf, "wb"))
+            archive = stack.enter_context(
+                zipfile.ZipFile(path_or_buf, "w", compression=zipfile.ZIP_DEFLATED)
+            )
+            yield lambda number: archive.open(
+                shard_name(name, number), "w", force_zip64=True
+            )
+        return
+
+    if not isinstance(path_or_buf, (str, os.PathLike)):
+        raise ValueError("Split output written to a file object must be zipped")
+    if compression is not None and compression not in CSV_COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression '{compression}'. "
+            f"Use {' or '.join(CSV_COMPRESSIONS)}."
+        )
+    directory, filename = os.path.split(os.fspath(path_or_buf))
+    yield lambda number: open_hevy_csv(
+        os.path.join(directory, shard_name(filename, number)), compression
+    )
+
+
+class HevyShardWriter:
+    """Writes typed Hevy frames across several CSVs, split between workouts.
+
+    A new CSV is started when the current one would exceed max_workouts or
+    max_bytes, and a workout is never split across CSVs. Workout boundaries
+    are found once from the Workout # column; each chunk of whole workouts
+    is then formatted once, its row sizes decide where the next CSV starts,
+    and the same text is written, so memory stays bounded by the chunk size
+    however many CSVs are written. Frames passed to successive write calls
+    continue the same output, as with convert_fitnotes_chunks.
+    """
+
+    def __init__(
+        self, open_shard, max_workouts=None, max_bytes=None, chunk_rows=CSV_CHUNK_ROWS
+    ):
+        """Prepare the writer; the first CSV is opened by the first write.
+
+        Args:
+            open_shard: Callable taking a 1-based shard number and returning a
+                context manager that yields a binary file object, e.g. from
+                open_hevy_csv_shards
+            max_workouts: Most workouts per CSV, or None for no limit
+            max_bytes: Most bytes per CSV, header included, or None for no
+                limit; a workout larger than this gets a CSV of its own
+            chunk_rows: Number of rows formatted at a time
+        """
+        self.open_shard = open_shard
+        self.max_workouts = max_workouts
+        self.max_bytes = max_bytes
+        self.chunk_rows = chunk_rows
+        self.shards = 0
+        self._header = (
+            pd.DataFrame(columns=HEVY_COLUMNS)
+            .to_csv(index=False, sep=";", quoting=1)
+            .encode("utf-8")
+        )
+        self._shard = ExitStack()
+        self._file = None
+        self._workouts = 0
+        self._bytes = 0
+        self._last_workout = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _next_shard(self):
+        self._shard.close()
+        self.shards += 1
+        self._file = self._shard.enter_context(self.open_shard(self.shards))
+        self._file.write(self._header)
+
+    def _over_limit(self, workout_bytes):
+        return (
+            self.max_workouts is not None and self._workouts >= self.max_workouts
+        ) or (
+            self.max_bytes is not None and self._bytes + workout_bytes > self.max_bytes
+        )
+
+    def write(self, df):
+        """Write the rows of a typed Hevy DataFrame, ordered by workout.
+
+        Args:
+            df: Hevy DataFrame from ``convert_fitnotes_to_hevy(..., typed=True)``
+        """
+        rows = len(df)
+        if rows == 0:
+            return
+        float_counts = _float_counts(df)
+
+        # Mark the first row of every workout, including a workout continued
+        # from the previous write
+        workout = df["Workout #"].to_numpy(dtype="float64", na_value=np.nan)
+        previous = np.empty(rows)
+        previous[0] = np.inf if self._last_workout is None else self._last_workout
+        previous[1:] = workout[:-1]
+        starts_workout = ~(
+            (workout == previous) | (np.isnan(workout) & np.isnan(previous))
+        )
+        self._last_workout = workout[-1]
+        starts = np.flatnonzero(starts_workout)
+
+        start = 0
+        while start < rows:
+            # Extend the chunk to the next workout boundary
+            next_start = np.searchsorted(starts, start + self.chunk_rows)
+            end = starts[next_start] if next_start < len(starts) else rows
+            formatted = _format_hevy_columns(df.iloc[start:end], float_counts)
+
+            # One segment per workout, the first possibly continuing one
+            first, last = np.searchsorted(starts, [start, end])
+            segments = np.union1d([0], starts[first:last] - start)
+            if self.max_bytes is not None:
+                segment_bytes = np.add.reduceat(_row_bytes(formatted), segments)
+            else:
+                segment_bytes = np.zeros(len(segments), dtype="int64")
+
+            cuts = []
+            if self._file is None:
+                cuts.append(0)
+                self._workouts, self._bytes = 0, len(self._header)
+            for position, size in zip(segments, segment_bytes):
+                is_start = starts_workout[start + position]
+                if is_start and self._workouts and self._over_limit(size):
+                    cuts.append(position)
+                    self._workouts, self._bytes = 0, len(self._header)
+                self._workouts += int(is_start)
+                self._bytes += int(size)
+
+            bounds = np.union1d([0, end - start], np.array(cuts, dtype=int))
+            for piece_start, piece_end in zip(bounds[:-1], bounds[1:]):
+                if piece_start in cuts:
+                    self._next_shard()
+                _write_rows(
+                    formatted.iloc[piece_start:piece_end], self._file, header=False
+                )
+            start = end
+
+    def close(self):
+        """Finish the last CSV, writing a header-only one if nothing was written."""
+        if self.shards == 0:
+            self._next_shard()
+        self._shard.close()
+
+
+def convert_fitnotes_chunks(
+    chunks,
+    mappings,
+    timezone_offset=TIMEZONE_OFFSET_HOURS,
+    workout_time=DEFAULT_TRAINING_TIME,
+    workout_name=DEFAULT_WORKOUT_NAME,
+    workout_duration=DEFAULT_DURATION,
+    workout_notes=DEFAULT_WORKOUT_NOTES,
+    timezone=None,
+    rules=None,
+    typed=False,
+    profiler=None,
+    summary=None,
+):
+    """Convert FitNotes DataFrame chunks to Hevy format incrementally.
+
+    Rows for the latest date of each chunk are held back and prepended to the
+    next chunk, so every workout is converted whole and workout numbers
+    continue across chunks. The concatenated output matches
+    convert_fitnotes_to_hevy on the full export as long as a date never
+    reappears after a later date and every set has a date and an exercise,
+    which holds for FitNotes exports. Sets missing either would be numbered
+    and placed by the whole export, so they are rejected instead.
+
+    Args:
+        chunks: Iterable of FitNotes DataFrames, e.g. from read_fitnotes_csv
+        mappings: Exercise name mappings dict
+        timezone_offset: Timezone offset in hours
+        workout_time: Default workout time string
+        workout_name: Workout name
+        workout_duration: Workout duration
+        workout_notes: Workout notes
+        timezone: Optional IANA timezone name; overrides timezone_offset with
+            the daylight-saving-aware offset of each workout date
+        rules: ConversionRules to apply (default: load_conversion_rules())
+        typed: Yield typed columns instead of the formatted CSV text
+        profiler: Optional StageProfiler; stages are aggregated across chunks
+        summary: Optional ConversionSummary; counts accumulate across chunks
+
+    Yields:
+        DataFrames in Hevy format, in output order
+
+    Raises:
+        ValueError: If input data is invalid, not ordered by date or has sets
+            without a date or exercise
+    """
+    settings = (
+        timezone_offset,
+        workout_time,
+        workout_name,
+        workout_duration,
+        workout_notes,
+        timezone,
+        load_conversion_rules() if rules is None else rules,
+    )
+    held = None
+    last_date = None
+    workouts = 0
+
+    def convert(part):
+        output_df = convert_fitnotes_to_hevy(
+            part, mappings, *settings, typed=True, profiler=profiler, summary=summary
+        )
+        output_df["Workout #"] += workouts
+        return output_df if typed else format_hevy_dataframe(output_df)
+
+    for chunk in chunks:
+        if held is not None:
+            chunk = pd.concat([held, chunk])
+        validate_fitnotes_dataframe(chunk)
+        if chunk["Date"].hasnans or chunk["Exercise"].hasnans:
+            raise ValueError(
+                "Chunked conversion requires every set to have a date and an "
+                "exercise. Convert the file without a chunk size instead."
+            )
+
+        dates = chunk["Date"]
+        if last_date is not None and (dates <= last_date).any():
+            raise ValueError(
+                "Chunked conversion requires the export to be ordered by date. "
+                "Convert the file without a chunk size instead."
+            )
+        is_held = dates == dates.max()
+        held = chunk[is_held]
+        ready = chunk[~is_held]
+        if not ready.empty:
+            ready_workouts = ready["Date"].nunique()
+            last_date = ready["Date"].max()
+            yield convert(ready)
+            workouts += ready_workouts
+
+    if held is not None and not held.empty:
+        yield convert(held)
@@ -0,0 +1,132 @@
+"""Incremental conversion state for repeated exports of the same history."""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+
+STATE_VERSION = 1
+
+
+def settings_fingerprint(mappings, **settings):
+    """Fingerprint everything besides the input that affects the output.
+
+    Args:
+        mappings: Exercise name mappings dict
+        **settings: Conversion settings, e.g. timezone_offset and workout_time
+
+    Returns:
+        str: Hex digest that changes whenever mappings or settings do
+    """
+    payload = json.dumps(
+        {"version": __version__, "mappings": mappings, "settings": settings},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_workouts(df):
+    """Hash the sets of each workout date in a FitNotes DataFrame.
+
+    Each row is hashed together with its position within its date, and the
+    row hashes are summed per date, so any added, removed, edited or
+    reordered set changes that date's hash.
+
+    Args:
+        df: FitNotes DataFrame
+
+    Returns:
+        dict: Date string to hex hash
+    """
+    codes, dates = pd.factorize(df["Date"])
+    if len(codes) == 0:
+        return {}
+    position = df.groupby(codes).cumcount()
+    row_hashes = pd.util.hash_pandas_object(
+        df.assign(_position=position.to_numpy()), index=False
+    ).to_numpy()
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    # Missing dates (code -1) sort first and are not tracked
+    valid = sorted_codes[starts] >= 0
+    totals = np.add.reduceat(row_hashes[order], starts)
+    return {
+        str(dates[code]): f"{total:016x}"
+        for code, total in zip(sorted_codes[starts][valid], totals[valid])
+    }
+
+
+def load_state(path):
+    """Load incremental conversion state, or an empty state if there is none.
+
+    A state file that cannot be read as state, e.g. one truncated by an
+    interrupted run, is ignored with a warning, so every workout is
+    converted again.
+
+    Args:
+        path: State JSON filepath
+
+    Returns:
+        dict: State with "settings" fingerprint and "workouts" hashes
+    """
+    try:
+        with open(Path(path), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        state = {}
+    except ValueError as e:
+        # Includes JSON and UTF-8 decoding errors
+        print(f"Warning: ignoring unreadable state file {path}: {e}")
+        state = {}
+    if not isinstance(state, dict) or not isinstance(state.get("workouts"), dict):
+        state = {}
+    if state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "settings": None, "workouts": {}}
+    return state
+
+
+def save_state(path, fingerprint, workout_hashes):
+    """Save incremental conversion state.
+
+    Args:
+        path: State JSON filepath
+        fingerprint: Settings fingerprint from settings_fingerprint
+        workout_hashes: Date to hash dict from hash_workouts
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = {
+        "version": STATE_VERSION,
+        "settings": fingerprint,
+        "workouts": workout_hashes,
+    }
+    path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", "utf-8")
+
+
+def select_changed_workouts(df, state, fingerprint):
+    """Keep only the workouts that are new or changed since the saved state.
+
+    All workouts count as changed when the settings fingerprint differs,
+    since every converted row would differ too.
+
+    Args:
+        df: FitNotes DataFrame
+        state: State from load_state
+        fingerprint: Settings fingerprint for this conversion
+
+    Returns:
+        tuple: (DataFrame of new or changed workouts, hashes of all workouts)
+    """
+    workout_hashes = hash_workouts(df)
+    previous = state["workouts"] if state.get("settings") == fingerprint else {}
+    changed = [
+        date for date, digest in workout_hashes.items() if previous.get(date) != digest
+    ]
+    return df[df["Date"].isin(changed)].reset_index(drop=True), workout_hashes
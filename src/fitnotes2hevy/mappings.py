@@ -1,24 +1,31 @@
 """Exercise mapping utilities."""
 
+import hashlib
 import json
+import marshal
+import os
+import sys
+import tempfile
 from pathlib import Path
 
+MAPPING_FILES = ["default.json", "extra.json", "custom.json"]
+CACHE_FILENAME = ".mappings.cache"
 
-def load_exercise_mappings(data_dir="data/mappings"):
-    """Load exercise mappings from JSON files.
+# Bump when the cache layout changes; marshal data is also Python-specific
+_CACHE_FORMAT = (1, marshal.version, sys.version_info[:2])
 
-    Loads in order: default -> extra -> custom (later overrides earlier).
+
+def _parse_mappings(data_path):
+    """Parse and merge the mapping JSON files.
 
     Args:
-        data_dir: Directory containing mapping JSON files
+        data_path: Directory containing mapping JSON files
 
     Returns:
         dict: Combined exercise mappings
     """
     mappings = {}
-    data_path = Path(data_dir)
-
-    for filename in ["default.json", "extra.json", "custom.json"]:
+    for filename in MAPPING_FILES:
         filepath = data_path / filename
         try:
             with open(filepath, "r", encoding="utf-8") as f:
@@ -30,7 +37,110 @@ def load_exercise_mappings(data_dir="data/mappings"):
                     }
                 mappings.update(mapping)
         except FileNotFoundError:
-            if filename != "custom.json":
-                print(f"Warning: {filepath} not found")
+            pass
+    return mappings
+
+
+def _source_stats(data_path):
+    """Return (mtime_ns, size) per mapping file, or None if it is missing."""
+    stats = {}
+    for filename in MAPPING_FILES:
+        try:
+            stat = (data_path / filename).stat()
+            stats[filename] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stats[filename] = None
+    return stats
+
+
+def _source_hashes(data_path):
+    """Return the SHA-256 digest per mapping file, or None if it is missing."""
+    hashes = {}
+    for filename in MAPPING_FILES:
+        try:
+            hashes[filename] = hashlib.sha256(
+                (data_path / filename).read_bytes()
+            ).hexdigest()
+        except FileNotFoundError:
+            hashes[filename] = None
+    return hashes
+
+
+def _read_cache(cache_path):
+    """Read the compiled mapping cache, or return None if it is unusable."""
+    try:
+        with open(cache_path, "rb") as f:
+            # The cache is only ever written by _write_cache below
+            cache = marshal.loads(f.read())  # nosec B302
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cache, dict) or cache.get("format") != _CACHE_FORMAT:
+        return None
+    return cache
+
+
+def _write_cache(cache_path, cache):
+    """Atomically write the compiled mapping cache, ignoring I/O errors."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(marshal.dumps(cache))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def load_exercise_mappings(data_dir="data/mappings", use_cache=True, refresh=False):
+    """Load exercise mappings from JSON files.
+
+    Loads in order: default -> extra -> custom (later overrides earlier).
+
+    The merged result is compiled into a cache file in ``data_dir`` and
+    reused while the JSON files are unchanged, so repeated loads cost a
+    single read. The cache is validated by file modification times and
+    sizes, falling back to content hashes when those differ, and is rebuilt
+    whenever a source file changes.
+
+    Args:
+        data_dir: Directory containing mapping JSON files
+        use_cache: Whether to read and write the compiled cache
+        refresh: Rebuild the cache even if it is up to date
+
+    Returns:
+        dict: Combined exercise mappings
+    """
+    data_path = Path(data_dir)
+    stats = _source_stats(data_path)
+    for filename in ["default.json", "extra.json"]:
+        if stats[filename] is None:
+            print(f"Warning: {data_path / filename} not found")
+
+    if not use_cache:
+        return _parse_mappings(data_path)
+
+    cache_path = data_path / CACHE_FILENAME
+    cache = None if refresh else _read_cache(cache_path)
+    if cache is not None and cache["stats"] == stats:
+        return cache["mappings"]
+
+    hashes = _source_hashes(data_path)
+    if cache is not None and cache["hashes"] == hashes:
+        mappings = cache["mappings"]
+    else:
+        mappings = _parse_mappings(data_path)
 
+    _write_cache(
+        cache_path,
+        {
+            "format": _CACHE_FORMAT,
+            "stats": stats,
+            "hashes": hashes,
+            "mappings": mappings,
+        },
+    )
     return mappings
@@ -0,0 +1,146 @@
+"""Merge overlapping FitNotes exports into one set of unique sets."""
+
+import numpy as np
+import pandas as pd
+
+from .converter import (
+    apply_fitnotes_dtypes,
+    parse_time_series,
+    read_fitnotes_csv,
+    validate_fitnotes_dataframe,
+)
+
+# Numeric columns compared after rounding, so the same value written slightly
+# differently by two exports still matches
+NUMERIC_KEY_COLUMNS = ["Weight", "Reps", "Distance"]
+NUMERIC_KEY_DECIMALS = 3
+
+
+def _normalized_text(values, casefold=False):
+    """Strip (and optionally case-fold) each distinct text value once.
+
+    Missing values become empty strings.
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype("string").str.strip()
+    if casefold:
+        text = text.str.casefold()
+    # Missing values have code -1, which picks up the trailing empty string
+    normalized = np.append(text.to_numpy(dtype=object), "")
+    return pd.Series(normalized.take(codes), index=values.index, dtype=object)
+
+
+def set_keys(df):
+    """Hash each set of a FitNotes export on its normalized values.
+
+    A set is identified by its date, exercise, weight, reps, distance, time
+    and comment, plus its position among the sets of that exercise on that
+    date, so repeated identical sets within a workout stay distinct. Text is
+    stripped (and the exercise case-folded), blank numbers count as 0 and
+    times are compared in seconds, so "1:30" and "0:01:30" match.
+
+    Positions count from the first set of each exercise on a date in df, so
+    an export that starts partway through a day is not aligned with one that
+    holds the whole day.
+
+    Args:
+        df: FitNotes DataFrame, e.g. from read_fitnotes_csv
+
+    Returns:
+        uint64 array with one 64-bit hash per set
+    """
+    date = _normalized_text(df["Date"])
+    exercise = _normalized_text(df["Exercise"], casefold=True)
+    # Comment is optional in FitNotes exports
+    if "Comment" in df.columns:
+        comment = _normalized_text(df["Comment"])
+    else:
+        comment = pd.Series("", index=df.index, dtype=object)
+    keys = pd.DataFrame(
+        {
+            "Date": date,
+            "Exercise": exercise,
+            **{
+                column: df[column].fillna(0).round(NUMERIC_KEY_DECIMALS)
+                for column in NUMERIC_KEY_COLUMNS
+            },
+            "Time": parse_time_series(df["Time"]),
+            "Comment": comment,
+            "Position": exercise.groupby([date, exercise], sort=False).cumcount(),
+        }
+    )
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def iter_unique_sets(input_files, seen=None):
+    """Read FitNotes exports one at a time and yield only their unseen sets.
+
+    Every set's hash is kept in a hash index (a set of ints), so each file
+    is checked against all earlier ones in time linear in its size, and only
+    the file being read and the unique sets yielded so far are ever held in
+    memory.
+
+    Args:
+        input_files: FitNotes CSV filepaths, earlier files taking precedence
+        seen: Optional set of hashes from set_keys to treat as already seen;
+            it is updated in place
+
+    Yields:
+        (input_file, DataFrame of unseen sets, number of duplicate sets)
+
+    Raises:
+        ValueError: If a file cannot be parsed or is not a valid FitNotes export
+        OSError: If a file cannot be read
+    """
+    if seen is None:
+        seen = set()
+    for input_file in input_files:
+        try:
+            df = read_fitnotes_csv(input_file)
+            validate_fitnotes_dataframe(df)
+        except ValueError as e:
+            raise ValueError(f"{input_file}: {e}") from None
+        hashes = set_keys(df).tolist()
+        unseen = np.fromiter(
+            (value not in seen for value in hashes), dtype=bool, count=len(hashes)
+        )
+        seen.update(hashes)
+        yield input_file, df[unseen], len(df) - int(unseen.sum())
+
+
+def merge_fitnotes_exports(input_files):
+    """Merge FitNotes exports whose date ranges overlap, dropping duplicates.
+
+    Sets that appear in more than one export are kept once, from the first
+    export that has them. The merged sets are ordered by date, so they can
+    be converted in one go or in chunks.
+
+    Args:
+        input_files: FitNotes CSV filepaths, earlier files taking precedence
+
+    Returns:
+        tuple: (merged DataFrame with the columns and types read_fitnotes_csv
+        produces, list of per-file dicts with input, sets and duplicates)
+
+    Raises:
+        ValueError: If no files are given, or one cannot be parsed or is not a
+            valid FitNotes export
+        OSError: If a file cannot be read
+    """
+    parts = []
+    entries = []
+    for input_file, df, duplicates in iter_unique_sets(input_files):
+        parts.append(df)
+        entries.append(
+            {
+                "input": str(input_file),
+                "sets": len(df) + duplicates,
+                "duplicates": duplicates,
+            }
+        )
+    if not parts:
+        raise ValueError("No FitNotes exports to merge")
+
+    # Categories differ between files, so they are rebuilt after concatenating
+    merged = apply_fitnotes_dtypes(pd.concat(parts, ignore_index=True))
+    return merged.sort_values("Date", kind="stable", ignore_index=True), entries
@@ -0,0 +1,155 @@
+"""Per-stage timing and memory profiling for conversions."""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+
+
+class StageRun:
+    """Handle for an in-progress stage, whose row count may be set late."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows=0):
+        self.rows = rows
+
+
+_NO_STAGE = nullcontext(StageRun())
+
+
+@dataclass
+class StageStats:
+    """Aggregated measurements for one named stage."""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    memory_delta_bytes: int = 0
+    peak_memory_bytes: int = 0
+
+
+class StageProfiler:
+    """Record wall time, rows processed and memory per conversion stage.
+
+    Pass an instance as ``profiler`` to the conversion functions, or wrap
+    your own stages with :meth:`stage`. Repeated stages, such as those of a
+    chunked conversion, are aggregated under the same name.
+
+    Memory is only measured when asked for, with tracemalloc, which the
+    profiler starts on first use and stops in :meth:`close` if it was not
+    already running. Tracing slows down every allocation, so the stage times
+    of a memory profile are inflated and should not be compared with plain
+    timings.
+    """
+
+    def __init__(self, trace_memory=False):
+        """Create a profiler.
+
+        Args:
+            trace_memory: Whether to also record memory deltas and peaks
+        """
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self._owns_tracing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop memory tracing if this profiler started it."""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name, rows=0):
+        """Measure the enclosed block as the named stage.
+
+        Args:
+            name: Stage name
+            rows: Number of rows the stage processes
+
+        Yields:
+            StageRun: Set its ``rows`` when the count is only known afterwards
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        if self.trace_memory:
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        run = StageRun(rows)
+        start = time.perf_counter()
+        try:
+            yield run
+        finally:
+            seconds = time.perf_counter() - start
+            stats = self.stages.setdefault(name, StageStats(name))
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += run.rows
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.memory_delta_bytes += current - memory_before
+                stats.peak_memory_bytes = max(
+                    stats.peak_memory_bytes, peak - memory_before
+                )
+
+    def records(self):
+        """Return the stage measurements as a list of dicts, in stage order.
+
+        Memory fields are left out unless memory was traced.
+        """
+        records = [asdict(stats) for stats in self.stages.values()]
+        if not self.trace_memory:
+            for record in records:
+                del record["memory_delta_bytes"], record["peak_memory_bytes"]
+        return records
+
+    def to_json(self):
+        """Return the stage measurements as a JSON string."""
+        total = sum(stats.seconds for stats in self.stages.values())
+        return json.dumps({"total_seconds": total, "stages": self.records()}, indent=2)
+
+    def report(self):
+        """Return the stage measurements as a printable table."""
+        header = f"{'Stage':<16}{'Calls':>7}{'Rows':>12}{'Time (s)':>11}"
+        if self.trace_memory:
+            header += f"{'Mem +/- (MB)':>14}{'Peak (MB)':>11}"
+        lines = [header]
+        for stats in self.stages.values():
+            line = (
+                f"{stats.name:<16}{stats.calls:>7}{stats.rows:>12}"
+                f"{stats.seconds:>11.4f}"
+            )
+            if self.trace_memory:
+                line += (
+                    f"{stats.memory_delta_bytes / 2**20:>14.2f}"
+                    f"{stats.peak_memory_bytes / 2**20:>11.2f}"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def stage_hook(profiler):
+    """Return the ``stage`` context manager factory for an optional profiler.
+
+    When profiling is disabled this hands back a shared no-op context, so
+    instrumented code pays only a function call per stage.
+
+    Args:
+        profiler: StageProfiler, or None to disable profiling
+
+    Returns:
+        Callable taking a stage name and row count
+    """
+    if profiler is None:
+        return lambda name, rows=0: _NO_STAGE
+    return profiler.stage
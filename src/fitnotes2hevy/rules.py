@@ -0,0 +1,229 @@
+"""Declarative exercise conversion rules loaded from JSON."""
+
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+RULE_FILES = ["rules.json", "custom_rules.json"]
+TRANSFORMS = ["seconds_to_reps", "seconds_to_distance", "reps_to_seconds"]
+NOTES = ["prefix_fitnotes_name"]
+MATCH_KEYS = ["hevy", "fitnotes", "hevy_contains", "fitnotes_contains"]
+DEFAULT_REPS_DIVISOR = 10
+
+# data/mappings of the repository, so the rules found do not depend on the
+# working directory
+DEFAULT_RULES_DIR = Path(__file__).resolve().parents[2] / "data" / "mappings"
+
+
+class RuleMatch(NamedTuple):
+    """What the conversion rules do to one exercise.
+
+    Attributes:
+        reps_divisor: Seconds per rep for seconds_to_reps, or 0 if it does not
+            apply
+        seconds_to_distance: Whether time becomes distance
+        reps_to_seconds: Whether reps become time
+        prefix_note: Whether the FitNotes name is added to the set notes
+    """
+
+    reps_divisor: int = 0
+    seconds_to_distance: bool = False
+    reps_to_seconds: bool = False
+    prefix_note: bool = False
+
+
+NO_MATCH = RuleMatch()
+
+
+class _Rule(NamedTuple):
+    hevy: frozenset
+    fitnotes: frozenset
+    hevy_contains: tuple
+    fitnotes_contains: tuple
+    transform: str
+    divisor: int
+    note: str
+
+
+def _contains_all(name, words):
+    lowered = name.lower()
+    return all(word in lowered for word in words)
+
+
+def _compile_rule(definition, position):
+    """Validate a rule definition and compile its match into sets."""
+
+    def invalid(reason):
+        return ValueError(f"Invalid conversion rule {position + 1}: {reason}")
+
+    if not isinstance(definition, dict):
+        raise invalid("expected an object")
+    match = definition.get("match")
+    if not isinstance(match, dict) or not match:
+        raise invalid('"match" must be an object with at least one condition')
+    unknown = sorted(set(match) - set(MATCH_KEYS))
+    if unknown:
+        raise invalid(f"unknown match condition {', '.join(unknown)}")
+    for key, names in match.items():
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            raise invalid(f'"{key}" must be a list of names')
+
+    transform = definition.get("transform")
+    note = definition.get("note")
+    if transform is None and note is None:
+        raise invalid('expected a "transform" and/or a "note"')
+    if transform is not None and transform not in TRANSFORMS:
+        raise invalid(f"unknown transform {transform!r}")
+    if note is not None and note not in NOTES:
+        raise invalid(f"unknown note {note!r}")
+    divisor = definition.get("divisor", DEFAULT_REPS_DIVISOR)
+    if not isinstance(divisor, int) or isinstance(divisor, bool) or divisor < 1:
+        raise invalid('"divisor" must be a positive whole number of seconds')
+
+    return _Rule(
+        hevy=frozenset(match["hevy"]) if "hevy" in match else None,
+        fitnotes=frozenset(match["fitnotes"]) if "fitnotes" in match else None,
+        hevy_contains=(
+            tuple(word.lower() for word in match["hevy_contains"])
+            if "hevy_contains" in match
+            else None
+        ),
+        fitnotes_contains=(
+            tuple(word.lower() for word in match["fitnotes_contains"])
+            if "fitnotes_contains" in match
+            else None
+        ),
+        transform=transform,
+        divisor=divisor,
+        note=note,
+    )
+
+
+class ConversionRules:
+    """Compiled exercise conversion rules.
+
+    Rules are evaluated once per distinct (FitNotes name, Hevy name) pair and
+    the result is memoized, so the engines only ever look up a handful of
+    exercises no matter how many sets an export has.
+    """
+
+    def __init__(self, definitions):
+        """Compile rule definitions.
+
+        Args:
+            definitions: List of rule dicts in the rules.json format
+
+        Raises:
+            ValueError: If a rule is malformed
+        """
+        self.definitions = list(definitions)
+        self._rules = [
+            _compile_rule(definition, position)
+            for position, definition in enumerate(self.definitions)
+        ]
+        self._matches = {}
+
+    def _matches_rule(self, rule, exercise, name):
+        if rule.hevy is not None and name not in rule.hevy:
+            return False
+        if rule.fitnotes is not None and exercise not in rule.fitnotes:
+            return False
+        if rule.hevy_contains is not None and (
+            name is None or not _contains_all(name, rule.hevy_contains)
+        ):
+            return False
+        if rule.fitnotes_contains is not None and (
+            exercise is None or not _contains_all(exercise, rule.fitnotes_contains)
+        ):
+            return False
+        return True
+
+    def match(self, exercise, name):
+        """Return what the rules do to an exercise.
+
+        Args:
+            exercise: FitNotes exercise name, or None if missing
+            name: Mapped Hevy exercise name, or None if missing
+
+        Returns:
+            RuleMatch combining every matching rule; the first matching
+            seconds_to_reps rule sets the divisor
+        """
+        key = (exercise, name)
+        result = self._matches.get(key)
+        if result is not None:
+            return result
+
+        divisor = 0
+        to_distance = to_seconds = prefix = False
+        for rule in self._rules:
+            if not self._matches_rule(rule, exercise, name):
+                continue
+            if rule.transform == "seconds_to_reps" and not divisor:
+                divisor = rule.divisor
+            elif rule.transform == "seconds_to_distance":
+                to_distance = True
+            elif rule.transform == "reps_to_seconds":
+                to_seconds = True
+            if rule.note == "prefix_fitnotes_name":
+                prefix = True
+        # Notes are only prefixed when the exercise was actually renamed
+        prefix = prefix and exercise is not None and exercise != name
+
+        result = self._matches[key] = RuleMatch(
+            divisor, to_distance, to_seconds, prefix
+        )
+        return result
+
+    def hevy_names(self, transform):
+        """Return the exact Hevy names listed by rules with a transform.
+
+        Args:
+            transform: One of TRANSFORMS
+
+        Returns:
+            list: Hevy names, in rule order
+        """
+        names = []
+        for definition, rule in zip(self.definitions, self._rules):
+            if rule.transform == transform:
+                names.extend(definition["match"].get("hevy", []))
+        return list(dict.fromkeys(names))
+
+
+def load_conversion_rules(data_dir=DEFAULT_RULES_DIR):
+    """Load exercise conversion rules from JSON files.
+
+    Loads rules.json, then appends any rules from custom_rules.json.
+
+    Args:
+        data_dir: Directory containing the rule JSON files (default: the
+            repository's data/mappings, wherever it is run from)
+
+    Returns:
+        ConversionRules
+
+    Raises:
+        FileNotFoundError: If rules.json is missing
+        ValueError: If a rule is malformed
+    """
+    data_path = Path(data_dir)
+    definitions = []
+    for filename in RULE_FILES:
+        filepath = data_path / filename
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                file_definitions = json.load(f).get("rules", [])
+        except FileNotFoundError:
+            if filename == "rules.json":
+                # Converting without the rules would silently change the output
+                raise FileNotFoundError(
+                    f"{filepath} not found; it defines the exercise conversion " "rules"
+                ) from None
+            continue
+        try:
+            ConversionRules(file_definitions)
+        except ValueError as e:
+            raise ValueError(f"{filepath}: {e}") from None
+        definitions.extend(file_definitions)
+    return ConversionRules(definitions)
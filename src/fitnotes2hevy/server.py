@@ -0,0 +1,336 @@
+"""HTTP conversion service backed by a bounded worker pool."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+from .backup import is_fitnotes_backup, read_fitnotes_backup_bytes
+from .config import SERVER_MAX_UPLOAD_MB, SERVER_QUEUE_SIZE
+from .converter import (
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    unmapped_exercises,
+    write_hevy_csv,
+)
+from .rules import load_conversion_rules
+from .stream import resolve_timezone
+from .suggestions import SuggestionIndex
+
+# Query parameters of POST /convert and the convert_fitnotes_to_hevy keyword
+# arguments they set
+SETTING_PARAMS = {
+    "timezone": "timezone_offset",
+    "tz": "timezone",
+    "time": "workout_time",
+    "name": "workout_name",
+    "duration": "workout_duration",
+    "notes": "workout_notes",
+}
+
+# Size of the blocks the converted CSV is streamed to the client in
+RESPONSE_BLOCK_SIZE = 64 * 1024
+
+# Mappings and rules for the current worker process, set once by _init_worker
+_worker_mappings = {}
+_worker_rules = None
+_worker_suggestions = None
+
+
+class RequestError(Exception):
+    """A request the service rejects, with the HTTP status to answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_settings(query):
+    """Turn the query string of a conversion request into settings.
+
+    Args:
+        query: URL query string, e.g. "tz=Australia/Sydney&time=18:00"
+
+    Returns:
+        dict: Keyword arguments for convert_fitnotes_to_hevy
+
+    Raises:
+        RequestError: If a parameter is unknown, repeated or invalid
+    """
+    settings = {}
+    for param, values in parse_qs(query, keep_blank_values=True).items():
+        if param not in SETTING_PARAMS:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST,
+                f"Unknown query parameter '{param}'. "
+                f"Use {', '.join(SETTING_PARAMS)}.",
+            )
+        if len(values) > 1:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, f"Query parameter '{param}' is repeated"
+            )
+        settings[SETTING_PARAMS[param]] = values[0]
+
+    if "timezone_offset" in settings:
+        try:
+            settings["timezone_offset"] = int(settings["timezone_offset"])
+        except ValueError:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, "timezone must be a whole number of hours"
+            ) from None
+    if "timezone" in settings:
+        try:
+            resolve_timezone(settings["timezone"])
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+    return settings
+
+
+def _init_worker(mappings, rules):
+    """Store the mappings and rules once per worker instead of once per request."""
+    global _worker_mappings, _worker_rules
+    _worker_mappings = mappings
+    _worker_rules = rules
+
+
+def _read_upload(data):
+    """Read an uploaded FitNotes CSV export or backup."""
+    if is_fitnotes_backup(data):
+        return read_fitnotes_backup_bytes(data)
+    return read_fitnotes_csv(BytesIO(data))
+
+
+def _convert_upload(data, settings):
+    """Convert one upload in a worker process to a temporary Hevy CSV file.
+
+    Returns:
+        tuple: (path, rows); the caller removes the file once it is sent
+    """
+    df = _read_upload(data)
+    output_df = convert_fitnotes_to_hevy(
+        df, _worker_mappings, rules=_worker_rules, typed=True, **settings
+    )
+    fd, path = tempfile.mkstemp(prefix="fitnotes2hevy-", suffix=".csv")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_hevy_csv(output_df, f)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, len(output_df)
+
+
+def _preview_upload(data):
+    """Describe how each exercise of one upload would be mapped."""
+    global _worker_suggestions
+    df = _read_upload(data)
+    unmapped = set(unmapped_exercises(df["Exercise"], _worker_mappings))
+    if unmapped and _worker_suggestions is None:
+        _worker_suggestions = SuggestionIndex.from_file()
+
+    exercises = []
+    for exercise in df["Exercise"].dropna().unique():
+        mapped = exercise not in unmapped
+        exercises.append(
+            {
+                "fitnotes": exercise,
+                "hevy": _worker_mappings.get(exercise, exercise),
+                "mapped": mapped,
+                "suggestions": (
+                    []
+                    if mapped
+                    else [name for name, _ in _worker_suggestions.suggest(exercise)]
+                ),
+            }
+        )
+    return {"exercises": exercises, "unmapped": len(unmapped)}
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """HTTP server that converts uploads in a bounded process pool.
+
+    Each request thread takes one of workers + queue_size slots before it
+    reads the upload, and holds it while its job waits for or runs in the
+    pool; when no slot is free the request is answered with 429 straight
+    away, without reading or buffering the upload. If a worker dies, e.g.
+    killed for running out of memory, the requests it broke are answered
+    with 503 and the pool is replaced for the ones that follow.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        mappings,
+        workers=None,
+        queue_size=SERVER_QUEUE_SIZE,
+        max_upload_bytes=SERVER_MAX_UPLOAD_MB * 1024 * 1024,
+        rules=None,
+    ):
+        """Start the worker pool and bind the server.
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            mappings: Exercise name mappings dict
+            workers: Number of worker processes (default: CPU count)
+            queue_size: Requests that may wait for a free worker
+            max_upload_bytes: Largest accepted request body
+            rules: ConversionRules to apply (default: load_conversion_rules())
+        """
+        if rules is None:
+            rules = load_conversion_rules()
+        self.workers = workers or os.cpu_count() or 1
+        self.max_upload_bytes = max_upload_bytes
+        self._worker_args = (mappings, rules)
+        self._pool_lock = threading.Lock()
+        self.pool = self._start_pool()
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        super().__init__(address, ConversionHandler)
+
+    def _start_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=self._worker_args,
+        )
+
+    @contextmanager
+    def slot(self):
+        """Hold a request slot, without waiting for one to become free.
+
+        Raises:
+            RequestError: If every worker is busy and the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RequestError(
+                HTTPStatus.TOO_MANY_REQUESTS, "Server is busy, try again shortly"
+            )
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def run(self, fn, *args):
+        """Run a job in the pool and wait for its result; call within slot().
+
+        Raises:
+            RequestError: If a worker process died while the job was queued
+                or running
+        """
+        pool = self.pool
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            with self._pool_lock:
+                # Requests broken by the same worker replace the pool once
+                if self.pool is pool:
+                    self.pool = self._start_pool()
+                    pool.shutdown(wait=False, cancel_futures=True)
+            raise RequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "A conversion worker stopped unexpectedly, try again shortly",
+            ) from None
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """Routes POST /convert and POST /preview-mappings to the worker pool."""
+
+    server: ConversionServer
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == "/convert":
+                settings = parse_settings(url.query)
+                with self.server.slot():
+                    data = self._read_body()
+                    path, rows = self.server.run(_convert_upload, data, settings)
+                try:
+                    self._send_file(
+                        HTTPStatus.OK,
+                        path,
+                        "text/csv; charset=utf-8",
+                        {
+                            "Content-Disposition": 'attachment; filename="hevy.csv"',
+                            "X-Hevy-Sets": str(rows),
+                        },
+                    )
+                finally:
+                    os.unlink(path)
+            elif url.path == "/preview-mappings":
+                with self.server.slot():
+                    data = self._read_body()
+                    preview = self.server.run(_preview_upload, data)
+                self._send_json(HTTPStatus.OK, preview)
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, "Not found")
+        except RequestError as e:
+            self._send_error(e.status, str(e))
+        except ValueError as e:
+            # Invalid uploads, raised by the readers and converter
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            self.log_error("Conversion failed: %s: %s", type(e).__name__, e)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Conversion failed")
+
+    def _read_body(self):
+        """Read the request body, enforcing the upload size limit."""
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            raise RequestError(
+                HTTPStatus.LENGTH_REQUIRED, "Send the file with a Content-Length"
+            )
+        if int(length) > self.server.max_upload_bytes:
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"File is larger than the "
+                f"{self.server.max_upload_bytes // (1024 * 1024)} MB limit",
+            )
+        return self.rfile.read(int(length))
+
+    def _send_headers(self, status, length, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _send(self, status, body, content_type, headers=None):
+        self._send_headers(status, len(body), content_type, headers)
+        self.wfile.write(body)
+
+    def _send_file(self, status, path, content_type, headers=None):
+        """Stream a file to the client without reading it into memory."""
+        with open(path, "rb") as f:
+            self._send_headers(
+                status, os.fstat(f.fileno()).st_size, content_type, headers
+            )
+            shutil.copyfileobj(f, self.wfile, RESPONSE_BLOCK_SIZE)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json", headers)
+
+    def _send_error(self, status, message):
+        headers = {}
+        if status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+            headers["Retry-After"] = "1"
+        # The body of a rejected upload may be unread, so never reuse the
+        # connection after an error
+        self.close_connection = True
+        headers["Connection"] = "close"
+        self._send_json(status, {"error": message}, headers)
@@ -0,0 +1,492 @@
+"""Pandas-free streaming conversion engine built on the csv module.
+
+The pandas engine in converter.py and this engine apply the same rules and
+produce identical CSV output. This one avoids importing pandas altogether,
+which dominates the run time of small conversions, and holds each set as a
+small tuple of strings and floats instead of DataFrame columns.
+"""
+
+import csv
+import os
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .config import (
+    DEFAULT_DURATION,
+    DEFAULT_TRAINING_TIME,
+    DEFAULT_WORKOUT_NAME,
+    DEFAULT_WORKOUT_NOTES,
+    TIMEZONE_OFFSET_HOURS,
+)
+from .profiling import stage_hook
+from .rules import load_conversion_rules
+
+REQUIRED_COLUMNS = [
+    "Date",
+    "Exercise",
+    "Category",
+    "Weight",
+    "Weight Unit",
+    "Reps",
+    "Distance",
+    "Distance Unit",
+    "Time",
+]
+
+HEVY_COLUMNS = [
+    "Workout #",
+    "Date",
+    "Workout Name",
+    "Duration (sec)",
+    "Exercise Name",
+    "Set Order",
+    "Weight (kg)",
+    "Reps",
+    "RPE",
+    "Distance (meters)",
+    "Seconds",
+    "Notes",
+    "Workout Notes",
+]
+
+# Strings pandas.read_csv treats as missing by default
+NA_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Field positions of a parsed FitNotes set
+_DATE, _EXERCISE, _WEIGHT, _REPS, _DISTANCE, _TIME, _COMMENT = range(7)
+
+_MISSING = float("inf")
+
+
+def check_fitnotes_columns(columns):
+    """Check that the columns of a FitNotes export are all present.
+
+    Args:
+        columns: Column names of the file
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing_columns:
+        raise ValueError(
+            f"Invalid file format. This doesn't appear to be a FitNotes export. "
+            f"Missing columns: {', '.join(missing_columns)}.\n\n"
+            f"Please upload a CSV file exported from FitNotes. "
+            f"Go to FitNotes → Settings → Spreadsheet Export → Workout Data."
+        )
+
+
+def check_fitnotes_contents(rows, has_dates, has_exercises):
+    """Check that a FitNotes export has sets with dates and exercises.
+
+    Args:
+        rows: Number of sets
+        has_dates: Whether any set has a date
+        has_exercises: Whether any set has an exercise
+
+    Raises:
+        ValueError: If the export is empty or lacks dates or exercises
+    """
+    if not rows:
+        raise ValueError(
+            "The file is empty. Please upload a FitNotes export with workout data."
+        )
+    if not has_dates:
+        raise ValueError("No valid dates found in the file.")
+    if not has_exercises:
+        raise ValueError("No exercises found in the file.")
+
+
+def parse_duration(workout_duration):
+    """Convert a duration like "60m", "3600s" or 3600 to seconds."""
+    duration_str = str(workout_duration).lower()
+    if "m" in duration_str:
+        return int(duration_str.replace("m", "")) * 60
+    if "s" in duration_str:
+        return int(duration_str.replace("s", ""))
+    return int(duration_str)
+
+
+def resolve_timezone(name):
+    """Look up an IANA timezone by name.
+
+    Args:
+        name: IANA timezone name, e.g. "Australia/Sydney"
+
+    Returns:
+        ZoneInfo for the timezone
+
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(
+            f"Unknown timezone '{name}'. Use an IANA timezone name such as "
+            f"'Australia/Sydney' or 'America/New_York'."
+        ) from None
+
+
+def _seconds(time_str):
+    """Parse a Time value (HH:MM:SS, MM:SS or seconds) to integer seconds."""
+    if time_str is None or "_" in time_str:
+        return 0
+    try:
+        parts = time_str.split(":")
+        if len(parts) == 3:
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+        elif len(parts) == 2:
+            return int(parts[0]) * 60 + int(parts[1])
+        return int(float(time_str))
+    except (ValueError, OverflowError):
+        return 0
+
+
+def _gap_end(local, zone):
+    """Return the UTC instant a DST gap containing ``local`` ends at."""
+    offset_before = local.replace(tzinfo=zone, fold=0).utcoffset()
+    offset_after = local.replace(tzinfo=zone, fold=1).utcoffset()
+    lo = local - offset_after
+    hi = local - offset_before
+    # Binary search the transition second between the two interpretations
+    while (hi - lo).total_seconds() > 1:
+        mid = lo + (hi - lo) // 2
+        utc_mid = mid.replace(tzinfo=dt_timezone.utc)
+        if utc_mid.astimezone(zone).utcoffset() == offset_before:
+            lo = mid
+        else:
+            hi = mid
+    return hi.replace(tzinfo=dt_timezone.utc)
+
+
+def _format_date(date, workout_time, timezone_offset, zone):
+    """Timestamp, shift to UTC and format one workout date."""
+    stamp = f"{date} {workout_time}"
+    try:
+        local = datetime.strptime(stamp, DATE_FORMAT)
+    except ValueError:
+        local = datetime.fromisoformat(stamp)
+    if zone is None:
+        utc = local - timedelta(hours=timezone_offset)
+    else:
+        # Ambiguous times resolve to daylight time (fold=0) and skipped times
+        # move forward to the end of the gap, like the pandas engine
+        utc = local.replace(tzinfo=zone).astimezone(dt_timezone.utc)
+        if utc.astimezone(zone).replace(tzinfo=None) != local:
+            utc = _gap_end(local, zone)
+        utc = utc.replace(tzinfo=None)
+    return utc.strftime(DATE_FORMAT)
+
+
+def _text(value):
+    """Return a text field, or None if pandas would read it as missing."""
+    return None if value in NA_VALUES else value
+
+
+def _number(value):
+    """Return a numeric field as a float, or None if it is missing."""
+    if value in NA_VALUES:
+        return None
+    number = float(value)
+    return None if number != number else number
+
+
+def read_fitnotes_rows(f):
+    """Parse the sets of a FitNotes CSV export.
+
+    Args:
+        f: Text file object of the FitNotes export
+
+    Returns:
+        list: One (date, exercise, weight, reps, distance, time, comment)
+        tuple per set, with None for missing values
+
+    Raises:
+        ValueError: If the file is not a valid FitNotes export
+    """
+    reader = csv.reader(f)
+    header = next(reader, [])
+    check_fitnotes_columns(header)
+    positions = [
+        header.index(column)
+        for column in ["Date", "Exercise", "Weight", "Reps", "Distance", "Time"]
+    ]
+    comment = header.index("Comment") if "Comment" in header else None
+    width = len(header)
+
+    rows = []
+    for record in reader:
+        if not record:
+            continue
+        if len(record) < width:
+            record += [""] * (width - len(record))
+        date, exercise, weight, reps, distance, time = (
+            record[position] for position in positions
+        )
+        rows.append(
+            (
+                _text(date),
+                _text(exercise),
+                _number(weight),
+                _number(reps),
+                _number(distance),
+                _text(time),
+                None if comment is None else _text(record[comment]),
+            )
+        )
+    check_fitnotes_contents(
+        len(rows),
+        any(row[_DATE] is not None for row in rows),
+        any(row[_EXERCISE] is not None for row in rows),
+    )
+    return rows
+
+
+def convert_fitnotes_rows(
+    rows,
+    mappings,
+    timezone_offset=TIMEZONE_OFFSET_HOURS,
+    workout_time=DEFAULT_TRAINING_TIME,
+    workout_name=DEFAULT_WORKOUT_NAME,
+    workout_duration=DEFAULT_DURATION,
+    workout_notes=DEFAULT_WORKOUT_NOTES,
+    timezone=None,
+    rules=None,
+):
+    """Convert parsed FitNotes sets to Hevy rows, one set at a time.
+
+    Follows the same rules as convert_fitnotes_to_hevy: workouts are
+    numbered by date, exercises keep their first-appearance order within a
+    workout, and the time, distance and notes rules are applied per set.
+
+    Args:
+        rows: Sets from read_fitnotes_rows
+        mappings: Exercise name mappings dict
+        timezone_offset: Timezone offset in hours
+        workout_time: Default workout time string
+        workout_name: Workout name
+        workout_duration: Workout duration
+        workout_notes: Workout notes
+        timezone: Optional IANA timezone name; overrides timezone_offset with
+            the daylight-saving-aware offset of each workout date
+        rules: ConversionRules to apply (default: load_conversion_rules())
+
+    Yields:
+        list: Hevy row values in HEVY_COLUMNS order, in output order
+    """
+    if workout_time.count(":") == 1:
+        workout_time = workout_time + ":00"
+    zone = None if timezone is None else resolve_timezone(timezone)
+    duration = parse_duration(workout_duration)
+    if rules is None:
+        rules = load_conversion_rules()
+
+    # Work on the distinct dates only
+    dates = sorted({row[_DATE] for row in rows if row[_DATE] is not None})
+    formatted = {
+        date: _format_date(date, workout_time, timezone_offset, zone) for date in dates
+    }
+    ranks = {stamp: rank for rank, stamp in enumerate(sorted(set(formatted.values())))}
+    # Missing dates turn the pandas engine's workout numbers into floats
+    missing_dates = any(row[_DATE] is None for row in rows)
+    workout_numbers = {
+        date: float(number) if missing_dates else number
+        for number, date in enumerate(dates, 1)
+    }
+
+    # Order sets by date, then exercise first appearance, then set
+    groups = {}
+    keys = []
+    for position, row in enumerate(rows):
+        date, exercise = row[_DATE], row[_EXERCISE]
+        if date is None or exercise is None:
+            first, count = _MISSING, _MISSING
+        else:
+            group = groups.get((date, exercise))
+            if group is None:
+                group = groups[(date, exercise)] = [position, -1]
+            group[1] += 1
+            first, count = group
+        keys.append(
+            (_MISSING if date is None else ranks[formatted[date]], first, count)
+        )
+    order = sorted(range(len(rows)), key=keys.__getitem__)
+
+    names = []
+    for row in rows:
+        exercise = row[_EXERCISE]
+        mapped = None if exercise is None else mappings.get(exercise)
+        names.append(exercise if mapped is None else mapped)
+    missing_set_order = missing_dates or any(name is None for name in names)
+
+    set_counts = {}
+    for position in order:
+        date, exercise, weight, reps, distance, time, comment = rows[position]
+        name = names[position]
+        rank = keys[position][0]
+
+        set_order = None
+        if rank is not _MISSING and name is not None:
+            set_order = set_counts.get((rank, name), 0) + 1
+            set_counts[(rank, name)] = set_order
+            if missing_set_order:
+                set_order = float(set_order)
+
+        seconds = _seconds(time)
+        has_time = seconds > 0
+        matched = rules.match(exercise, name)
+        is_time_to_reps = matched.reps_divisor > 0
+        is_time_to_distance = matched.seconds_to_distance
+        is_reps_to_time = matched.reps_to_seconds
+
+        weight_kg = "" if weight is None else str(weight)
+
+        has_reps = reps is not None
+        reps_value = int(reps) if has_reps else ""
+        if is_time_to_reps and not has_reps and has_time:
+            reps_value = max(1, seconds // matched.reps_divisor)
+            has_reps = True
+
+        has_distance = distance is not None and distance != 0
+        distance_value = str(int(distance)) if has_distance else ""
+        if is_time_to_distance and not has_distance and has_time:
+            distance_value = str(seconds)
+            has_distance = True
+
+        if is_reps_to_time and has_reps:
+            seconds_value = str(float(reps_value))
+        elif (is_time_to_reps and has_reps) or (is_time_to_distance and has_distance):
+            seconds_value = ""
+        elif has_time:
+            seconds_value = str(float(seconds))
+        else:
+            seconds_value = ""
+        if is_reps_to_time:
+            reps_value = ""
+
+        notes = comment or ""
+        if matched.prefix_note:
+            notes = f"{exercise}; {notes}" if notes else exercise
+
+        yield [
+            None if date is None else workout_numbers[date],
+            None if date is None else formatted[date],
+            workout_name,
+            duration,
+            name,
+            set_order,
+            weight_kg,
+            reps_value,
+            "",
+            distance_value,
+            seconds_value,
+            notes,
+            workout_notes,
+        ]
+
+
+def convert_fitnotes_csv_stream(
+    input_file,
+    output_file,
+    mappings,
+    timezone_offset=TIMEZONE_OFFSET_HOURS,
+    workout_time=DEFAULT_TRAINING_TIME,
+    workout_name=DEFAULT_WORKOUT_NAME,
+    workout_duration=DEFAULT_DURATION,
+    workout_notes=DEFAULT_WORKOUT_NOTES,
+    timezone=None,
+    rules=None,
+    profiler=None,
+):
+    """Convert a FitNotes CSV file to a Hevy CSV file without pandas.
+
+    Hevy rows are written as they are produced. The output is identical to
+    writing convert_fitnotes_to_hevy's result with ``to_csv``.
+
+    Args:
+        input_file: FitNotes CSV filepath
+        output_file: Hevy CSV filepath
+        mappings: Exercise name mappings dict
+        timezone_offset: Timezone offset in hours
+        workout_time: Default workout time string
+        workout_name: Workout name
+        workout_duration: Workout duration
+        workout_notes: Workout notes
+        timezone: Optional IANA timezone name
+        rules: ConversionRules to apply (default: load_conversion_rules())
+        profiler: Optional StageProfiler recording per-stage measurements
+
+    Returns:
+        dict: "sets", "workouts" and "exercises" counts and the "unmapped"
+        FitNotes exercise names in first-appearance order
+
+    Raises:
+        ValueError: If input data is invalid
+    """
+    stage = stage_hook(profiler)
+
+    with stage("read_csv") as run:
+        with open(input_file, "r", encoding="utf-8-sig", newline="") as f:
+            rows = read_fitnotes_rows(f)
+        run.rows = len(rows)
+
+    with stage("convert", len(rows)), open(
+        output_file, "w", encoding="utf-8", newline=""
+    ) as f:
+        writer = csv.writer(
+            f, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator=os.linesep
+        )
+        writer.writerow(HEVY_COLUMNS)
+        for hevy_row in convert_fitnotes_rows(
+            rows,
+            mappings,
+            timezone_offset,
+            workout_time,
+            workout_name,
+            workout_duration,
+            workout_notes,
+            timezone,
+            rules,
+        ):
+            writer.writerow(hevy_row)
+
+    unmapped = dict.fromkeys(
+        row[_EXERCISE]
+        for row in rows
+        if row[_EXERCISE] is not None and row[_EXERCISE] not in mappings
+    )
+    return {
+        "sets": len(rows),
+        "workouts": len({row[_DATE] for row in rows} - {None}),
+        "exercises": len(
+            {mappings.get(row[_EXERCISE]) or row[_EXERCISE] for row in rows} - {None}
+        ),
+        "unmapped": list(unmapped),
+    }
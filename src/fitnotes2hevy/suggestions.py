@@ -0,0 +1,166 @@
+"""Fuzzy Hevy exercise name suggestions for unmapped FitNotes exercises."""
+
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from .rules import NO_MATCH
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Lowest score for a suggestion to be drafted as a mapping. Renames such as
+# "Bench Press" to "Bench Press (Barbell)" score well above it, while
+# look-alikes such as "Farmer's Walk" to "Walking" score well below
+MIN_DRAFT_SCORE = 0.5
+
+
+def _tokens(name):
+    """Split a name into lowercase alphanumeric tokens."""
+    return [token for token in _NON_ALPHANUMERIC.split(name.lower()) if token]
+
+
+def _grams(name, n=3):
+    """Return the set of features for a name: its tokens and character n-grams.
+
+    N-grams are taken per token with boundary padding, so word order does not
+    matter ("Barbell Bench Press" vs "Bench Press (Barbell)").
+    """
+    features = set()
+    for token in _tokens(name):
+        features.add(token)
+        padded = f" {token} "
+        features.update(padded[i : i + n] for i in range(len(padded) - n + 1))
+    return features
+
+
+class SuggestionIndex:
+    """Inverted n-gram index over Hevy exercise names.
+
+    Each name is broken into word tokens and character trigrams, weighted by
+    inverse document frequency. A query only visits the posting lists of its
+    own features, so lookups cost a few hundred integer updates rather than
+    a comparison against every Hevy name.
+    """
+
+    def __init__(self, names, n=3):
+        """Build the index.
+
+        Args:
+            names: Hevy exercise names to suggest from
+            n: Character n-gram size
+        """
+        self.names = list(dict.fromkeys(names))
+        self.n = n
+        postings = defaultdict(list)
+        for name_id, name in enumerate(self.names):
+            for feature in _grams(name, n):
+                postings[feature].append(name_id)
+
+        total = len(self.names)
+        self._weights = {
+            feature: math.log(1 + total / len(ids)) for feature, ids in postings.items()
+        }
+        self._postings = dict(postings)
+        self._norms = [0.0] * total
+        for feature, ids in self._postings.items():
+            for name_id in ids:
+                self._norms[name_id] += self._weights[feature]
+
+    @classmethod
+    def from_file(cls, path="data/exercises/hevy.txt", n=3):
+        """Build an index from a text file with one exercise name per line.
+
+        Args:
+            path: Exercise list filepath
+            n: Character n-gram size
+
+        Returns:
+            SuggestionIndex
+        """
+        with open(Path(path), "r", encoding="utf-8") as f:
+            return cls((line.strip() for line in f if line.strip()), n)
+
+    def suggest(self, name, k=3):
+        """Return the best matching Hevy names for a FitNotes exercise.
+
+        Scores are the weighted Dice coefficient of shared features, between
+        0 and 1.
+
+        Args:
+            name: FitNotes exercise name
+            k: Maximum number of suggestions
+
+        Returns:
+            list: (hevy_name, score) tuples, best first
+        """
+        features = _grams(name, self.n)
+        query_norm = 0.0
+        shared = defaultdict(float)
+        for feature in features:
+            weight = self._weights.get(feature)
+            if weight is None:
+                # Unknown features still count against the match
+                query_norm += math.log(1 + len(self.names))
+                continue
+            query_norm += weight
+            for name_id in self._postings[feature]:
+                shared[name_id] += weight
+
+        scored = sorted(
+            (
+                (2 * overlap / (query_norm + self._norms[name_id]), name_id)
+                for name_id, overlap in shared.items()
+            ),
+            key=lambda item: (-item[0], self.names[item[1]]),
+        )
+        return [(self.names[name_id], score) for score, name_id in scored[:k]]
+
+    def suggest_many(self, names, k=3):
+        """Return suggestions for several FitNotes exercises.
+
+        Args:
+            names: FitNotes exercise names
+            k: Maximum number of suggestions per name
+
+        Returns:
+            dict: Name to list of (hevy_name, score) tuples
+        """
+        return {name: self.suggest(name, k) for name in names}
+
+
+def draft_custom_mappings(suggestions, rules=None, min_score=MIN_DRAFT_SCORE):
+    """Build a draft custom.json mapping from suggestions.
+
+    The best suggestion becomes the mapping if it scores at least min_score;
+    the alternatives, weaker suggestions and exercises left unmapped are
+    kept under underscore-prefixed keys, which load_exercise_mappings
+    ignores. Exercises a conversion rule already applies to under their
+    FitNotes name are left unmapped, since renaming them could stop the
+    rule from applying.
+
+    Args:
+        suggestions: Dict from SuggestionIndex.suggest_many
+        rules: ConversionRules the exports are converted with, or None
+        min_score: Lowest score of a suggestion drafted as a mapping
+
+    Returns:
+        dict: Draft mappings, ready to be written as JSON
+    """
+    draft = {
+        "_comment": "DRAFT MAPPINGS - Review these suggestions, then copy the "
+        "correct ones into data/mappings/custom.json",
+        "_alternatives": {},
+        "_low_score": {},
+        "_handled_by_rules": [],
+    }
+    for name, matches in suggestions.items():
+        if rules is not None and rules.match(name, name) != NO_MATCH:
+            draft["_handled_by_rules"].append(name)
+        elif matches and matches[0][1] >= min_score:
+            draft[name] = matches[0][0]
+            if len(matches) > 1:
+                draft["_alternatives"][name] = [hevy for hevy, _ in matches[1:]]
+        elif matches:
+            draft["_low_score"][name] = [hevy for hevy, _ in matches]
+    return draft
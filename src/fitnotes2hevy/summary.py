@@ -0,0 +1,145 @@
+"""Conversion summaries: counts and per-exercise statistics."""
+
+import json
+
+# Conversions the exercise rules apply to individual sets
+RULE_CONVERSIONS = ("time_to_reps", "time_to_distance", "reps_to_time")
+
+
+class ConversionSummary:
+    """Collect workout, set and exercise statistics while converting.
+
+    Pass an instance as ``summary`` to the conversion functions. They fill it
+    from the exercise and date codes the conversion computes anyway, so the
+    statistics cost a few counting passes over integer arrays rather than
+    extra scans of the DataFrame. The chunks of a chunked conversion, and
+    repeated conversions, accumulate into the same summary.
+
+    Attributes:
+        sets: Number of converted sets
+        workouts: Number of workouts (distinct dates)
+        first_date: Earliest workout date, as in the FitNotes export
+        last_date: Latest workout date, as in the FitNotes export
+        exercise_sets: Hevy exercise name to its number of sets
+        exercise_volume: Hevy exercise name to its volume (weight x reps) in kg
+        rule_conversions: Sets changed by each conversion rule
+        unmapped: Unmapped FitNotes exercise name to its number of sets
+    """
+
+    def __init__(self):
+        self.sets = 0
+        self.workouts = 0
+        self.first_date = None
+        self.last_date = None
+        self.exercise_sets = {}
+        self.exercise_volume = {}
+        self.rule_conversions = dict.fromkeys(RULE_CONVERSIONS, 0)
+        self.unmapped = {}
+
+    @property
+    def exercises(self):
+        """Number of distinct Hevy exercises."""
+        return len(self.exercise_sets)
+
+    @property
+    def volume(self):
+        """Total volume (weight x reps) in kg."""
+        return sum(self.exercise_volume.values())
+
+    def add(
+        self,
+        sets,
+        workouts,
+        first_date,
+        last_date,
+        exercise_sets,
+        exercise_volume,
+        rule_conversions,
+        unmapped,
+    ):
+        """Accumulate the statistics of one conversion.
+
+        Args:
+            sets: Number of converted sets
+            workouts: Number of workouts
+            first_date: Earliest workout date, or None without dates
+            last_date: Latest workout date, or None without dates
+            exercise_sets: Hevy exercise name to number of sets
+            exercise_volume: Hevy exercise name to volume in kg
+            rule_conversions: Conversion rule name to number of changed sets
+            unmapped: Unmapped FitNotes exercise name to number of sets
+        """
+        self.sets += sets
+        self.workouts += workouts
+        if first_date is not None:
+            if self.first_date is None or first_date < self.first_date:
+                self.first_date = first_date
+            if self.last_date is None or last_date > self.last_date:
+                self.last_date = last_date
+        for name, count in exercise_sets.items():
+            self.exercise_sets[name] = self.exercise_sets.get(name, 0) + count
+        for name, volume in exercise_volume.items():
+            self.exercise_volume[name] = self.exercise_volume.get(name, 0.0) + volume
+        for name, count in rule_conversions.items():
+            self.rule_conversions[name] += count
+        for name, count in unmapped.items():
+            self.unmapped[name] = self.unmapped.get(name, 0) + count
+
+    def to_dict(self):
+        """Return the summary as a JSON-serializable dict.
+
+        Exercises are listed by descending number of sets, then by name.
+        """
+        exercises = sorted(
+            self.exercise_sets.items(), key=lambda item: (-item[1], item[0])
+        )
+        return {
+            "workouts": self.workouts,
+            "exercises": self.exercises,
+            "sets": self.sets,
+            "volume_kg": round(self.volume, 3),
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+            "rule_conversions": dict(self.rule_conversions),
+            "per_exercise": [
+                {
+                    "exercise": name,
+                    "sets": sets,
+                    "volume_kg": round(self.exercise_volume.get(name, 0.0), 3),
+                }
+                for name, sets in exercises
+            ],
+            "unmapped": [
+                {"exercise": name, "sets": sets}
+                for name, sets in sorted(
+                    self.unmapped.items(), key=lambda item: (-item[1], item[0])
+                )
+            ],
+        }
+
+    def to_json(self):
+        """Return the summary as a JSON string."""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def report(self):
+        """Return the headline counts as printable lines."""
+        lines = [
+            f"Total workouts: {self.workouts}",
+            f"Total exercises: {self.exercises}",
+            f"Total sets: {self.sets}",
+        ]
+        if self.first_date is not None:
+            lines.append(f"Date range: {self.first_date} to {self.last_date}")
+        lines.append(f"Total volume: {self.volume:,.1f} kg")
+        converted = {
+            name: count for name, count in self.rule_conversions.items() if count
+        }
+        if converted:
+            lines.append(
+                "Rule conversions: "
+                + ", ".join(
+                    f"{count} {name.replace('_', ' ')}"
+                    for name, count in converted.items()
+                )
+            )
+        return "\n".join(lines)
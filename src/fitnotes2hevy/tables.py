@@ -0,0 +1,102 @@
+"""Parquet and Arrow IPC input and output for converted histories."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from .config import ARROW_SUFFIXES, PARQUET_SUFFIXES
+from .converter import apply_fitnotes_dtypes, read_fitnotes_csv
+
+PYARROW_HINT = (
+    "Parquet and Arrow files require pyarrow. "
+    "Install it with: pip install 'fitnotes2hevy[arrow]'"
+)
+
+
+def table_format(path):
+    """Return "parquet" or "arrow" for a columnar filepath, else None."""
+    suffix = Path(path).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    return None
+
+
+def require_pyarrow():
+    """Check that pyarrow is installed.
+
+    Raises:
+        ImportError: If pyarrow is missing, with installation instructions
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(PYARROW_HINT) from None
+
+
+def _normalize_fitnotes_frame(df):
+    """Give a FitNotes table the column types read_fitnotes_csv produces."""
+    if "Date" in df.columns and pd.api.types.infer_dtype(df["Date"]) in (
+        "datetime64",
+        "datetime",
+        "date",
+    ):
+        # Tables may store dates natively; the converter expects FitNotes text
+        df = df.assign(Date=pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d"))
+    return apply_fitnotes_dtypes(df)
+
+
+def read_fitnotes_file(path):
+    """Read FitNotes data from a CSV export, Parquet or Arrow IPC file.
+
+    The format is chosen by file extension: .parquet or .pq for Parquet,
+    .arrow, .feather or .ipc for Arrow IPC, and CSV otherwise.
+
+    Args:
+        path: FitNotes filepath
+
+    Returns:
+        DataFrame with the same columns and types as read_fitnotes_csv
+
+    Raises:
+        ImportError: If a columnar file is given and pyarrow is missing
+    """
+    file_format = table_format(path)
+    if file_format is None:
+        return read_fitnotes_csv(path)
+    require_pyarrow()
+    if file_format == "parquet":
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_feather(path)
+    return _normalize_fitnotes_frame(df)
+
+
+def write_hevy_table(df, path):
+    """Write a Hevy DataFrame to a Parquet or Arrow IPC file.
+
+    Typed frames from ``convert_fitnotes_to_hevy(..., typed=True)`` keep
+    their timestamps and nullable numbers, so the table can be re-read
+    without parsing any text.
+
+    Args:
+        df: Hevy DataFrame
+        path: Output filepath ending in a Parquet or Arrow extension
+
+    Raises:
+        ValueError: If the extension is not a Parquet or Arrow one
+        ImportError: If pyarrow is missing
+    """
+    file_format = table_format(path)
+    if file_format is None:
+        raise ValueError(
+            f"Unsupported table file {path}: use one of "
+            f"{', '.join(PARQUET_SUFFIXES + ARROW_SUFFIXES)}"
+        )
+    require_pyarrow()
+    df = df.reset_index(drop=True)
+    if file_format == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
@@ -0,0 +1,120 @@
+"""Shared fixtures for the converter tests."""
+
+import csv
+import io
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from fitnotes2hevy.rules import load_conversion_rules
+
+ROOT = Path(__file__).parent.parent
+MAPPINGS_DIR = ROOT / "data" / "mappings"
+
+FITNOTES_COLUMNS = [
+    "Date",
+    "Exercise",
+    "Category",
+    "Weight",
+    "Weight Unit",
+    "Reps",
+    "Distance",
+    "Distance Unit",
+    "Time",
+    "Comment",
+]
+
+# FitNotes names of the generated exports and the Hevy names they map to.
+# Between them they hit every rule in rules.json, an unmapped exercise and
+# two FitNotes exercises mapped to the same Hevy exercise
+MAPPINGS = {
+    "Flat Barbell Bench Press": "Bench Press (Barbell)",
+    "Incline Barbell Bench Press": "Bench Press (Barbell)",
+    "Barbell Squat": "Squat (Barbell)",
+    "Bird-dog": "Bird Dog",
+    "Flutter Kicks": "Flutter Kicks",
+    "Farmer's Walk": "Farmers Walk",
+    "Warm-up": "Warm Up",
+    "Stretch": "Stretching",
+    "Backward Treadmill Walk": "Treadmill",
+}
+
+
+def generate_export(seed, exercises, workouts=20, start=date(2023, 1, 1)):
+    """Generate a FitNotes CSV export with every kind of missing value.
+
+    Exercises reappear later in a workout, so ordering by first appearance
+    is exercised too.
+    """
+    rng = random.Random(seed)
+    rows = []
+    day = start
+    for _ in range(workouts):
+        day += timedelta(days=rng.randint(1, 4))
+        for exercise in rng.choices(exercises, k=rng.randint(1, 6)):
+            for _ in range(rng.randint(1, 4)):
+                weight = rng.choice([None, 0, 20, 62.5, 100, 142.5])
+                distance = rng.choice([None, None, 0, 400, 1000])
+                rows.append(
+                    [
+                        day.isoformat(),
+                        exercise,
+                        "Category",
+                        weight,
+                        None if weight is None else "kgs",
+                        rng.choice([None, None, 1, 5, 8, 12]),
+                        distance,
+                        None if distance is None else "m",
+                        rng.choice(
+                            [None, None, "0:00:45", "1:30", "90", "0:10:00", "1:00:00"]
+                        ),
+                        rng.choice([None, None, "felt good", "NA", "left; right"]),
+                    ]
+                )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FITNOTES_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def rules():
+    return load_conversion_rules(MAPPINGS_DIR)
+
+
+@pytest.fixture(scope="session")
+def mappings():
+    return dict(MAPPINGS)
+
+
+@pytest.fixture(scope="session")
+def exercises():
+    return [*MAPPINGS, "Mystery Lift"]
+
+
+@pytest.fixture
+def export_file(tmp_path, exercises):
+    """A generated FitNotes export written to a file."""
+    path = tmp_path / "export.csv"
+    path.write_text(generate_export(0, exercises), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def run_cli(monkeypatch):
+    """Invoke the command-line interface from the repository root."""
+    from typer.testing import CliRunner
+
+    from scripts.convert import app
+
+    monkeypatch.chdir(ROOT)
+    runner = CliRunner()
+
+    def run(*args):
+        return runner.invoke(app, [str(arg) for arg in args])
+
+    return run
@@ -0,0 +1,189 @@
+"""Reading workouts from a FitNotes SQLite backup."""
+
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from fitnotes2hevy.backup import read_fitnotes_backup, read_fitnotes_backup_bytes
+from fitnotes2hevy.converter import (
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+from fitnotes2hevy.mappings import load_exercise_mappings
+
+SCHEMA = """
+CREATE TABLE Category (_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE exercise (_id INTEGER PRIMARY KEY, name TEXT, category_id INTEGER);
+CREATE TABLE training_log (
+    _id INTEGER PRIMARY KEY, exercise_id INTEGER, date TEXT,
+    metric_weight REAL, reps INTEGER, distance REAL, duration_seconds INTEGER
+);
+CREATE TABLE Comment (
+    _id INTEGER PRIMARY KEY, owner_type_id INTEGER, owner_id INTEGER, comment TEXT
+);
+"""
+
+CATEGORIES = [(1, "Legs"), (2, "Cardio"), (3, "Core"), (4, "Chest")]
+
+EXERCISES = [
+    (1, "Barbell Squat", 1),
+    (2, "Farmer's Walk", 2),
+    (3, "Bird-dog", 3),
+    (4, "Backward Treadmill Walk", 2),
+    (5, "Flat Barbell Bench Press", 4),
+    (6, "Warm-up", 2),
+]
+
+# (_id, exercise, date, weight, reps, distance, seconds); unused values are 0
+SETS = [
+    (1, 1, "2023-01-02", 100, 5, 0, 0),
+    (2, 1, "2023-01-02", 102.5, 3, 0, 0),
+    (3, 2, "2023-01-02", 40, 0, 0, 75),
+    (4, 3, "2023-01-05", 0, 0, 0, 45),
+    (5, 4, "2023-01-05", 0, 0, 400, 3725),
+    (6, 5, "2023-01-09", 60, 8, 0, 0),
+    (7, 6, "2023-01-09", 0, 10, 0, 0),
+    # Logged later for an earlier date
+    (8, 1, "2023-01-02", 105, 1, 0, 0),
+]
+
+# Comments on sets, and one on something else that must be ignored
+COMMENTS = [(1, 1, 1, "felt good"), (2, 1, 5, "left; right"), (3, 2, 6, "routine")]
+
+# The CSV export FitNotes writes for the same sets
+EXPORT = """\
+Date,Exercise,Category,Weight,Weight Unit,Reps,Distance,Distance Unit,Time,Comment
+2023-01-02,Barbell Squat,Legs,100.0,kgs,5,,,,felt good
+2023-01-02,Barbell Squat,Legs,102.5,kgs,3,,,,
+2023-01-02,Farmer's Walk,Cardio,40.0,kgs,,,,0:01:15,
+2023-01-02,Barbell Squat,Legs,105.0,kgs,1,,,,
+2023-01-05,Bird-dog,Core,,,,,,0:00:45,
+2023-01-05,Backward Treadmill Walk,Cardio,,,,400.0,m,1:02:05,left; right
+2023-01-09,Flat Barbell Bench Press,Chest,60.0,kgs,8,,,,
+2023-01-09,Warm-up,Cardio,0.0,kgs,10,,,,
+"""
+
+
+@pytest.fixture
+def backup(tmp_path):
+    path = tmp_path / "FitNotes_Backup.fitnotes"
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO Category VALUES (?, ?)", CATEGORIES)
+        conn.executemany("INSERT INTO exercise VALUES (?, ?, ?)", EXERCISES)
+        # Inserted out of order, as the log is edited over time
+        conn.executemany(
+            "INSERT INTO training_log VALUES (?, ?, ?, ?, ?, ?, ?)", SETS[::-1]
+        )
+        conn.executemany("INSERT INTO Comment VALUES (?, ?, ?, ?)", COMMENTS)
+        conn.commit()
+    return path
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(EXPORT, encoding="utf-8")
+    return path
+
+
+def assert_same_sets(df, expected):
+    # Compared as text, since the dtypes of empty columns may differ
+    assert list(df.columns) == list(expected.columns)
+    assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_backup_reads_like_the_export(backup, export):
+    assert_same_sets(read_fitnotes_backup(backup), read_fitnotes_csv(export))
+
+
+def test_backup_bytes_read_like_the_file(backup, export):
+    assert_same_sets(
+        read_fitnotes_backup_bytes(backup.read_bytes()), read_fitnotes_csv(export)
+    )
+
+
+@pytest.mark.parametrize(
+    "since, until, dates",
+    [
+        ("2023-01-05", None, ["2023-01-05", "2023-01-09"]),
+        (None, "2023-01-05", ["2023-01-02", "2023-01-05"]),
+        ("2023-01-03", "2023-01-08", ["2023-01-05"]),
+        ("2023-02-01", None, []),
+    ],
+)
+def test_date_range(backup, export, since, until, dates):
+    expected = read_fitnotes_csv(export)
+    expected = expected[expected["Date"].isin(dates)]
+
+    assert_same_sets(read_fitnotes_backup(backup, since, until), expected)
+    assert_same_sets(
+        read_fitnotes_backup_bytes(backup.read_bytes(), since, until), expected
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_chunked_reads(backup, export, chunksize):
+    chunks = list(read_fitnotes_backup(backup, chunksize=chunksize))
+
+    assert len(chunks) == -(-len(SETS) // chunksize)
+    assert_same_sets(pd.concat(chunks), read_fitnotes_csv(export))
+
+
+def test_missing_backup_raises(tmp_path):
+    path = tmp_path / "missing.fitnotes"
+
+    with pytest.raises(ValueError, match="Invalid backup file"):
+        read_fitnotes_backup(path)
+    # Opened read-only, so no empty database is left behind
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("contents", [b"Date,Exercise\n", b"SQLite format 3\x00junk"])
+def test_invalid_backup_raises(tmp_path, contents):
+    path = tmp_path / "invalid.fitnotes"
+    path.write_bytes(contents)
+
+    with pytest.raises(ValueError, match="Invalid backup file"):
+        read_fitnotes_backup(path)
+    with pytest.raises(ValueError, match="Invalid backup file"):
+        read_fitnotes_backup_bytes(contents)
+
+
+def test_database_without_fitnotes_tables_raises(tmp_path):
+    path = tmp_path / "other.db"
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("CREATE TABLE notes (text TEXT)")
+
+    with pytest.raises(ValueError, match="Invalid backup file"):
+        read_fitnotes_backup(path, chunksize=2)
+
+
+def test_input_db_option(tmp_path, backup, export, run_cli):
+    output = tmp_path / "hevy.csv"
+    chunked_output = tmp_path / "hevy_chunked.csv"
+    args = ["--input-db", backup, "--since", "2023-01-05"]
+
+    result = run_cli(*args, "--output-file", output)
+    chunked = run_cli(*args, "--output-file", chunked_output, "--chunk-size", "2")
+
+    assert result.exit_code == 0, result.output
+    assert chunked.exit_code == 0, chunked.output
+    df = read_fitnotes_csv(export)
+    expected = write_hevy_csv(
+        convert_fitnotes_to_hevy(
+            df[df["Date"] >= "2023-01-05"], load_exercise_mappings(), typed=True
+        )
+    )
+    assert output.read_text(encoding="utf-8") == expected
+    assert chunked_output.read_text(encoding="utf-8") == expected
+
+
+def test_since_requires_input_db(export, run_cli):
+    result = run_cli("--input-file", export, "--since", "2023-01-05")
+
+    assert result.exit_code == 2
+    assert "--input-db" in result.output
@@ -0,0 +1,96 @@
+"""Parallel batch conversion."""
+
+import json
+
+from conftest import generate_export
+
+from fitnotes2hevy.batch import convert_batch, find_input_files
+from fitnotes2hevy.converter import (
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+
+
+def write_exports(directory, exercises, count):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for seed in range(count):
+        path = directory / f"export_{seed}.csv"
+        path.write_text(generate_export(seed, exercises), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_failed_file_does_not_stop_the_others(tmp_path, exercises, run_cli):
+    first, second = write_exports(tmp_path / "in", exercises, 2)
+    bad = tmp_path / "in" / "bad.csv"
+    bad.write_text("Name,Value\nfoo,1\n", encoding="utf-8")
+    missing = tmp_path / "in" / "missing.csv"
+    output_dir = tmp_path / "out"
+    settings = ["--timezone", "5", "--time", "18:30"]
+
+    result = run_cli(
+        "batch", first, bad, missing, second, "-o", output_dir, "-w", "2", *settings
+    )
+
+    assert result.exit_code == 1, result.output
+    manifest = json.loads((output_dir / "manifest.json").read_text())
+    assert (manifest["files"], manifest["succeeded"], manifest["failed"]) == (4, 2, 2)
+    statuses = [entry["status"] for entry in manifest["results"]]
+    assert statuses == ["ok", "error", "error", "ok"]
+    assert "FitNotes" in manifest["results"][1]["error"]
+    assert "FileNotFoundError" in manifest["results"][2]["error"]
+
+    # Each output matches converting its file on its own
+    for export, entry in zip([first, second], manifest["results"][::3]):
+        single = tmp_path / f"{export.stem}_single.csv"
+        result = run_cli("--input-file", export, "--output-file", single, *settings)
+        assert result.exit_code == 0, result.output
+        with open(entry["output"], "rb") as f:
+            assert f.read() == single.read_bytes()
+        assert entry["rows"] == single.read_bytes().count(b"\n") - 1
+
+
+def test_all_files_converted_exits_cleanly(tmp_path, exercises, run_cli):
+    write_exports(tmp_path / "in", exercises, 3)
+
+    result = run_cli("batch", tmp_path / "in", "-o", tmp_path / "out")
+
+    assert result.exit_code == 0, result.output
+    manifest = json.loads((tmp_path / "out" / "manifest.json").read_text())
+    assert manifest["succeeded"] == 3
+    assert manifest["rows"] == sum(entry["rows"] for entry in manifest["results"])
+
+
+def test_no_input_files_is_a_usage_error(tmp_path, run_cli):
+    result = run_cli("batch", str(tmp_path / "*.csv"), "-o", tmp_path / "out")
+
+    assert result.exit_code == 2
+
+
+def test_repeated_file_names_get_distinct_outputs(tmp_path, exercises, mappings, rules):
+    (first,) = write_exports(tmp_path / "a", exercises, 1)
+    (second,) = write_exports(tmp_path / "b", exercises[:3], 1)
+
+    entries = convert_batch(
+        [first, second], tmp_path / "out", mappings, workers=1, rules=rules
+    )
+
+    assert [entry["status"] for entry in entries] == ["ok", "ok"]
+    assert entries[0]["output"] != entries[1]["output"]
+    for export, entry in zip([first, second], entries):
+        expected = convert_fitnotes_to_hevy(
+            read_fitnotes_csv(export), mappings, rules=rules, typed=True
+        )
+        with open(entry["output"], encoding="utf-8") as f:
+            assert f.read() == write_hevy_csv(expected)
+
+
+def test_find_input_files(tmp_path, exercises):
+    first, second = write_exports(tmp_path, exercises, 2)
+    (tmp_path / "notes.txt").write_text("not an export")
+
+    found = find_input_files([str(tmp_path), str(tmp_path / "*_1.csv"), str(first)])
+
+    assert found == [first, second]
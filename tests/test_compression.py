@@ -0,0 +1,102 @@
+"""Gzip and zip compressed Hevy CSV output."""
+
+import gzip
+import io
+import zipfile
+
+import pytest
+
+from fitnotes2hevy.converter import (
+    convert_fitnotes_to_hevy,
+    hevy_csv_bytes,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+
+
+@pytest.fixture
+def hevy_df(export_file, mappings):
+    return convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file), mappings, typed=True
+    )
+
+
+@pytest.fixture
+def plain(hevy_df):
+    return write_hevy_csv(hevy_df).encode("utf-8")
+
+
+def test_gzip_file_round_trip(tmp_path, hevy_df, plain):
+    output = tmp_path / "hevy.csv.gz"
+
+    write_hevy_csv(hevy_df, output, compression="gzip")
+
+    assert gzip.decompress(output.read_bytes()) == plain
+
+
+def test_zip_file_round_trip(tmp_path, hevy_df, plain):
+    output = tmp_path / "hevy.zip"
+
+    write_hevy_csv(hevy_df, output, compression="zip")
+
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ["hevy.csv"]
+        assert archive.read("hevy.csv") == plain
+
+
+def test_zip_member_keeps_csv_extension(tmp_path, hevy_df, plain):
+    output = tmp_path / "export.csv.zip"
+
+    write_hevy_csv(hevy_df, output, compression="zip")
+
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ["export.csv"]
+
+
+def test_small_chunks_round_trip(tmp_path, hevy_df, plain):
+    output = tmp_path / "hevy.csv.gz"
+
+    write_hevy_csv(hevy_df, output, compression="gzip", chunk_rows=7)
+
+    assert gzip.decompress(output.read_bytes()) == plain
+
+
+def test_compressed_bytes(hevy_df, plain):
+    assert hevy_csv_bytes(hevy_df) == plain
+    assert gzip.decompress(hevy_csv_bytes(hevy_df, compression="gzip")) == plain
+
+    data = hevy_csv_bytes(hevy_df, compression="zip", name="workouts.csv")
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["workouts.csv"]
+        assert archive.read("workouts.csv") == plain
+
+
+def test_unsupported_compression(tmp_path, hevy_df):
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        write_hevy_csv(hevy_df, tmp_path / "hevy.csv.bz2", compression="bz2")
+
+
+@pytest.mark.parametrize("extra", [(), ("--chunk-size", "25")])
+def test_cli_output_suffixes(tmp_path, export_file, run_cli, extra):
+    outputs = {
+        name: tmp_path / name for name in ("hevy.csv", "hevy.csv.gz", "hevy.zip")
+    }
+    for output in outputs.values():
+        result = run_cli("--input-file", export_file, "--output-file", output, *extra)
+        assert result.exit_code == 0, result.output
+
+    plain = outputs["hevy.csv"].read_bytes()
+    assert gzip.decompress(outputs["hevy.csv.gz"].read_bytes()) == plain
+    with zipfile.ZipFile(outputs["hevy.zip"]) as archive:
+        assert archive.read("hevy.csv") == plain
+
+
+def test_cli_compression_requires_pandas_engine(tmp_path, export_file, run_cli):
+    output = tmp_path / "hevy.csv.gz"
+
+    result = run_cli(
+        "--input-file", export_file, "--output-file", output, "--engine", "stream"
+    )
+
+    assert result.exit_code == 2
+    assert not output.exists()
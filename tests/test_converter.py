@@ -0,0 +1,174 @@
+"""Parity of the vectorized converter with the original row-wise conversion."""
+
+import io
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+from conftest import generate_export
+
+from fitnotes2hevy.converter import (
+    convert_fitnotes_to_hevy,
+    parse_time_to_seconds,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+
+# The exercise lists config.py defined for the original conversion, kept here
+# so the reference does not depend on the rules under test
+TIME_TO_REPS_EXERCISES = [
+    "Bird Dog",
+    "Dead Bug",
+    "Deadbug",
+    "Flutter Kicks",
+    "Flutter Kick",
+]
+TIME_TO_DISTANCE_EXERCISES = [
+    "Farmers Walk",
+    "Farmer Walk",
+    "Farmer's Walk",
+    "Farmer's Carry",
+]
+REPS_TO_TIME_EXERCISES = ["Warm Up"]
+
+
+def rowwise_convert(df, mappings, timezone_offset, workout_time):
+    """The original row-wise conversion, with its hard-coded exercise lists."""
+    df = df.copy()
+    if workout_time.count(":") == 1:
+        workout_time = workout_time + ":00"
+
+    df["first_appearance"] = df.groupby(["Date", "Exercise"]).cumcount()
+    df["exercise_order"] = df.groupby(["Date", "Exercise"])[
+        "first_appearance"
+    ].transform("idxmin")
+    df["Workout #"] = df.groupby("Date").ngroup() + 1
+    df["Date"] = (
+        pd.to_datetime(df["Date"] + " " + workout_time)
+        - timedelta(hours=timezone_offset)
+    ).dt.strftime("%Y-%m-%d %H:%M:%S")
+    df["Workout Name"] = "Workout"
+    df["Duration (sec)"] = 3600
+    df["Exercise Name"] = df["Exercise"].map(mappings).fillna(df["Exercise"])
+    df = df.sort_values(["Date", "exercise_order", "first_appearance"])
+    df["Set Order"] = df.groupby(["Date", "Exercise Name"]).cumcount() + 1
+    df["Weight (kg)"] = df["Weight"].apply(
+        lambda x: str(x) if pd.notna(x) and x != "" else ""
+    )
+
+    def convert_reps(row):
+        if pd.notna(row["Reps"]) and row["Reps"] != "":
+            return int(row["Reps"])
+        if row["Exercise Name"] in TIME_TO_REPS_EXERCISES:
+            secs = parse_time_to_seconds(row.get("Time", ""))
+            if secs > 0:
+                return max(1, secs // 10)
+        return ""
+
+    df["Reps"] = df.apply(convert_reps, axis=1).astype(object)
+
+    def convert_distance(row):
+        if pd.notna(row["Distance"]) and row["Distance"] != 0:
+            return str(int(row["Distance"]))
+        if row["Exercise Name"] in TIME_TO_DISTANCE_EXERCISES:
+            secs = parse_time_to_seconds(row.get("Time", ""))
+            if secs > 0:
+                return str(secs)
+        return ""
+
+    df["Distance (meters)"] = df.apply(convert_distance, axis=1)
+
+    def convert_seconds(row):
+        if row["Exercise Name"] in REPS_TO_TIME_EXERCISES and row["Reps"] != "":
+            return str(float(row["Reps"]))
+        if row["Exercise Name"] in TIME_TO_REPS_EXERCISES and row["Reps"] != "":
+            return ""
+        if (
+            row["Exercise Name"] in TIME_TO_DISTANCE_EXERCISES
+            and row["Distance (meters)"] != ""
+        ):
+            return ""
+        secs = parse_time_to_seconds(row.get("Time", ""))
+        return str(float(secs)) if secs > 0 else ""
+
+    df["Seconds"] = df.apply(convert_seconds, axis=1)
+    df.loc[df["Exercise Name"].isin(REPS_TO_TIME_EXERCISES), "Reps"] = ""
+
+    df["Notes"] = df["Comment"].fillna("")
+
+    def add_conversion_note(row):
+        note = str(row["Notes"]) if row["Notes"] else ""
+        if row["Exercise"] != row["Exercise Name"]:
+            if (
+                "backward" in row["Exercise"].lower()
+                and "walk" in row["Exercise"].lower()
+            ) or row["Exercise Name"] in ["Warm Up", "Stretching"]:
+                return f"{row['Exercise']}; {note}" if note else row["Exercise"]
+        return note
+
+    df["Notes"] = df.apply(add_conversion_note, axis=1)
+    df["Workout Notes"] = "Imported from FitNotes"
+    df["RPE"] = ""
+    return df[
+        [
+            "Workout #",
+            "Date",
+            "Workout Name",
+            "Duration (sec)",
+            "Exercise Name",
+            "Set Order",
+            "Weight (kg)",
+            "Reps",
+            "RPE",
+            "Distance (meters)",
+            "Seconds",
+            "Notes",
+            "Workout Notes",
+        ]
+    ]
+
+
+def to_csv(df):
+    return df.to_csv(index=False, sep=";", quoting=1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize(
+    "timezone_offset, workout_time",
+    [(10, "07:00"), (0, "00:30:00"), (-5, "23:15"), (5.5, "18:30")],
+)
+def test_matches_rowwise_conversion(
+    seed, timezone_offset, workout_time, mappings, rules, exercises
+):
+    export = generate_export(seed, exercises)
+    expected = to_csv(
+        rowwise_convert(
+            pd.read_csv(io.StringIO(export)), mappings, timezone_offset, workout_time
+        )
+    )
+
+    for df in (
+        pd.read_csv(io.StringIO(export)),
+        read_fitnotes_csv(io.StringIO(export)),
+    ):
+        output_df = convert_fitnotes_to_hevy(
+            df, mappings, timezone_offset, workout_time, rules=rules
+        )
+        assert to_csv(output_df) == expected
+
+    typed_df = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(io.StringIO(export)),
+        mappings,
+        timezone_offset,
+        workout_time,
+        rules=rules,
+        typed=True,
+    )
+    assert write_hevy_csv(typed_df) == expected
+
+
+def test_input_is_not_modified(mappings, rules, exercises):
+    df = pd.read_csv(io.StringIO(generate_export(0, exercises)))
+    original = df.copy()
+    convert_fitnotes_to_hevy(df, mappings, rules=rules)
+    pd.testing.assert_frame_equal(df, original)
@@ -0,0 +1,109 @@
+"""Incremental conversion of repeated exports."""
+
+import pytest
+
+from fitnotes2hevy.converter import read_fitnotes_csv
+from fitnotes2hevy.incremental import (
+    load_state,
+    save_state,
+    select_changed_workouts,
+    settings_fingerprint,
+)
+
+
+@pytest.fixture
+def df(export_file):
+    return read_fitnotes_csv(export_file)
+
+
+def converted_dates(df, state, fingerprint="settings"):
+    changed, _ = select_changed_workouts(df, state, fingerprint)
+    return list(changed["Date"].unique())
+
+
+def saved_state(tmp_path, df, fingerprint="settings"):
+    _, hashes = select_changed_workouts(df, load_state(tmp_path / "none"), fingerprint)
+    save_state(tmp_path / "state.json", fingerprint, hashes)
+    return load_state(tmp_path / "state.json")
+
+
+def test_unchanged_dates_are_skipped(tmp_path, df):
+    state = saved_state(tmp_path, df)
+
+    assert converted_dates(df, state) == []
+
+
+def test_new_and_edited_dates_are_converted(tmp_path, df):
+    dates = df["Date"].unique()
+    state = saved_state(tmp_path, df[df["Date"] != dates[-1]])
+    edited = df.copy()
+    edited.loc[edited["Date"] == dates[3], "Comment"] = "edited"
+
+    assert converted_dates(edited, state) == [dates[3], dates[-1]]
+
+
+def test_partially_cut_date_is_converted_again(tmp_path, df):
+    dates = df["Date"].unique()
+    state = saved_state(tmp_path, df)
+    # An export cut in the middle of a workout drops its last sets
+    last_set = df.index[df["Date"] == dates[5]][-1]
+
+    assert converted_dates(df.drop(last_set), state) == [dates[5]]
+
+
+def test_reordered_sets_are_converted_again(tmp_path, df):
+    dates = df["Date"].unique()
+    state = saved_state(tmp_path, df)
+    day = df.index[df["Date"] == dates[0]]
+    if len(day) < 2 or df.loc[day[0]].equals(df.loc[day[-1]]):
+        pytest.skip("the first workout has no distinct sets to swap")
+    swapped = df.copy()
+    swapped.loc[[day[0], day[-1]]] = df.loc[[day[-1], day[0]]].to_numpy()
+
+    assert converted_dates(swapped, state) == [dates[0]]
+
+
+def test_changed_settings_convert_everything(tmp_path, df):
+    state = saved_state(tmp_path, df)
+
+    assert len(converted_dates(df, state, "other")) == df["Date"].nunique()
+
+
+def test_fingerprint_covers_mappings_and_settings(mappings):
+    fingerprint = settings_fingerprint(mappings, timezone_offset=10)
+
+    assert fingerprint == settings_fingerprint(dict(mappings), timezone_offset=10)
+    assert fingerprint != settings_fingerprint(mappings, timezone_offset=9)
+    assert fingerprint != settings_fingerprint(
+        {**mappings, "Row": "Rowing"}, timezone_offset=10
+    )
+
+
+@pytest.mark.parametrize("contents", [None, "", '{"version": 1, "work', "[1, 2]"])
+def test_missing_or_corrupt_state_converts_everything(tmp_path, df, contents):
+    path = tmp_path / "state.json"
+    if contents is not None:
+        path.write_text(contents, encoding="utf-8")
+
+    state = load_state(path)
+
+    assert state == {"version": 1, "settings": None, "workouts": {}}
+    assert len(converted_dates(df, state)) == df["Date"].nunique()
+
+
+def test_incremental_option(tmp_path, export_file, run_cli):
+    state_file = tmp_path / "state.json"
+    state_file.write_text("{not json", encoding="utf-8")
+    args = ["--input-file", export_file, "--incremental", "--state-file", state_file]
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+
+    result = run_cli(*args, "--output-file", first)
+    assert result.exit_code == 0, result.output
+    assert "ignoring unreadable state file" in result.output
+    assert first.exists()
+
+    result = run_cli(*args, "--output-file", second)
+    assert result.exit_code == 0, result.output
+    assert "No new or changed workouts" in result.output
+    assert not second.exists()
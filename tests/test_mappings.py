@@ -0,0 +1,111 @@
+"""Loading exercise mappings through the compiled cache."""
+
+import json
+import marshal
+import os
+
+import pytest
+
+from fitnotes2hevy import mappings as mappings_module
+from fitnotes2hevy.mappings import CACHE_FILENAME, load_exercise_mappings
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_json(tmp_path / "default.json", {"Squat": "Squat (Barbell)"})
+    write_json(tmp_path / "extra.json", {"Row": "Rowing Machine"})
+    write_json(
+        tmp_path / "custom.json", {"_comment": "ignored", "Squat": "Front Squat"}
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count how often the mapping JSON files are parsed."""
+    calls = []
+    parse = mappings_module._parse_mappings
+    monkeypatch.setattr(
+        mappings_module,
+        "_parse_mappings",
+        lambda data_path: calls.append(data_path) or parse(data_path),
+    )
+    return calls
+
+
+EXPECTED = {"Squat": "Front Squat", "Row": "Rowing Machine"}
+
+
+def test_cache_is_reused_while_files_are_unchanged(data_dir, parses):
+    assert load_exercise_mappings(data_dir) == EXPECTED
+    assert (data_dir / CACHE_FILENAME).exists()
+
+    assert load_exercise_mappings(data_dir) == EXPECTED
+    assert len(parses) == 1
+
+
+def test_edited_file_invalidates_the_cache(data_dir, parses):
+    load_exercise_mappings(data_dir)
+    write_json(data_dir / "extra.json", {"Row": "Seated Row (Machine)"})
+
+    assert load_exercise_mappings(data_dir)["Row"] == "Seated Row (Machine)"
+    assert len(parses) == 2
+
+
+def test_same_size_edit_with_new_mtime_invalidates_the_cache(data_dir):
+    load_exercise_mappings(data_dir)
+    path = data_dir / "extra.json"
+    write_json(path, {"Row": "Rowing Machinf"})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_exercise_mappings(data_dir)["Row"] == "Rowing Machinf"
+
+
+def test_touched_file_reuses_cached_mappings(data_dir, parses):
+    load_exercise_mappings(data_dir)
+    path = data_dir / "default.json"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_exercise_mappings(data_dir) == EXPECTED
+    # Content hashes match, so nothing is parsed again
+    assert len(parses) == 1
+
+
+def test_removed_file_invalidates_the_cache(data_dir):
+    load_exercise_mappings(data_dir)
+    (data_dir / "custom.json").unlink()
+
+    assert load_exercise_mappings(data_dir) == {
+        "Squat": "Squat (Barbell)",
+        "Row": "Rowing Machine",
+    }
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [b"", b"\x00garbage", b"\xfb\x01\x02", marshal.dumps([1, 2]), marshal.dumps({})],
+)
+def test_corrupt_cache_is_rebuilt(data_dir, parses, contents):
+    load_exercise_mappings(data_dir)
+    cache_path = data_dir / CACHE_FILENAME
+    cache_path.write_bytes(contents)
+
+    assert load_exercise_mappings(data_dir) == EXPECTED
+    assert cache_path.read_bytes() != contents
+    assert load_exercise_mappings(data_dir) == EXPECTED
+    assert len(parses) == 2
+
+
+def test_cache_can_be_bypassed_or_refreshed(data_dir, parses):
+    assert load_exercise_mappings(data_dir, use_cache=False) == EXPECTED
+    assert not (data_dir / CACHE_FILENAME).exists()
+
+    load_exercise_mappings(data_dir)
+    load_exercise_mappings(data_dir, refresh=True)
+    assert len(parses) == 3
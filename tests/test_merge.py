@@ -0,0 +1,136 @@
+"""Merging overlapping FitNotes exports."""
+
+import pandas as pd
+import pytest
+from conftest import generate_export
+
+from fitnotes2hevy.converter import read_fitnotes_csv
+from fitnotes2hevy.merge import merge_fitnotes_exports, set_keys
+
+
+@pytest.fixture
+def history(exercises):
+    """A full export as text lines, header first."""
+    return generate_export(3, exercises, workouts=12).splitlines(keepends=True)
+
+
+def write_slice(path, history, rows):
+    path.write_text(history[0] + "".join(history[1:][rows]), encoding="utf-8")
+    return path
+
+
+def day_starts(history):
+    """Row positions where each workout date starts."""
+    dates = [line.split(",", 1)[0] for line in history[1:]]
+    return [i for i, date in enumerate(dates) if i == 0 or date != dates[i - 1]]
+
+
+def merged_output(tmp_path, run_cli, *files):
+    output = tmp_path / "merged.csv"
+    result = run_cli("merge", *files, "-o", output)
+    assert result.exit_code == 0, result.output
+    return output.read_bytes()
+
+
+def single_output(tmp_path, run_cli, export):
+    output = tmp_path / "single.csv"
+    result = run_cli("--input-file", export, "--output-file", output)
+    assert result.exit_code == 0, result.output
+    return output.read_bytes()
+
+
+def test_date_aligned_overlap_matches_single_conversion(tmp_path, history, run_cli):
+    starts = day_starts(history)
+    full = write_slice(tmp_path / "full.csv", history, slice(None))
+    older = write_slice(tmp_path / "older.csv", history, slice(None, starts[8]))
+    newer = write_slice(tmp_path / "newer.csv", history, slice(starts[4], None))
+
+    expected = single_output(tmp_path, run_cli, full)
+
+    assert merged_output(tmp_path, run_cli, older, newer) == expected
+    assert merged_output(tmp_path, run_cli, newer, older) == expected
+
+
+def test_duplicates_are_counted_per_file(tmp_path, history):
+    starts = day_starts(history)
+    older = write_slice(tmp_path / "older.csv", history, slice(None, starts[8]))
+    newer = write_slice(tmp_path / "newer.csv", history, slice(starts[4], None))
+
+    df, entries = merge_fitnotes_exports([older, newer])
+
+    overlap = starts[8] - starts[4]
+    assert [entry["duplicates"] for entry in entries] == [0, overlap]
+    assert len(df) == len(history) - 1
+
+
+def test_earlier_export_cut_mid_day(tmp_path, history, run_cli):
+    # The older export was taken during a workout, so it ends mid-day
+    starts = day_starts(history)
+    cut = starts[6] + 1
+    full = write_slice(tmp_path / "full.csv", history, slice(None))
+    older = write_slice(tmp_path / "older.csv", history, slice(None, cut))
+    newer = write_slice(tmp_path / "newer.csv", history, slice(starts[3], None))
+
+    assert merged_output(tmp_path, run_cli, older, newer) == single_output(
+        tmp_path, run_cli, full
+    )
+
+
+@pytest.mark.xfail(
+    strict=True,
+    reason="Positions are counted from the start of each file's day, so a "
+    "slice that starts mid-day is not aligned with the sets already seen",
+)
+def test_later_slice_starting_mid_day(tmp_path, history):
+    starts = day_starts(history)
+    older = write_slice(tmp_path / "older.csv", history, slice(None, starts[6] + 3))
+    newer = write_slice(tmp_path / "newer.csv", history, slice(starts[6] + 1, None))
+
+    df, _ = merge_fitnotes_exports([older, newer])
+
+    assert len(df) == len(history) - 1
+
+
+def test_differently_written_values_match(tmp_path):
+    header = (
+        "Date,Exercise,Category,Weight,Weight Unit,Reps,Distance,Distance Unit,Time"
+    )
+    first = tmp_path / "first.csv"
+    first.write_text(
+        f"{header}\n2023-01-02,Plank,Core,,,,,,1:30\n"
+        "2023-01-02,Barbell Squat,Legs,100,kgs,5,,,\n",
+        encoding="utf-8",
+    )
+    second = tmp_path / "second.csv"
+    second.write_text(
+        f"{header},Comment\n2023-01-02, plank ,Core,,,,,,0:01:30,\n"
+        "2023-01-02,Barbell Squat,Legs,100.0,kgs,5,0,,,\n",
+        encoding="utf-8",
+    )
+
+    df, entries = merge_fitnotes_exports([first, second])
+
+    assert [entry["duplicates"] for entry in entries] == [0, 2]
+    assert len(df) == 2
+
+
+def test_repeated_identical_sets_stay_distinct(tmp_path, history):
+    full = write_slice(tmp_path / "full.csv", history, slice(None))
+    df = read_fitnotes_csv(full)
+    repeated = pd.concat([df.iloc[:1]] * 3, ignore_index=True)
+
+    assert len(set(set_keys(repeated).tolist())) == 3
+    merged, entries = merge_fitnotes_exports([full, full])
+    assert len(merged) == len(df)
+    assert entries[1]["duplicates"] == len(df)
+
+
+def test_invalid_file_is_a_usage_error(tmp_path, history, run_cli):
+    full = write_slice(tmp_path / "full.csv", history, slice(None))
+    bad = tmp_path / "bad.csv"
+    bad.write_text("Name,Value\nfoo,1\n", encoding="utf-8")
+
+    result = run_cli("merge", full, bad, "-o", tmp_path / "merged.csv")
+
+    assert result.exit_code == 2
+    assert "bad.csv" in result.output
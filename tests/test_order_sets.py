@@ -0,0 +1,116 @@
+"""Unit tests for order_sets."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fitnotes2hevy.converter import order_sets
+
+
+def run(date_codes, date_ranks, exercise_codes, name_codes=None):
+    """Call order_sets on lists, naming each exercise after itself by default."""
+    if name_codes is None:
+        name_codes = exercise_codes
+    order, set_order = order_sets(
+        np.array(date_codes),
+        np.array(date_ranks),
+        np.array(exercise_codes),
+        np.array(name_codes),
+    )
+    return order.tolist(), [None if pd.isna(n) else n for n in set_order]
+
+
+def test_exercises_in_order_of_first_set():
+    # A B A C B within one workout
+    order, set_order = run([0, 0, 0, 0, 0], [0], [0, 1, 0, 2, 1])
+
+    assert order == [0, 2, 1, 4, 3]
+    assert set_order == [1, 2, 1, 2, 1]
+
+
+def test_sets_keep_their_order_within_an_exercise():
+    order, _ = run([0] * 6, [0], [3, 3, 3, 1, 3, 1])
+
+    assert order == [0, 1, 2, 4, 3, 5]
+
+
+def test_workouts_follow_timestamp_rank_not_date_code():
+    # Date code 0 has the later timestamp
+    order, set_order = run([0, 1, 0, 1], [1, 0], [0, 0, 0, 0])
+
+    assert order == [1, 3, 0, 2]
+    assert set_order == [1, 2, 1, 2]
+
+
+def test_missing_dates_go_last_without_set_order():
+    order, set_order = run([-1, 0, -1, 1, 0], [0, 1], [0, 0, 1, 0, 1])
+
+    assert order == [1, 4, 3, 0, 2]
+    assert set_order == [1, 1, 1, None, None]
+
+
+def test_missing_exercises_go_last_within_their_workout():
+    order, set_order = run([0, 0, 0, 1, 1], [0, 1], [-1, 0, 0, 0, -1])
+
+    assert order == [1, 2, 0, 3, 4]
+    assert set_order == [1, 2, None, 1, None]
+
+
+def test_equal_timestamps_form_one_ordering_group():
+    # Two dates share a timestamp rank: each (date, exercise) pair is placed
+    # by its first set, and sets of a Hevy name are numbered across both
+    order, set_order = run([0, 1, 0, 1], [0, 0], [0, 1, 1, 0])
+
+    assert order == [0, 1, 2, 3]
+    assert set_order == [1, 1, 2, 2]
+
+
+def test_set_order_counts_per_hevy_name():
+    # Two FitNotes exercises mapped to the same Hevy exercise
+    order, set_order = run([0, 0, 0, 0], [0], [0, 1, 0, 1], name_codes=[5, 5, 5, 5])
+
+    assert order == [0, 2, 1, 3]
+    assert set_order == [1, 2, 3, 4]
+
+
+def multikey_sort(date_codes, date_ranks, exercise_codes, name_codes):
+    """The previous groupby and sort_values ordering.
+
+    Exercises were grouped by the date as written and sorted by the
+    formatted workout timestamp, which the rank stands in for.
+    """
+    df = pd.DataFrame(
+        {
+            "Date": date_codes,
+            "Exercise": exercise_codes,
+            "Exercise Name": name_codes,
+        }
+    )
+    df["first_appearance"] = df.groupby(["Date", "Exercise"]).cumcount()
+    df["exercise_order"] = df.groupby(["Date", "Exercise"])[
+        "first_appearance"
+    ].transform("idxmin")
+    df["Timestamp"] = date_ranks[date_codes]
+    df = df.sort_values(["Timestamp", "exercise_order", "first_appearance"])
+    set_order = df.groupby(["Timestamp", "Exercise Name"]).cumcount() + 1
+    return df.index.to_numpy(), set_order.to_numpy()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_multikey_sort(seed):
+    rng = np.random.default_rng(seed)
+    sets = int(rng.integers(1, 300))
+    dates = int(rng.integers(1, 20))
+    # Shuffled ranks with ties, as from workout timestamps
+    date_ranks = rng.integers(0, dates, size=dates)
+    date_codes = rng.integers(0, dates, size=sets)
+    exercise_codes = rng.integers(0, 8, size=sets)
+    name_codes = rng.integers(0, 4, size=8)[exercise_codes]
+
+    order, set_order = order_sets(date_codes, date_ranks, exercise_codes, name_codes)
+    expected_order, expected_set_order = multikey_sort(
+        date_codes, date_ranks, exercise_codes, name_codes
+    )
+
+    np.testing.assert_array_equal(order, expected_order)
+    np.testing.assert_array_equal(set_order.to_numpy(), expected_set_order)
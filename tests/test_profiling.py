@@ -0,0 +1,59 @@
+"""Per-stage profiling of conversions."""
+
+import json
+import tracemalloc
+
+from fitnotes2hevy.converter import convert_fitnotes_to_hevy, read_fitnotes_csv
+from fitnotes2hevy.profiling import StageProfiler
+
+
+def test_times_stages_without_tracing_memory(export_file, mappings, rules):
+    with StageProfiler() as profiler:
+        convert_fitnotes_to_hevy(
+            read_fitnotes_csv(export_file), mappings, rules=rules, profiler=profiler
+        )
+        assert not tracemalloc.is_tracing()
+
+    records = profiler.records()
+    assert records
+    for record in records:
+        assert set(record) == {"name", "calls", "seconds", "rows"}
+    assert "Peak (MB)" not in profiler.report()
+
+
+def test_traces_memory_when_asked():
+    with StageProfiler(trace_memory=True) as profiler:
+        with profiler.stage("allocate", rows=3) as run:
+            data = bytearray(2**20)
+            run.rows = 4
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    (record,) = profiler.records()
+    assert record["rows"] == 4
+    assert record["peak_memory_bytes"] >= len(data)
+    assert "Peak (MB)" in profiler.report()
+
+
+def test_repeated_stages_are_aggregated():
+    profiler = StageProfiler()
+    for rows in (2, 3):
+        with profiler.stage("chunk", rows):
+            pass
+
+    (record,) = json.loads(profiler.to_json())["stages"]
+    assert record["calls"] == 2
+    assert record["rows"] == 5
+
+
+def test_profile_options(tmp_path, export_file, run_cli):
+    args = ["--input-file", export_file, "--output-file", tmp_path / "hevy.csv"]
+
+    timed = run_cli(*args, "--profile")
+    traced = run_cli(*args, "--profile-memory")
+
+    assert timed.exit_code == 0, timed.output
+    assert "Time (s)" in timed.output
+    assert "Peak (MB)" not in timed.output
+    assert traced.exit_code == 0, traced.output
+    assert "Peak (MB)" in traced.output
@@ -0,0 +1,67 @@
+"""Loading the exercise conversion rules."""
+
+import shutil
+
+import pytest
+from conftest import MAPPINGS_DIR
+
+from fitnotes2hevy import config
+from fitnotes2hevy.rules import load_conversion_rules
+
+# The exercise lists config.py defined before the rules moved to rules.json
+BASELINE_LISTS = {
+    "TIME_TO_REPS_EXERCISES": [
+        "Bird Dog",
+        "Dead Bug",
+        "Deadbug",
+        "Flutter Kicks",
+        "Flutter Kick",
+    ],
+    "TIME_TO_DISTANCE_EXERCISES": [
+        "Farmers Walk",
+        "Farmer Walk",
+        "Farmer's Walk",
+        "Farmer's Carry",
+    ],
+    "REPS_TO_TIME_EXERCISES": ["Warm Up"],
+}
+
+
+def test_default_rules_do_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    rules = load_conversion_rules()
+
+    assert rules.definitions == load_conversion_rules(MAPPINGS_DIR).definitions
+    assert rules.match("Farmer's Walk", "Farmers Walk").seconds_to_distance
+
+
+def test_missing_rules_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError, match="rules.json"):
+        load_conversion_rules(tmp_path)
+
+
+def test_custom_rules_are_optional_and_appended(tmp_path):
+    shutil.copy(MAPPINGS_DIR / "rules.json", tmp_path)
+    rules = load_conversion_rules(tmp_path)
+    (tmp_path / "custom_rules.json").write_text(
+        '{"rules": [{"match": {"hevy": ["Plank"]}, "transform": "reps_to_seconds"}]}'
+    )
+
+    custom_rules = load_conversion_rules(tmp_path)
+
+    assert custom_rules.definitions[:-1] == rules.definitions
+    assert custom_rules.match("Plank", "Plank").reps_to_seconds
+
+
+def test_invalid_rule_names_the_file(tmp_path):
+    (tmp_path / "rules.json").write_text('{"rules": [{"match": {"hevy": []}}]}')
+
+    with pytest.raises(ValueError, match="rules.json: Invalid conversion rule 1"):
+        load_conversion_rules(tmp_path)
+
+
+@pytest.mark.parametrize("name", BASELINE_LISTS)
+def test_deprecated_config_lists(name):
+    with pytest.deprecated_call():
+        assert getattr(config, name) == BASELINE_LISTS[name]
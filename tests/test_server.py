@@ -0,0 +1,167 @@
+"""The HTTP conversion service, driven with a local client."""
+
+import http.client
+import json
+import os
+import threading
+
+import pytest
+from conftest import MAPPINGS_DIR
+
+from fitnotes2hevy.mappings import load_exercise_mappings
+from fitnotes2hevy.server import ConversionServer, RequestError
+
+
+@pytest.fixture
+def start_server(rules):
+    """Start ConversionServers on free ports, shutting them down afterwards."""
+    servers = []
+
+    def start(mappings=None, **options):
+        if mappings is None:
+            mappings = load_exercise_mappings(MAPPINGS_DIR, use_cache=False)
+        server = ConversionServer(
+            ("127.0.0.1", 0),
+            mappings,
+            rules=rules,
+            **{"workers": 1, **options},
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def post(server, path, body=None, headers=None):
+    """POST to the server and return (status, headers, body)."""
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request("POST", path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response, response.read()
+    finally:
+        connection.close()
+
+
+def test_convert_matches_cli(tmp_path, export_file, start_server, run_cli):
+    output = tmp_path / "hevy.csv"
+    result = run_cli(
+        "--input-file",
+        export_file,
+        "--output-file",
+        output,
+        "--timezone",
+        "5",
+        "--time",
+        "18:30",
+    )
+    assert result.exit_code == 0, result.output
+    server = start_server()
+
+    status, response, body = post(
+        server, "/convert?timezone=5&time=18:30", export_file.read_bytes()
+    )
+
+    assert status == 200
+    assert body == output.read_bytes()
+    assert response.getheader("Content-Length") == str(len(body))
+    assert int(response.getheader("X-Hevy-Sets")) == body.count(b"\n") - 1
+
+
+def test_preview_mappings(export_file, start_server, mappings, monkeypatch):
+    # Workers read the Hevy exercise list relative to the working directory
+    monkeypatch.chdir(MAPPINGS_DIR.parent.parent)
+    server = start_server(mappings)
+
+    status, _, body = post(server, "/preview-mappings", export_file.read_bytes())
+
+    assert status == 200
+    preview = json.loads(body)
+    unmapped = [e["fitnotes"] for e in preview["exercises"] if not e["mapped"]]
+    assert unmapped == ["Mystery Lift"]
+    assert preview["unmapped"] == 1
+    for exercise in preview["exercises"]:
+        if exercise["mapped"]:
+            assert exercise["hevy"] == mappings[exercise["fitnotes"]]
+            assert exercise["suggestions"] == []
+        else:
+            assert exercise["suggestions"]
+
+
+def test_busy_server_answers_429_without_reading_the_upload(start_server):
+    server = start_server(workers=1, queue_size=0)
+
+    with server.slot():
+        # Only the headers are sent; the server must answer without the body
+        status, response, body = post(
+            server, "/convert", headers={"Content-Length": str(10**9)}
+        )
+
+    assert status == 429
+    assert response.getheader("Retry-After") == "1"
+    assert json.loads(body) == {"error": "Server is busy, try again shortly"}
+
+
+def test_upload_over_the_limit_answers_413(start_server):
+    server = start_server(max_upload_bytes=1024)
+
+    status, _, body = post(server, "/convert", headers={"Content-Length": "1025"})
+
+    assert status == 413
+    assert "limit" in json.loads(body)["error"]
+
+
+def test_upload_without_length_answers_411(start_server):
+    server = start_server()
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    connection.putrequest("POST", "/convert")
+    connection.endheaders()
+
+    response = connection.getresponse()
+
+    assert response.status == 411
+    connection.close()
+
+
+@pytest.mark.parametrize(
+    "query", ["tz=Mars/Olympus_Mons", "timezone=ten", "colour=blue", "tz=UTC&tz=UTC"]
+)
+def test_bad_settings_answer_400(export_file, start_server, query):
+    server = start_server()
+
+    status, _, body = post(server, f"/convert?{query}", export_file.read_bytes())
+
+    assert status == 400
+    assert json.loads(body)["error"]
+
+
+def test_garbage_upload_answers_400(start_server):
+    server = start_server()
+
+    status, _, body = post(server, "/convert", b"not,a\nfitnotes,export\n")
+
+    assert status == 400
+    assert json.loads(body)["error"]
+
+
+def test_unknown_path_answers_404(start_server):
+    status, _, _ = post(start_server(), "/upload", b"")
+
+    assert status == 404
+
+
+def test_worker_crash_answers_503_and_replaces_the_pool(export_file, start_server):
+    server = start_server()
+    broken_pool = server.pool
+
+    with server.slot(), pytest.raises(RequestError) as error:
+        server.run(os._exit, 1)
+
+    assert error.value.status == 503
+    assert server.pool is not broken_pool
+    status, _, _ = post(server, "/convert", export_file.read_bytes())
+    assert status == 200
@@ -0,0 +1,166 @@
+"""Splitting the Hevy CSV into several files between workouts."""
+
+import csv
+import io
+import zipfile
+
+import pytest
+
+from fitnotes2hevy.converter import (
+    HevyShardWriter,
+    convert_fitnotes_chunks,
+    convert_fitnotes_to_hevy,
+    open_hevy_csv_shards,
+    read_fitnotes_csv,
+    shard_name,
+    write_hevy_csv,
+)
+
+
+@pytest.fixture
+def output_df(export_file, mappings, rules):
+    return convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file), mappings, rules=rules, typed=True
+    )
+
+
+def workouts(text):
+    """Workout numbers of the rows of a Hevy CSV, in order."""
+    rows = list(csv.reader(io.StringIO(text), delimiter=";"))
+    return [row[0] for row in rows[1:]]
+
+
+def split(output_df, tmp_path, chunk_rows=7, **limits):
+    """Split a typed Hevy frame into files and return their texts."""
+    with open_hevy_csv_shards(tmp_path / "hevy.csv") as open_shard:
+        with HevyShardWriter(open_shard, chunk_rows=chunk_rows, **limits) as writer:
+            writer.write(output_df)
+    return [
+        (tmp_path / shard_name("hevy.csv", number)).read_text(encoding="utf-8")
+        for number in range(1, writer.shards + 1)
+    ]
+
+
+def check_shards(shards, output_df):
+    """Check that shards are whole workouts which together give the output."""
+    header, *_ = write_hevy_csv(output_df).splitlines(keepends=True)
+    assert all(shard.startswith(header) for shard in shards)
+    assert header + "".join(shard[len(header) :] for shard in shards) == (
+        write_hevy_csv(output_df)
+    )
+    seen = set()
+    for shard in shards:
+        shard_workouts = set(workouts(shard))
+        assert not shard_workouts & seen
+        seen |= shard_workouts
+
+
+@pytest.mark.parametrize("max_bytes", [1500, 4000, 20000])
+@pytest.mark.parametrize("chunk_rows", [1, 7, 10_000])
+def test_max_bytes(tmp_path, output_df, max_bytes, chunk_rows):
+    shards = split(output_df, tmp_path, chunk_rows, max_bytes=max_bytes)
+
+    check_shards(shards, output_df)
+    assert len(shards) > 1 or max_bytes == 20000
+    for shard in shards:
+        # Only a single workout may exceed the limit
+        assert len(shard.encode("utf-8")) <= max_bytes or len(set(workouts(shard))) == 1
+
+
+@pytest.mark.parametrize("max_workouts", [1, 3, 100])
+def test_max_workouts(tmp_path, output_df, max_workouts):
+    shards = split(output_df, tmp_path, max_workouts=max_workouts)
+
+    check_shards(shards, output_df)
+    total = output_df["Workout #"].nunique()
+    assert len(shards) == -(-total // max_workouts)
+    assert all(len(set(workouts(shard))) <= max_workouts for shard in shards)
+
+
+def test_oversized_workout_gets_its_own_file(tmp_path, output_df):
+    shards = split(output_df, tmp_path, max_bytes=1)
+
+    check_shards(shards, output_df)
+    assert len(shards) == output_df["Workout #"].nunique()
+
+
+def test_both_limits(tmp_path, output_df):
+    shards = split(output_df, tmp_path, max_workouts=4, max_bytes=3000)
+
+    check_shards(shards, output_df)
+    for shard in shards:
+        assert len(set(workouts(shard))) <= 4
+
+
+def test_chunked_writes_continue_the_same_files(
+    tmp_path, export_file, output_df, mappings, rules
+):
+    with open_hevy_csv_shards(tmp_path / "hevy.csv") as open_shard:
+        with HevyShardWriter(open_shard, max_bytes=2500, chunk_rows=5) as writer:
+            for chunk in convert_fitnotes_chunks(
+                read_fitnotes_csv(export_file, chunksize=9),
+                mappings,
+                rules=rules,
+                typed=True,
+            ):
+                writer.write(chunk)
+    (tmp_path / "whole").mkdir()
+    expected = split(output_df, tmp_path / "whole", max_bytes=2500)
+
+    shards = [
+        (tmp_path / shard_name("hevy.csv", number)).read_text(encoding="utf-8")
+        for number in range(1, writer.shards + 1)
+    ]
+    assert shards == expected
+
+
+def test_zipped_shards(tmp_path, output_df):
+    archive_path = tmp_path / "hevy.csv.zip"
+    with open_hevy_csv_shards(archive_path, "zip") as open_shard:
+        with HevyShardWriter(open_shard, max_workouts=5) as writer:
+            writer.write(output_df)
+
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+        shards = [archive.read(name).decode("utf-8") for name in names]
+    assert names == [shard_name("hevy.csv", n) for n in range(1, writer.shards + 1)]
+    check_shards(shards, output_df)
+
+
+def test_empty_output_writes_a_header_only_file(tmp_path, output_df):
+    shards = split(output_df.iloc[:0], tmp_path, max_workouts=1)
+
+    assert shards == [write_hevy_csv(output_df.iloc[:0])]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("hevy.csv", "hevy_002.csv"),
+        ("hevy.csv.gz", "hevy_002.csv.gz"),
+        ("hevy.v1.csv", "hevy.v1_002.csv"),
+        ("hevy", "hevy_002"),
+    ],
+)
+def test_shard_name(name, expected):
+    assert shard_name(name, 2) == expected
+
+
+def test_split_options(tmp_path, export_file, run_cli):
+    result = run_cli(
+        "--input-file",
+        export_file,
+        "--output-file",
+        tmp_path / "hevy.csv",
+        "--max-bytes-per-file",
+        "3000",
+    )
+    whole = tmp_path / "whole.csv"
+    run_cli("--input-file", export_file, "--output-file", whole)
+
+    assert result.exit_code == 0, result.output
+    shards = sorted(tmp_path.glob("hevy_*.csv"))
+    assert len(shards) > 1
+    header = whole.read_text(encoding="utf-8").splitlines(keepends=True)[0]
+    body = "".join(shard.read_text(encoding="utf-8")[len(header) :] for shard in shards)
+    assert header + body == whole.read_text(encoding="utf-8")
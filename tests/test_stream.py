@@ -0,0 +1,114 @@
+"""Parity of the pandas-free stream engine with the pandas engine."""
+
+import csv
+import random
+
+import pytest
+
+from fitnotes2hevy.converter import convert_fitnotes_to_hevy, read_fitnotes_csv
+from fitnotes2hevy.stream import convert_fitnotes_csv_stream
+
+FITNOTES_COLUMNS = [
+    "Date",
+    "Exercise",
+    "Category",
+    "Weight",
+    "Weight Unit",
+    "Reps",
+    "Distance",
+    "Distance Unit",
+    "Time",
+    "Comment",
+]
+
+# Dates around the 2023 daylight saving changes of America/New_York and
+# Australia/Sydney, where workout times can be ambiguous or skipped
+DATES = [
+    "2023-03-11",
+    "2023-03-12",
+    "2023-04-01",
+    "2023-04-02",
+    "2023-10-01",
+    "2023-10-02",
+    "2023-11-05",
+    "2023-11-06",
+]
+
+# Spellings of a missing value
+MISSING = ["", "NA", "nan"]
+
+
+def write_export(path, seed, exercises):
+    """Write a FitNotes CSV export with missing dates and NA-like strings."""
+    rng = random.Random(seed)
+    rows = []
+    for day in DATES + rng.sample(MISSING, 2):
+        for exercise in rng.choices(exercises + MISSING, k=rng.randint(1, 6)):
+            for _ in range(rng.randint(1, 4)):
+                rows.append(
+                    [
+                        day,
+                        exercise,
+                        "Category",
+                        rng.choice(MISSING + ["0", "20", "62.5", "100"]),
+                        "kgs",
+                        rng.choice(MISSING + ["1", "5", "12"]),
+                        rng.choice(MISSING + ["0", "400"]),
+                        "m",
+                        rng.choice(MISSING + ["0:00:45", "1:30", "90", "1:00:00"]),
+                        rng.choice(MISSING + ["felt good", "left; right"]),
+                    ]
+                )
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FITNOTES_COLUMNS)
+        writer.writerows(rows)
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "timezone_offset, workout_time, timezone",
+    [
+        (10, "07:00", None),
+        (5.5, "18:30", None),
+        (0, "01:30:00", "America/New_York"),
+        (0, "02:30", "America/New_York"),
+        (0, "02:30", "Australia/Sydney"),
+    ],
+)
+def test_matches_pandas_engine(
+    tmp_path, seed, timezone_offset, workout_time, timezone, mappings, rules, exercises
+):
+    export = tmp_path / "export.csv"
+    write_export(export, seed, exercises)
+    settings = {
+        "timezone_offset": timezone_offset,
+        "workout_time": workout_time,
+        "timezone": timezone,
+        "rules": rules,
+    }
+
+    pandas_output = tmp_path / "pandas.csv"
+    convert_fitnotes_to_hevy(read_fitnotes_csv(export), mappings, **settings).to_csv(
+        pandas_output, index=False, sep=";", quoting=1
+    )
+    stream_output = tmp_path / "stream.csv"
+    convert_fitnotes_csv_stream(export, stream_output, mappings, **settings)
+
+    assert stream_output.read_bytes() == pandas_output.read_bytes()
+
+
+def test_summary_counts(tmp_path, mappings, rules, exercises):
+    export = tmp_path / "export.csv"
+    write_export(export, 0, exercises)
+    output_df = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export), mappings, rules=rules, typed=True
+    )
+
+    summary = convert_fitnotes_csv_stream(
+        export, tmp_path / "stream.csv", mappings, rules=rules
+    )
+
+    assert summary["sets"] == len(output_df)
+    assert summary["workouts"] == output_df["Workout #"].nunique()
+    assert summary["exercises"] == output_df["Exercise Name"].nunique()
@@ -0,0 +1,71 @@
+"""Hevy name suggestions for unmapped exercises."""
+
+import json
+
+import pytest
+from conftest import ROOT
+
+from fitnotes2hevy.mappings import load_exercise_mappings
+from fitnotes2hevy.suggestions import SuggestionIndex, draft_custom_mappings
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SuggestionIndex.from_file(ROOT / "data" / "exercises" / "hevy.txt")
+
+
+def test_suggests_renamed_exercises(index):
+    for fitnotes, hevy in [
+        ("Barbell Squat", "Squat (Barbell)"),
+        ("Bird-dog", "Bird Dog"),
+        ("Flat Barbell Bench Press", "Bench Press (Barbell)"),
+    ]:
+        (best, score), *_ = index.suggest(fitnotes)
+        assert best == hevy
+        assert 0 < score <= 1
+
+
+def test_exact_name_scores_one(index):
+    assert index.suggest("Plank", k=1) == [("Plank", 1.0)]
+
+
+def test_draft_maps_strong_suggestions_only(index):
+    draft = draft_custom_mappings(index.suggest_many(["Barbell Squat", "Mystery Lift"]))
+
+    assert draft["Barbell Squat"] == "Squat (Barbell)"
+    assert len(draft["_alternatives"]["Barbell Squat"]) == 2
+    assert "Mystery Lift" not in draft
+    assert draft["_low_score"]["Mystery Lift"]
+
+
+def test_draft_skips_exercises_handled_by_rules(index, rules):
+    # Mapping "Farmer's Walk" to anything else would stop its time becoming
+    # distance
+    draft = draft_custom_mappings(
+        index.suggest_many(["Farmer's Walk", "Barbell Squat"]), rules
+    )
+
+    assert "Farmer's Walk" not in draft
+    assert draft["_handled_by_rules"] == ["Farmer's Walk"]
+    assert draft["Barbell Squat"] == "Squat (Barbell)"
+
+
+def test_suggest_mappings_option(tmp_path, index, run_cli, export_file):
+    draft_path = tmp_path / "custom.json"
+
+    result = run_cli(
+        "--input-file",
+        export_file,
+        "--output-file",
+        tmp_path / "hevy.csv",
+        "--suggest-mappings",
+        draft_path,
+    )
+
+    assert result.exit_code == 0, result.output
+    # The draft loads as custom mappings, without its underscore keys
+    mappings = load_exercise_mappings(tmp_path, use_cache=False)
+    draft = json.loads(draft_path.read_text(encoding="utf-8"))
+    assert mappings == {k: v for k, v in draft.items() if not k.startswith("_")}
+    assert "Mystery Lift" in draft["_low_score"]
+    assert set(mappings.values()) <= set(index.names)
@@ -0,0 +1,156 @@
+"""Conversion summary counts."""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from fitnotes2hevy import ConversionSummary, load_exercise_mappings
+from fitnotes2hevy.converter import (
+    convert_fitnotes_chunks,
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+)
+
+# Known sets: two mapped FitNotes names share a Hevy exercise, one exercise
+# is unmapped, and each conversion rule changes one set
+EXPORT = """\
+Date,Exercise,Category,Weight,Weight Unit,Reps,Distance,Distance Unit,Time,Comment
+2023-01-01,Farmer's Walk,Other,,,,,,0:01:00,
+2023-01-01,Warm-up,Cardio,,,300,,,,
+2023-01-01,Mystery Lift,Other,30.0,kgs,5,,,,
+2023-01-02,Barbell Squat,Legs,140.0,kgs,3,,,,
+2023-01-02,Barbell Squat,Legs,,kgs,3,,,,
+2023-01-03,Flat Barbell Bench Press,Chest,100.0,kgs,5,,,,
+2023-01-03,Flat Barbell Bench Press,Chest,100.0,kgs,5,,,,
+2023-01-03,Incline Barbell Bench Press,Chest,60.0,kgs,8,,,,
+2023-01-03,Bird-dog,Core,,,,,,0:00:45,
+2023-01-03,Mystery Lift,Other,20.0,kgs,10,,,,
+"""
+
+
+@pytest.fixture
+def export_df():
+    return read_fitnotes_csv(io.StringIO(EXPORT))
+
+
+def check_counts(summary):
+    assert summary.sets == 10
+    assert summary.workouts == 3
+    assert summary.exercises == 6
+    assert (summary.first_date, summary.last_date) == ("2023-01-01", "2023-01-03")
+    assert summary.exercise_sets == {
+        "Bench Press (Barbell)": 3,
+        "Bird Dog": 1,
+        "Mystery Lift": 2,
+        "Farmers Walk": 1,
+        "Warm Up": 1,
+        "Squat (Barbell)": 2,
+    }
+    assert summary.exercise_volume["Bench Press (Barbell)"] == pytest.approx(1480.0)
+    assert summary.exercise_volume["Mystery Lift"] == pytest.approx(350.0)
+    # A set without a weight adds no volume
+    assert summary.exercise_volume["Squat (Barbell)"] == pytest.approx(420.0)
+    assert summary.volume == pytest.approx(2250.0)
+    assert summary.rule_conversions == {
+        "time_to_reps": 1,
+        "time_to_distance": 1,
+        "reps_to_time": 1,
+    }
+    assert summary.unmapped == {"Mystery Lift": 2}
+
+
+def test_counts(export_df, mappings, rules):
+    summary = ConversionSummary()
+
+    convert_fitnotes_to_hevy(export_df, mappings, rules=rules, summary=summary)
+
+    check_counts(summary)
+
+
+def test_chunks_accumulate(mappings, rules):
+    summary = ConversionSummary()
+    chunks = read_fitnotes_csv(io.StringIO(EXPORT), chunksize=3)
+
+    pd.concat(convert_fitnotes_chunks(chunks, mappings, rules=rules, summary=summary))
+
+    check_counts(summary)
+
+
+def test_repeated_conversions_accumulate(export_df, mappings, rules):
+    summary = ConversionSummary()
+
+    for _ in range(2):
+        convert_fitnotes_to_hevy(export_df, mappings, rules=rules, summary=summary)
+
+    assert summary.sets == 20
+    assert summary.workouts == 6
+    assert summary.exercises == 6
+    assert summary.unmapped == {"Mystery Lift": 4}
+    assert summary.rule_conversions["time_to_reps"] == 2
+
+
+def test_to_dict(export_df, mappings, rules):
+    summary = ConversionSummary()
+    convert_fitnotes_to_hevy(export_df, mappings, rules=rules, summary=summary)
+
+    data = json.loads(summary.to_json())
+
+    assert data["sets"] == 10
+    assert data["volume_kg"] == 2250.0
+    assert data["per_exercise"][:3] == [
+        {"exercise": "Bench Press (Barbell)", "sets": 3, "volume_kg": 1480.0},
+        {"exercise": "Mystery Lift", "sets": 2, "volume_kg": 350.0},
+        {"exercise": "Squat (Barbell)", "sets": 2, "volume_kg": 420.0},
+    ]
+    assert [entry["exercise"] for entry in data["per_exercise"][3:]] == [
+        "Bird Dog",
+        "Farmers Walk",
+        "Warm Up",
+    ]
+    assert data["unmapped"] == [{"exercise": "Mystery Lift", "sets": 2}]
+
+
+def test_report(export_df, mappings, rules):
+    summary = ConversionSummary()
+    convert_fitnotes_to_hevy(export_df, mappings, rules=rules, summary=summary)
+
+    assert summary.report().splitlines() == [
+        "Total workouts: 3",
+        "Total exercises: 6",
+        "Total sets: 10",
+        "Date range: 2023-01-01 to 2023-01-03",
+        "Total volume: 2,250.0 kg",
+        "Rule conversions: 1 time to reps, 1 time to distance, 1 reps to time",
+    ]
+
+
+def test_empty_summary():
+    summary = ConversionSummary()
+
+    assert summary.to_dict()["first_date"] is None
+    assert "Date range" not in summary.report()
+    assert "Rule conversions" not in summary.report()
+
+
+def test_cli_report(tmp_path, run_cli):
+    export = tmp_path / "export.csv"
+    export.write_text(EXPORT, encoding="utf-8")
+    report = tmp_path / "report.json"
+
+    result = run_cli(
+        "--input-file",
+        export,
+        "--output-file",
+        tmp_path / "hevy.csv",
+        "--report",
+        report,
+    )
+
+    assert result.exit_code == 0, result.output
+    expected = ConversionSummary()
+    convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export), load_exercise_mappings(), summary=expected
+    )
+    assert json.loads(report.read_text(encoding="utf-8")) == expected.to_dict()
@@ -0,0 +1,113 @@
+"""Reading and writing FitNotes and Hevy data with pyarrow."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from fitnotes2hevy.converter import (
+    FITNOTES_DTYPES,
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+from fitnotes2hevy.mappings import load_exercise_mappings
+from fitnotes2hevy.tables import read_fitnotes_file, write_hevy_table
+
+pytest.importorskip("pyarrow")
+
+
+def read_with_pandas(path):
+    """Read a FitNotes CSV with the pandas parser only."""
+    return pd.read_csv(path, dtype=FITNOTES_DTYPES)
+
+
+def test_pyarrow_csv_reader_matches_pandas(export_file, mappings, rules):
+    expected = write_hevy_csv(
+        convert_fitnotes_to_hevy(
+            read_with_pandas(export_file), mappings, rules=rules, typed=True
+        )
+    )
+
+    with open(export_file, "rb") as binary, open(export_file, encoding="utf-8") as text:
+        for source in (export_file, str(export_file), binary, text):
+            df = read_fitnotes_csv(source)
+            output_df = convert_fitnotes_to_hevy(df, mappings, rules=rules, typed=True)
+            assert write_hevy_csv(output_df) == expected
+
+
+def test_text_buffers_fall_back_to_pandas(export_file):
+    text = export_file.read_text(encoding="utf-8")
+
+    pd.testing.assert_frame_equal(
+        read_fitnotes_csv(io.StringIO(text)), read_with_pandas(export_file)
+    )
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather", ".arrow"])
+def test_table_input_matches_csv(tmp_path, export_file, suffix, mappings, rules):
+    df = read_fitnotes_csv(export_file)
+    table = tmp_path / f"export{suffix}"
+    if suffix == ".parquet":
+        df.to_parquet(table)
+    else:
+        df.to_feather(table)
+
+    expected = convert_fitnotes_to_hevy(df, mappings, rules=rules)
+    output_df = convert_fitnotes_to_hevy(
+        read_fitnotes_file(table), mappings, rules=rules
+    )
+
+    pd.testing.assert_frame_equal(output_df, expected)
+
+
+def test_table_input_with_native_dates(tmp_path, export_file, mappings, rules):
+    df = read_fitnotes_csv(export_file)
+    table = tmp_path / "export.parquet"
+    df.assign(Date=pd.to_datetime(df["Date"])).to_parquet(table)
+
+    expected = convert_fitnotes_to_hevy(df, mappings, rules=rules)
+    output_df = convert_fitnotes_to_hevy(
+        read_fitnotes_file(table), mappings, rules=rules
+    )
+
+    pd.testing.assert_frame_equal(output_df, expected)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_hevy_table_round_trip(tmp_path, export_file, suffix, mappings, rules):
+    output_df = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file), mappings, rules=rules, typed=True
+    )
+    table = tmp_path / f"hevy{suffix}"
+    write_hevy_table(output_df, table)
+
+    if suffix == ".parquet":
+        written = pd.read_parquet(table)
+    else:
+        written = pd.read_feather(table)
+    assert write_hevy_csv(written) == write_hevy_csv(output_df)
+
+
+def test_table_output_option(tmp_path, export_file, run_cli, rules):
+    output = tmp_path / "hevy.csv"
+    table = tmp_path / "hevy.parquet"
+
+    result = run_cli(
+        "--input-file", export_file, "--output-file", output, "--table-output", table
+    )
+
+    assert result.exit_code == 0, result.output
+    expected = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file),
+        load_exercise_mappings(),
+        rules=rules,
+        typed=True,
+    )
+    assert output.read_text(encoding="utf-8") == write_hevy_csv(expected)
+    assert write_hevy_csv(pd.read_parquet(table)) == write_hevy_csv(expected)
+
+
+def test_unsupported_table_suffix(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported table file"):
+        write_hevy_table(pd.DataFrame(), tmp_path / "hevy.csv")
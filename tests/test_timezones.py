@@ -0,0 +1,187 @@
+"""IANA timezones with daylight saving resolved per workout date."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from fitnotes2hevy.converter import (
+    convert_fitnotes_chunks,
+    convert_fitnotes_to_hevy,
+    read_fitnotes_csv,
+    write_hevy_csv,
+)
+from fitnotes2hevy.mappings import load_exercise_mappings
+
+
+def export_for(dates):
+    """A FitNotes export with one set of Barbell Squat per date."""
+    lines = [
+        "Date,Exercise,Category,Weight,Weight Unit,Reps,Distance,Distance Unit,Time"
+    ]
+    lines += [f"{date},Barbell Squat,Legs,100,kgs,5,,," for date in dates]
+    return read_fitnotes_csv(io.StringIO("\n".join(lines) + "\n"))
+
+
+def utc_dates(dates, workout_time, timezone, mappings, rules, **settings):
+    output_df = convert_fitnotes_to_hevy(
+        export_for(dates),
+        mappings,
+        workout_time=workout_time,
+        timezone=timezone,
+        rules=rules,
+        **settings,
+    )
+    return list(output_df["Date"])
+
+
+@pytest.mark.parametrize(
+    "timezone, workout_time, expected",
+    [
+        # Daylight saving starts on 12 March and ends on 5 November 2023
+        (
+            "America/New_York",
+            "07:00",
+            {
+                "2023-03-11": "2023-03-11 12:00:00",
+                "2023-03-12": "2023-03-12 11:00:00",
+                "2023-11-04": "2023-11-04 11:00:00",
+                "2023-11-05": "2023-11-05 12:00:00",
+            },
+        ),
+        # Daylight saving ends on 2 April and starts on 1 October 2023
+        (
+            "Australia/Sydney",
+            "18:00",
+            {
+                "2023-04-01": "2023-04-01 07:00:00",
+                "2023-04-02": "2023-04-02 08:00:00",
+                "2023-09-30": "2023-09-30 08:00:00",
+                "2023-10-01": "2023-10-01 07:00:00",
+            },
+        ),
+        # No daylight saving at all
+        ("UTC", "07:00:00", {"2023-03-12": "2023-03-12 07:00:00"}),
+    ],
+)
+def test_offset_follows_daylight_saving(
+    timezone, workout_time, expected, mappings, rules
+):
+    dates = utc_dates(list(expected), workout_time, timezone, mappings, rules)
+
+    assert dates == list(expected.values())
+
+
+def test_timezone_overrides_fixed_offset(mappings, rules):
+    dates = ["2023-03-11", "2023-03-12"]
+
+    assert utc_dates(
+        dates, "07:00", "America/New_York", mappings, rules, timezone_offset=3
+    ) == utc_dates(dates, "07:00", "America/New_York", mappings, rules)
+
+
+def test_without_timezone_the_fixed_offset_applies(mappings, rules):
+    dates = utc_dates(
+        ["2023-03-11", "2023-03-12"], "07:00", None, mappings, rules, timezone_offset=-5
+    )
+
+    assert dates == ["2023-03-11 12:00:00", "2023-03-12 12:00:00"]
+
+
+@pytest.mark.parametrize("timezone", ["Mars/Olympus_Mons", "", "../etc/passwd"])
+def test_invalid_timezone_raises(timezone, mappings, rules):
+    with pytest.raises(ValueError, match="Unknown timezone"):
+        utc_dates(["2023-03-11"], "07:00", timezone, mappings, rules)
+
+
+@pytest.mark.parametrize(
+    "timezone, date, workout_time, expected",
+    [
+        # Times repeated when daylight saving ends resolve to daylight time
+        ("America/New_York", "2023-11-05", "01:30", "2023-11-05 05:30:00"),
+        ("Australia/Sydney", "2023-04-02", "02:30", "2023-04-01 15:30:00"),
+        # Times skipped when daylight saving starts move to the end of the gap
+        ("America/New_York", "2023-03-12", "02:30", "2023-03-12 07:00:00"),
+        ("Australia/Sydney", "2023-10-01", "02:30:00", "2023-09-30 16:00:00"),
+    ],
+)
+def test_ambiguous_and_skipped_times(
+    timezone, date, workout_time, expected, mappings, rules
+):
+    assert utc_dates([date], workout_time, timezone, mappings, rules) == [expected]
+
+
+def test_sets_of_a_date_share_its_offset(mappings, rules):
+    dates = ["2023-03-11", "2023-03-11", "2023-03-12", "2023-03-12", "2023-03-12"]
+
+    assert utc_dates(dates, "07:00", "America/New_York", mappings, rules) == [
+        "2023-03-11 12:00:00",
+        "2023-03-11 12:00:00",
+        "2023-03-12 11:00:00",
+        "2023-03-12 11:00:00",
+        "2023-03-12 11:00:00",
+    ]
+
+
+def test_chunked_conversion_matches(export_file, mappings, rules):
+    settings = {"workout_time": "02:30", "timezone": "America/New_York"}
+    expected = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file), mappings, rules=rules, **settings
+    )
+
+    output_df = pd.concat(
+        convert_fitnotes_chunks(
+            read_fitnotes_csv(export_file, chunksize=7),
+            mappings,
+            rules=rules,
+            **settings,
+        ),
+        ignore_index=True,
+    )
+
+    assert output_df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_tz_option(tmp_path, export_file, run_cli):
+    output = tmp_path / "hevy.csv"
+
+    result = run_cli(
+        "--input-file", export_file, "--output-file", output, "--tz", "Asia/Kolkata"
+    )
+
+    assert result.exit_code == 0, result.output
+    expected = convert_fitnotes_to_hevy(
+        read_fitnotes_csv(export_file),
+        load_exercise_mappings(),
+        timezone="Asia/Kolkata",
+        typed=True,
+    )
+    assert output.read_text(encoding="utf-8") == write_hevy_csv(expected)
+
+
+@pytest.mark.parametrize("command", [[], ["batch"]])
+def test_unknown_tz_option_is_a_usage_error(tmp_path, export_file, run_cli, command):
+    inputs = [export_file] if command else ["--input-file", export_file]
+
+    result = run_cli(*command, *inputs, "--tz", "Mars/Olympus_Mons")
+
+    assert result.exit_code == 2
+    assert "Unknown timezone" in result.output
+
+
+def test_changing_tz_converts_every_workout_again(tmp_path, export_file, run_cli):
+    args = ["--input-file", export_file, "--incremental"]
+    args += ["--state-file", tmp_path / "state.json"]
+
+    for timezone, output in [
+        ("Europe/Berlin", "first.csv"),
+        ("Europe/Berlin", "second.csv"),
+        ("Europe/London", "third.csv"),
+    ]:
+        result = run_cli(*args, "--tz", timezone, "--output-file", tmp_path / output)
+        assert result.exit_code == 0, result.output
+
+    assert not (tmp_path / "second.csv").exists()
+    assert (tmp_path / "third.csv").read_bytes().count(b"\n") == (
+        tmp_path / "first.csv"
+    ).read_bytes().count(b"\n")